@@ -0,0 +1,315 @@
+import time
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+
+confluent_kafka = pytest.importorskip("confluent_kafka")
+
+from veronica.encap import kafka
+from veronica.encap.kafka import AIOProducer, AIOConsumer, Producer
+
+
+@dataclass
+class UnreachableProducer(AIOProducer):
+    """没有可用 broker, 消息在 message.timeout.ms 之后以超时错误投递"""
+    bootstrap_servers: str = "127.0.0.1:1"
+    message_timeout_ms: int = 200
+    idle_interval = 5.0
+
+
+@dataclass
+class UnreachableSyncProducer(Producer):
+    bootstrap_servers: str = "127.0.0.1:1"
+    message_timeout_ms: int = 200
+
+
+@dataclass
+class RecordingConsumer(AIOConsumer):
+    """没有可用 broker, 记录提交的位移而不发往 broker"""
+    bootstrap_servers: str = "127.0.0.1:1"
+    group_id: str = "test"
+
+    def __post_init__(self) -> None:
+        self.committed: list[tuple[dict[tuple[str, int], int], bool]] = []
+        super().__post_init__()
+
+    def _commit_offsets(self, partitions, asynchronous) -> None:
+        self.committed.append(({(tp.topic, tp.partition): tp.offset for tp in partitions}, asynchronous))
+
+
+def message_batch(topic: str, partition: int, offsets: range, generation: int = 0) -> tuple[list, dict, int]:
+    batch = [confluent_kafka.Message(topic=topic, partition=partition, offset=o, value=b"x") for o in offsets]
+    return batch, {(topic, partition): offsets[-1]}, generation
+
+
+class TestAIOProducer:
+
+    def test_batched_delivery_reports(self):
+        """TC01: 同一次 poll 的投递报告只唤醒一次事件循环，所有 future 和回调都被处理"""
+        async def main():
+            producer = UnreachableProducer()
+            loop = asyncio.get_running_loop()
+            wakeups = 0
+            call_soon_threadsafe = loop.call_soon_threadsafe
+
+            def counting(callback, *args):
+                nonlocal wakeups
+                wakeups += 1
+                return call_soon_threadsafe(callback, *args)
+
+            loop.call_soon_threadsafe = counting
+            reported = []
+            try:
+                futures = [
+                    producer.produce("test", f"{i}", on_delivery=lambda err, msg: reported.append(err))
+                    for i in range(100)
+                ]
+                results = await asyncio.wait_for(asyncio.gather(*futures, return_exceptions=True), 10)
+            finally:
+                del loop.call_soon_threadsafe
+                producer.close()
+            assert all(isinstance(r, confluent_kafka.KafkaException) for r in results)
+            assert len(reported) == 100
+            assert 1 <= wakeups < 100
+
+        asyncio.run(main())
+
+    def test_flush(self):
+        """TC02: flush 等待所有投递报告处理完毕，超时返回剩余消息数"""
+        async def main():
+            producer = UnreachableProducer()
+            try:
+                futures = [producer.produce("test", b"x") for _ in range(10)]
+                assert await producer.flush(0.01) == 10
+                assert await producer.flush(10) == 0
+                assert all(f.done() for f in futures)
+            finally:
+                producer.close()
+
+        asyncio.run(main())
+
+    def test_close(self):
+        """TC03: 空闲时立即关闭，有未投递消息时等待投递完成，关闭后不能再发送"""
+        async def main():
+            producer = UnreachableProducer()
+            await asyncio.sleep(0.05)
+            start = time.monotonic()
+            assert producer.close() == 0
+            assert time.monotonic() - start < 1.0
+            with pytest.raises(RuntimeError):
+                producer.produce("test", b"x")
+
+            producer = UnreachableProducer()
+            future = producer.produce("test", b"x")
+            producer.close()
+            with pytest.raises(confluent_kafka.KafkaException):
+                await asyncio.wait_for(future, 1)
+
+        asyncio.run(main())
+
+    def test_produce_many_in_flight_limit(self):
+        """TC04: produce_many 不超过在途消息上限，所有消息都有投递报告"""
+        async def main():
+            producer = UnreachableProducer(max_in_flight_messages=10)
+            assert "max.in.flight.messages" not in producer.to_config()
+            reported, peak = [], 0
+
+            def values():
+                nonlocal peak
+                for i in range(30):
+                    peak = max(peak, producer._in_flight)
+                    yield f"{i}"
+
+            try:
+                count = await producer.produce_many("test", values(), on_delivery=lambda err, msg: reported.append(err))
+                assert await producer.flush(10) == 0
+            finally:
+                producer.close()
+            assert count == 30 and len(reported) == 30
+            assert peak == 10
+
+        asyncio.run(main())
+
+    def test_send_waits_for_queue_space(self):
+        """TC05: 本地队列已满时 send 等待空间而不是抛出 BufferError"""
+        @dataclass
+        class SmallQueueProducer(UnreachableProducer):
+            queue_buffering_max_messages: int = 5
+
+        async def main():
+            producer = SmallQueueProducer()
+            try:
+                for _ in range(5):
+                    producer.produce("test", b"x")
+                with pytest.raises(BufferError):
+                    producer.produce("test", b"x")
+                assert producer.pending == 5 and producer._in_flight == 5
+                futures = [await producer.send("test", b"x") for _ in range(10)]
+                results = await asyncio.wait_for(asyncio.gather(*futures, return_exceptions=True), 10)
+            finally:
+                producer.close()
+            assert all(isinstance(r, confluent_kafka.KafkaException) for r in results)
+
+        asyncio.run(main())
+
+
+    def test_message_fields(self):
+        """TC06: key/headers/partition/timestamp 传入 librdkafka，值经过序列化（投递失败的报告不含 headers 和 timestamp）"""
+        pytest.importorskip("orjson")
+        from veronica.encap.serializer import Serializer
+
+        async def main():
+            producer = UnreachableProducer(serializer=Serializer.orjson(), offload_threshold=2)
+            messages = []
+            try:
+                future = await producer.send(
+                    "test",
+                    {"a": 1, "b": 2},
+                    lambda err, msg: messages.append(msg),
+                    key="device-1",
+                    headers=[("type", b"telemetry")],
+                    partition=3,
+                    timestamp=1700000000000,
+                )
+                await producer.produce_many("test", [[1], [2]], lambda err, msg: messages.append(msg), key=lambda v: str(v[0]))
+                await producer.flush(10)
+                assert isinstance(future.exception(), confluent_kafka.KafkaException)
+            finally:
+                producer.close()
+            first = messages[0]
+            assert first.value() == b'{"a":1,"b":2}' and first.key() == b"device-1"
+            assert first.partition() == 3
+            assert sorted((m.key(), m.value()) for m in messages[1:]) == [(b"1", b"[1]"), (b"2", b"[2]")]
+
+        asyncio.run(main())
+
+    def test_shared_client(self):
+        """TC07: 相同配置共享一个 librdkafka 客户端和 poll 线程，最后一个使用者关闭时停止"""
+        async def main():
+            a = UnreachableProducer(shared=True)
+            b = UnreachableProducer(shared=True)
+            c = UnreachableProducer(shared=True, message_timeout_ms=300)
+            sync = UnreachableSyncProducer(shared=True)
+            client = a._client
+            try:
+                assert b._client is client and sync._client is client and c._client is not client
+                assert a.client_id == b.client_id and client.refs == 3
+                reports = []
+                sync.produce("test", b"x", lambda err, msg: reports.append(err))
+                future = a.produce("test", b"x")
+                assert sync.close() == 0 and reports and sync.pending == 0
+                await asyncio.wait_for(asyncio.gather(future, return_exceptions=True), 1)
+                assert a.close() == 0 and client.thread.is_alive()
+                assert await b.flush(0) == 0
+            finally:
+                for producer in (a, b, c, sync):
+                    producer.close()
+            assert not client.thread.is_alive() and not c._client.thread.is_alive()
+            assert client.key not in kafka._registry and client.refs == 0
+            d = UnreachableProducer(shared=True)
+            assert d._client is not client
+            d.close()
+
+        asyncio.run(main())
+
+    def test_aclose_timeout(self):
+        """TC08: aclose 在事件循环中等待投递，超时后剩余消息以 purge 错误报告为失败"""
+        async def main():
+            producer = UnreachableProducer(message_timeout_ms=60000)
+            futures = [producer.produce("test", b"x") for _ in range(3)]
+            ticks = 0
+
+            async def tick():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            ticker = asyncio.create_task(tick())
+            start = time.monotonic()
+            assert await producer.aclose(0.2) == 3
+            ticker.cancel()
+            assert time.monotonic() - start < 1.0 and ticks >= 10
+            results = await asyncio.wait_for(asyncio.gather(*futures, return_exceptions=True), 1)
+            assert all(r.args[0].code() == confluent_kafka.KafkaError._PURGE_QUEUE for r in results)
+            assert producer.pending == 0 and not producer._client.thread.is_alive()
+
+        asyncio.run(main())
+
+
+class TestAIOConsumer:
+
+    def test_config(self):
+        """TC01: 与生产者共用 to_config，封装自身的选项不进入 librdkafka 配置"""
+        async def main():
+            consumer = RecordingConsumer(topics=["test"], batch_size=100, batch_timeout=0.05)
+            try:
+                config = consumer.to_config()
+            finally:
+                await consumer.aclose()
+            assert config["group.id"] == "test" and config["enable.auto.commit"] is False
+            assert "batch.size" not in config and "topics" not in config
+
+        asyncio.run(main())
+
+    def test_batched_commit(self):
+        """TC02: 处理完的批次按消息数量合并提交，关闭时同步提交剩余位移，迭代随之结束"""
+        async def main():
+            consumer = RecordingConsumer(batch_timeout=0.05, commit_every=10)
+            consumer._batches.put_nowait(message_batch("a", 0, range(0, 6)))
+            consumer._batches.put_nowait(message_batch("a", 0, range(6, 12)))
+            consumer._batches.put_nowait(message_batch("a", 1, range(0, 3)))
+            batches = []
+
+            async def iterate():
+                async for batch in consumer:
+                    batches.append(batch)
+                    if len(batches) == 3:
+                        assert consumer.committed == [({("a", 0): 12}, True)]
+                        consumer.commit(asynchronous=False)
+
+            task = asyncio.create_task(iterate())
+            await asyncio.sleep(0.05)
+            await consumer.aclose()
+            await asyncio.wait_for(task, 1)
+            assert [len(b) for b in batches] == [6, 6, 3]
+            assert consumer.committed == [({("a", 0): 12}, True), ({("a", 1): 3}, False)]
+
+        asyncio.run(main())
+
+    def test_revoke(self):
+        """TC03: 分区被回收时同步提交已处理的位移，丢弃回收分区尚未交给应用的消息和正在处理的批次位移"""
+        async def main():
+            consumer = RecordingConsumer(batch_timeout=0.05)
+            for batch in (message_batch("a", 0, range(0, 3)), message_batch("a", 1, range(0, 3)), message_batch("a", 0, range(3, 6))):
+                consumer._batches.put_nowait(batch)
+            try:
+                assert [m.offset() for m in await consumer.__anext__()] == [0, 1, 2]
+                assert [m.partition() for m in await consumer.__anext__()] == [1, 1, 1]
+                consumer._on_revoke(consumer._consumer, [confluent_kafka.TopicPartition("a", 0), confluent_kafka.TopicPartition("a", 1)])
+                assert consumer.committed == [({("a", 0): 3}, False)]
+
+                consumer._batches.put_nowait(message_batch("a", 0, range(3, 6), generation=1))
+                batch = await asyncio.wait_for(consumer.__anext__(), 1)
+                assert [m.offset() for m in batch] == [3, 4, 5] and consumer._offsets == {}
+                consumer.commit(asynchronous=False)
+            finally:
+                await consumer.aclose()
+            assert consumer.committed == [({("a", 0): 3}, False), ({("a", 0): 6}, False)]
+
+        asyncio.run(main())
+
+    def test_sync_close(self):
+        """TC04: 同步 close 与 aclose 一样提交剩余位移并关闭消费者，重复关闭无副作用"""
+        async def main():
+            consumer = RecordingConsumer(batch_timeout=0.05)
+            consumer._batches.put_nowait(message_batch("a", 0, range(0, 3)))
+            await consumer.__anext__()
+            consumer.commit(asynchronous=False)
+            consumer.close()
+            await consumer.aclose()
+            assert consumer.committed == [({("a", 0): 3}, False)]
+            assert not consumer._consume_thread.is_alive()
+
+        asyncio.run(main())
@@ -0,0 +1,102 @@
+import json
+import time
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+
+pytest.importorskip("confluent_kafka")
+
+from prometheus_client import CollectorRegistry
+
+from veronica.encap.kafka import AIOProducer
+from veronica.encap.kafka_metrics import KafkaMetrics
+
+
+STATS = {
+    "client_id": "p1",
+    "type": "producer",
+    "msg_cnt": 12,
+    "msg_size": 3400,
+    "replyq": 2,
+    "brokers": {
+        "localhost:9092/1": {
+            "nodeid": 1,
+            "outbuf_msg_cnt": 5,
+            "waitresp_cnt": 1,
+            "rtt": {"cnt": 3, "avg": 2000, "p50": 1500, "p99": 9000},
+            "int_latency": {"cnt": 3, "avg": 400, "p50": 300, "p99": 1200},
+        },
+        "GroupCoordinator": {"nodeid": -1},
+    },
+    "topics": {
+        "telemetry": {
+            "batchsize": {"cnt": 2, "avg": 20000},
+            "batchcnt": {"cnt": 2, "avg": 50},
+        },
+    },
+}
+
+
+def wait_for(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestKafkaMetrics:
+
+    def test_update(self):
+        """TC01: 统计信息映射为仪表和直方图，时间单位换算为秒，跳过内部 broker"""
+        registry = CollectorRegistry()
+        metrics = KafkaMetrics(registry=registry)
+        metrics.on_stats(json.dumps(STATS))
+        broker = {"client": "p1", "broker": "localhost:9092/1"}
+        assert wait_for(lambda: registry.get_sample_value("veronica_kafka_queue_messages", {"client": "p1"}) == 12)
+        metrics.close()
+        assert registry.get_sample_value("veronica_kafka_broker_rtt_seconds", {**broker, "quantile": "0.99"}) == 0.009
+        assert registry.get_sample_value("veronica_kafka_broker_queue_latency_seconds", {**broker, "quantile": "0.5"}) == 0.0003
+        assert registry.get_sample_value("veronica_kafka_broker_rtt_window_seconds_count", broker) == 1
+        assert registry.get_sample_value("veronica_kafka_batch_size_bytes_sum", {"client": "p1", "topic": "telemetry"}) == 20000
+        assert registry.get_sample_value(
+            "veronica_kafka_broker_outbuf_messages", {"client": "p1", "broker": "GroupCoordinator"}
+        ) is None
+
+    def test_producer_stats(self):
+        """TC02: 生产者配置中接入 stats_cb，统计信息由 poll 线程交给解析线程"""
+        @dataclass
+        class StatsProducer(AIOProducer):
+            bootstrap_servers: str = "127.0.0.1:1"
+            statistics_interval_ms: int = 50
+            idle_interval = 0.02
+
+        registry = CollectorRegistry()
+        metrics = KafkaMetrics(registry=registry)
+
+        async def main():
+            producer = StatsProducer(client_id="stats", metrics=metrics)
+            config = producer.to_config()
+            try:
+                assert config["stats_cb"] == metrics.on_stats and config["statistics.interval.ms"] == 50
+                await asyncio.to_thread(
+                    wait_for, lambda: registry.get_sample_value("veronica_kafka_queue_messages", {"client": "stats"}) is not None
+                )
+            finally:
+                producer.close()
+                metrics.close()
+            assert registry.get_sample_value("veronica_kafka_queue_messages", {"client": "stats"}) == 0
+
+        asyncio.run(main())
+
+    def test_default_registry(self):
+        """TC03: 使用默认 registry 创建多个实例不会重复注册，实例之间共用指标"""
+        from prometheus_client import REGISTRY
+
+        first = KafkaMetrics(namespace="veronica_test")
+        second = KafkaMetrics(namespace="veronica_test")
+        assert first.queue_messages is second.queue_messages
+        second.update(STATS)
+        assert REGISTRY.get_sample_value("veronica_test_kafka_queue_messages", {"client": "p1"}) == 12
@@ -0,0 +1,47 @@
+import json
+from dataclasses import dataclass
+
+import pytest
+
+from veronica.encap.serializer import Serializer
+
+
+@dataclass
+class Point:
+    x: int
+    y: int
+
+
+class TestSerializer:
+
+    def test_passthrough(self):
+        """TC01: bytes/str/None 原样返回，bytearray/memoryview 转为 bytes，其他类型没有编码器时抛出 TypeError"""
+        serializer = Serializer()
+        data = b"abc"
+        assert serializer(data) is data
+        assert serializer("abc") == "abc" and serializer(None) is None
+        assert serializer(bytearray(b"abc")) == b"abc" and serializer(memoryview(b"abc")) == b"abc"
+        with pytest.raises(TypeError):
+            serializer({"a": 1})
+
+    def test_register_and_cache(self):
+        """TC02: 注册的编码器对子类生效，按具体类型缓存"""
+        class Point3(Point):
+            pass
+
+        serializer = Serializer()
+        serializer.register(Point, lambda p: f"{p.x},{p.y}".encode())
+        assert serializer(Point3(1, 2)) == b"1,2"
+        assert serializer._encoders[Point3] is serializer._registered[Point]
+
+    def test_orjson(self):
+        """TC03: orjson 作为兜底编码器"""
+        pytest.importorskip("orjson")
+        serializer = Serializer.orjson()
+        assert json.loads(serializer({"a": [1, 2]})) == {"a": [1, 2]}
+        assert serializer(b"raw") == b"raw"
+
+    def test_msgpack(self):
+        """TC04: msgpack 作为兜底编码器"""
+        msgpack = pytest.importorskip("msgpack")
+        assert msgpack.unpackb(Serializer.msgpack()({"a": 1})) == {"a": 1}
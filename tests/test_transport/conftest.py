@@ -0,0 +1,64 @@
+import socket
+import asyncio
+from typing import Callable
+
+import pytest
+
+
+class FakeTransport(asyncio.Transport):
+    """记录写入数据的传输对象，对端地址固定为 127.0.0.1:8888
+
+    设置协议后 abort 与真实传输一样回调 connection_lost
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes: list[bytes] = []
+        self.closing = False
+        self.aborted = False
+        self.protocol: asyncio.BaseProtocol | None = None
+
+    def get_extra_info(self, name, default=None):
+        return ("127.0.0.1", 8888) if name == "peername" else default
+
+    def set_protocol(self, protocol: asyncio.BaseProtocol) -> None:
+        self.protocol = protocol
+
+    def get_protocol(self) -> asyncio.BaseProtocol | None:
+        return self.protocol
+
+    def write(self, data) -> None:
+        self.writes.append(bytes(data))
+
+    def writelines(self, list_of_data) -> None:
+        self.write(b"".join(list_of_data))
+
+    def is_closing(self) -> bool:
+        return self.closing
+
+    def abort(self) -> None:
+        self.closing = self.aborted = True
+        if self.protocol is not None:
+            self.protocol.connection_lost(None)
+
+    def get_write_buffer_size(self) -> int:
+        return 0
+
+    def set_write_buffer_limits(self, high=None, low=None) -> None:
+        self.limits = (high, low)
+
+
+@pytest.fixture
+def make_transport() -> Callable[[], FakeTransport]:
+    """创建 FakeTransport"""
+    return FakeTransport
+
+
+@pytest.fixture
+def unused_port() -> Callable[[], int]:
+    """获取本机当前未被占用的 TCP 端口"""
+    def unused_port() -> int:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+    return unused_port
@@ -0,0 +1,77 @@
+import time
+import random
+import asyncio
+
+import pytest
+
+from veronica.transport.backoff import (
+    GoldenRatioBackoff,
+    ExponentialBackoff,
+    FullJitterBackoff,
+    DecorrelatedJitterBackoff,
+    ReconnectLimiter,
+)
+from veronica.transport.connector import TCPConnector
+from veronica.transport.protocol import TCPClientProtocol
+
+
+def delays(backoff, n: int = 50) -> list[float]:
+    previous, result = backoff.min_delay, []
+    for attempt in range(1, n + 1):
+        previous = backoff.delay(attempt, previous)
+        result.append(previous)
+    return result
+
+
+class TestBackoff:
+
+    def test_golden_ratio_never_negative(self):
+        """TC01: 正态抖动很大时延迟依然位于 [0, max_delay]"""
+        random.seed(1)
+        values = delays(GoldenRatioBackoff(1.0, 10.0, jitter=5.0), 500)
+        assert min(values) >= 0 and max(values) <= 10.0
+
+    def test_exponential(self):
+        """TC02: 指数增长并在 max_delay 封顶，失败次数很大时不溢出"""
+        backoff = ExponentialBackoff(0.5, 8.0)
+        assert [backoff.delay(i, 0) for i in range(1, 6)] == [1.0, 2.0, 4.0, 8.0, 8.0]
+        assert backoff.delay(100_000, 0) == 8.0
+
+    def test_jitter_bounds(self):
+        """TC03: 全抖动位于 [0, 指数上限]，去相关抖动位于 [min_delay, max_delay]"""
+        random.seed(2)
+        full = FullJitterBackoff(1.0, 30.0)
+        assert all(0 <= full.delay(i, 0) <= min(30.0, 2 ** i) for i in range(1, 50))
+        assert all(1.0 <= d <= 30.0 for d in delays(DecorrelatedJitterBackoff(1.0, 30.0), 500))
+
+    def test_invalid_range(self):
+        """TC04: 参数校验"""
+        with pytest.raises(ValueError):
+            ExponentialBackoff(5.0, 1.0)
+        with pytest.raises(ValueError):
+            ReconnectLimiter(0)
+
+
+@pytest.mark.asyncio
+async def test_limiter_rate():
+    """TC05: 突发量用完后按速率发放令牌"""
+    limiter = ReconnectLimiter(rate=100, burst=5)
+    start = time.monotonic()
+    await asyncio.gather(*(limiter.acquire() for _ in range(15)))
+    elapsed = time.monotonic() - start
+    assert 0.08 <= elapsed < 1.0
+    assert not limiter.try_acquire()
+
+
+@pytest.mark.asyncio
+async def test_connector_uses_strategy():
+    """TC06: 连接器按策略计算延迟，连接成功后重置"""
+    connector = TCPConnector("127.0.0.1", 1, True, False, TCPClientProtocol, backoff=ExponentialBackoff(0.1, 1.0))
+    connector._increase_delay()
+    connector._increase_delay()
+    assert connector._retry_delay == pytest.approx(0.4)
+    connector._reset_delay()
+    assert connector._retry_delay == 0.1 and connector._retry_count == 0
+    default = TCPConnector("127.0.0.1", 1, True, False, TCPClientProtocol)
+    default._increase_delay()
+    assert default._retry_delay == pytest.approx(TCPConnector.factor)
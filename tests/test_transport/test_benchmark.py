@@ -0,0 +1,62 @@
+import json
+import logging
+
+from veronica.transport.benchmark import BenchmarkConfig, SCENARIOS, run_benchmarks, compare_reports, main
+
+
+def tiny_config() -> BenchmarkConfig:
+    return BenchmarkConfig(
+        connections=10,
+        connect_concurrency=5,
+        streams=2,
+        messages=50,
+        message_size=64,
+        pings=20,
+        storm_connections=5,
+        storm_outage=0.05,
+        memory_connections=5,
+        tls_reconnects=3,
+    )
+
+
+def test_run_all_scenarios():
+    """TC01: 所有场景均输出结果，并可序列化为 JSON"""
+    report = run_benchmarks(tiny_config(), ["asyncio"])
+    result = json.loads(json.dumps(report))["results"]["asyncio"]
+    assert set(SCENARIOS) <= set(result)
+    assert result["connect"]["connections_per_s"] > 0
+    assert result["sink"]["messages"] == 100
+    assert result["reconnect"]["recovery_s"] >= 0 and result["reconnect"]["attempts"] >= 5
+    assert result["memory"]["bytes_per_connection"] > 0
+
+
+def test_compare_reports():
+    """TC02: 只报告超过容差且方向变差的指标"""
+    baseline = {"results": {"asyncio": {"latency": {"p50_us": 100.0, "pings": 10}, "throughput": {"messages_per_s": 1000.0}}}}
+    current = {"results": {"asyncio": {"latency": {"p50_us": 105.0, "pings": 99}, "throughput": {"messages_per_s": 500.0}}}}
+    regressions = compare_reports(current, baseline, tolerance=0.1)
+    assert len(regressions) == 1 and regressions[0].startswith("asyncio.throughput.messages_per_s")
+    assert compare_reports(baseline, current, tolerance=0.1) == []
+
+
+def test_main_exit_code(tmp_path):
+    """TC03: 与基准结果对比出现退化时返回 1"""
+    path = tmp_path / "result.json"
+    args = ["--loop", "asyncio", "--scenarios", "latency", "--pings", "10", "--json", str(path)]
+    assert main(args) == 0
+    baseline = json.loads(path.read_text())
+    baseline["results"]["asyncio"]["latency"]["p99_us"] = 1e-6
+    path.write_text(json.dumps(baseline))
+    assert main(args[:-2] + ["--compare", str(path)]) == 1
+
+
+def test_main_restores_log_level(tmp_path):
+    """TC04: 运行结束后恢复 veronica.transport 原有的日志级别"""
+    logger = logging.getLogger("veronica.transport")
+    level = logger.level
+    logger.setLevel(logging.DEBUG)
+    try:
+        assert main(["--loop", "asyncio", "--scenarios", "latency", "--pings", "10"]) == 0
+        assert logger.level == logging.DEBUG
+    finally:
+        logger.setLevel(level)
@@ -0,0 +1,62 @@
+import time
+import asyncio
+import threading
+
+import pytest
+
+from veronica.transport.bridge import LoopBridge
+from veronica.transport.connector import TCPConnector
+from veronica.transport.protocol import TCPClientProtocol
+
+
+async def start_sink(received: list[bytes]) -> tuple[asyncio.Server, int]:
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        while data := await reader.read(65536):
+            received.append(data)
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+async def make_connector() -> TCPConnector:
+    return TCPConnector("127.0.0.1", 9, False, False, TCPClientProtocol)
+
+
+def test_submit_from_threads():
+    """TC01: 多线程提交的数据全部发送，唤醒次数少于消息数"""
+    received: list[bytes] = []
+    with LoopBridge(fast_loop=False) as bridge:
+        server, port = bridge.run(start_sink(received))
+        connector = bridge.run(TCPConnector.create("127.0.0.1", port, auto_reconnect=False))
+
+        def produce() -> None:
+            for _ in range(1000):
+                bridge.submit(connector, b"x" * 10)
+
+        threads = [threading.Thread(target=produce) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        deadline = time.monotonic() + 5
+        while sum(map(len, received)) < 40_000 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert sum(map(len, received)) == 40_000
+        assert bridge.counters["sent"] == 4000 and bridge.counters["dropped"] == 0
+        assert bridge.counters["wakeups"] < 4000
+        bridge.loop.call_soon_threadsafe(connector.close)
+        bridge.loop.call_soon_threadsafe(server.close)
+    assert not bridge.is_running
+
+
+def test_dropped_and_not_running():
+    """TC02: 未启动时提交抛出 RuntimeError，未连接的数据计入 dropped"""
+    bridge = LoopBridge(fast_loop=False)
+    with pytest.raises(RuntimeError):
+        bridge.submit(None, b"x")
+    with bridge:
+        connector = bridge.run(make_connector())
+        bridge.submit(connector, b"x")
+        bridge.run(asyncio.sleep(0.01))
+        assert bridge.counters["dropped"] == 1
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from veronica.transport.buffer import ReceiveBuffer
+from veronica.transport.connector import TCPConnector
+from veronica.transport.protocol import BufferedTCPClientProtocol
+
+
+class TestReceiveBuffer:
+
+    def test_consume_resets_offsets(self):
+        """TC01: 全部消费后偏移量归零，不发生数据搬移"""
+        rx = ReceiveBuffer(16)
+        rx.extend(b"abcd")
+        rx.consume(4)
+        assert len(rx) == 0
+        assert rx.get_buffer().nbytes == 16
+
+    def test_partial_data_survives_compaction(self):
+        """TC02: 原地压缩后未消费数据保持不变"""
+        rx = ReceiveBuffer(16, min_free=4)
+        rx.extend(b"0123456789ab")
+        rx.consume(10)
+        view = rx.get_buffer(8)
+        assert rx.capacity == 16
+        assert bytes(rx.data) == b"ab"
+        assert view.nbytes == 14
+
+    def test_grow_keeps_external_views_valid(self):
+        """TC03: 扩容分配新缓冲区，外部持有的视图不会引发 BufferError"""
+        rx = ReceiveBuffer(8, min_free=8)
+        rx.extend(b"abcdefgh")
+        held = rx.data
+        rx.extend(b"ijkl")
+        assert bytes(held) == b"abcdefgh"
+        assert bytes(rx.data) == b"abcdefghijkl"
+
+    def test_overflow(self):
+        """TC04: 超过上限时抛出 BufferError"""
+        rx = ReceiveBuffer(8, max_size=8)
+        rx.extend(b"abcdefgh")
+        with pytest.raises(BufferError):
+            rx.get_buffer()
+
+
+class RecordProtocol(BufferedTCPClientProtocol):
+    buffer_size = 16
+
+    def on_connection_made(self) -> None:
+        self.records: list[bytes] = []
+        self.done = self._loop.create_future()
+
+    def on_data_received(self, data: memoryview) -> int | None:
+        consumed = len(data) - len(data) % 4
+        for i in range(0, consumed, 4):
+            self.records.append(bytes(data[i:i + 4]))
+        if len(self.records) == 8 and not self.done.done():
+            self.done.set_result(None)
+        return consumed
+
+
+@pytest.mark.asyncio
+async def test_buffered_protocol_reassembles_records():
+    """TC05: 未消费的半包保留在缓冲区中，与后续数据一起交给回调"""
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        payload = b"".join(i.to_bytes(4, "big") for i in range(8))
+        for i in range(0, len(payload), 3):
+            writer.write(payload[i:i + 3])
+            await writer.drain()
+            await asyncio.sleep(0)
+        await reader.read()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        connector = await TCPConnector.create(
+            "127.0.0.1", port, auto_reconnect=False, protocol_class=RecordProtocol
+        )
+        protocol = connector._protocol
+        await asyncio.wait_for(protocol.done, 5)
+        assert protocol.records == [i.to_bytes(4, "big") for i in range(8)]
+        connector._transport.close()
@@ -0,0 +1,70 @@
+import struct
+
+import pytest
+
+from veronica.transport.codec import Field, Schema
+
+
+TELEMETRY = Schema([
+    ("seq", "u32"),
+    ("status", "u8"),
+    ("", "pad", 3),
+    ("values", "i16", 4),
+    ("tag", "bytes", 4),
+    ("temp", "f32"),
+], byteorder="little")
+
+RECORD = {"seq": 7, "status": 2, "values": (1, -2, 3, -4), "tag": b"abcd", "temp": 1.5}
+
+
+class TestSchema:
+
+    def test_layout(self):
+        """TC01: 编译后的格式与长度"""
+        assert TELEMETRY.format == "<IB3x4h4sf"
+        assert TELEMETRY.size == 24
+        assert TELEMETRY.names == ("seq", "status", "values", "tag", "temp")
+
+    def test_roundtrip(self):
+        """TC02: 编码后从 memoryview 偏移处解码得到原值"""
+        data = TELEMETRY.encode(RECORD)
+        buf = bytearray(b"\xff" * 3 + data)
+        with memoryview(buf) as view:
+            assert TELEMETRY.decode(view, 3) == RECORD
+        assert TELEMETRY.unpack(data)[:3] == (7, 2, 1)
+
+    def test_encode_into_and_iter(self):
+        """TC03: 连续写入多条记录并逐条解码，不完整的尾部被忽略"""
+        buf = bytearray(TELEMETRY.size * 3 + 5)
+        for i in range(3):
+            TELEMETRY.encode_into(buf, i * TELEMETRY.size, {**RECORD, "seq": i})
+        assert [r["seq"] for r in TELEMETRY.iter_decode(buf)] == [0, 1, 2]
+
+    def test_errors(self):
+        """TC04: 非法定义、重复字段数量错误和数据不足"""
+        with pytest.raises(ValueError):
+            Field("x", "u128")
+        with pytest.raises(ValueError):
+            Schema([("a", "u8"), ("a", "u16")])
+        with pytest.raises(ValueError):
+            TELEMETRY.encode(RECORD, values=(1, 2))
+        with pytest.raises(struct.error):
+            TELEMETRY.decode(b"\x00" * 10)
+
+    def test_struct_cached(self):
+        """TC05: 相同布局共享编译结果"""
+        other = Schema([Field("seq", "u32"), Field("status", "u8"), Field("", "pad", 3),
+                        Field("values", "i16", 4), Field("tag", "bytes", 4), Field("temp", "f32")], byteorder="little")
+        assert other._struct is TELEMETRY._struct
+
+
+def test_decode_array():
+    """TC06: 批量解码为 NumPy 结构化数组"""
+    np = pytest.importorskip("numpy")
+    data = b"".join(TELEMETRY.encode(RECORD, seq=i) for i in range(5)) + b"\x00"
+    with memoryview(data) as view:
+        array = TELEMETRY.decode_array(view)
+    assert array.shape == (5, )
+    assert array["seq"].tolist() == list(range(5))
+    assert array["values"][0].tolist() == [1, -2, 3, -4]
+    assert array["tag"][4] == b"abcd" and array["temp"][0] == np.float32(1.5)
@@ -0,0 +1,134 @@
+import time
+import socket
+import asyncio
+
+import pytest
+
+from veronica.transport.connector import TCPConnector, TCPKeepAlive
+from veronica.transport.protocol import TCPClientProtocol
+
+
+@pytest.fixture
+def blackhole():
+    """只监听不 accept、backlog 已满的端口，新的连接停留在 SYN 阶段"""
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(0)
+    fillers = []
+    for _ in range(8):
+        sock = socket.socket()
+        sock.setblocking(False)
+        try:
+            sock.connect(listener.getsockname())
+        except BlockingIOError:
+            pass
+        fillers.append(sock)
+    yield listener.getsockname()[1]
+    for sock in fillers:
+        sock.close()
+    listener.close()
+
+
+@pytest.mark.asyncio
+async def test_connect_timeout(blackhole):
+    """TC01: 单个地址超过 connect_timeout 后以 TimeoutError 失败"""
+    connector = TCPConnector("127.0.0.1", blackhole, False, False, TCPClientProtocol, connect_timeout=0.2)
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        await connector._connect()
+    assert time.monotonic() - start < 1.0
+
+
+@pytest.mark.asyncio
+async def test_failover_to_fallback(blackhole, unused_port):
+    """TC02: 主地址失败时依次尝试备用地址，之后从成功的地址开始"""
+    server = await asyncio.start_server(lambda r, w: None, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        connector = await TCPConnector.create(
+            "127.0.0.1",
+            unused_port(),
+            auto_reconnect=False,
+            fallbacks=[("127.0.0.1", blackhole), ("127.0.0.1", port)],
+            connect_timeout=0.2
+        )
+        assert connector.is_connected()
+        assert connector.endpoint_address() == f"127.0.0.1:{port}"
+        connector._transport.close()
+        start = time.monotonic()
+        await connector._connect()
+        assert time.monotonic() - start < 0.1
+        connector.close()
+
+        dead = TCPConnector("127.0.0.1", unused_port(), False, False, TCPClientProtocol, fallbacks=[("127.0.0.1", unused_port())])
+        with pytest.raises(ConnectionRefusedError):
+            await dead._connect()
+
+
+@pytest.mark.asyncio
+async def test_happy_eyeballs_options():
+    """TC03: happy_eyeballs_delay/interleave 透传给 create_connection"""
+    server = await asyncio.start_server(lambda r, w: None, "localhost", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        connector = await TCPConnector.create(
+            "localhost", port, auto_reconnect=False, happy_eyeballs_delay=0.25, interleave=1
+        )
+        assert connector.is_connected()
+        connector.close()
+
+
+@pytest.mark.asyncio
+async def test_metrics_share_peer_label():
+    """TC04: 建连、重连与流量指标都使用配置地址作为标签，而不是解析后的 IP"""
+    from prometheus_client import CollectorRegistry
+    from veronica.transport.metrics import TransportMetrics
+
+    registry = CollectorRegistry()
+
+    class MeteredProtocol(TCPClientProtocol):
+        metrics = TransportMetrics(registry=registry, label_mode="address")
+
+    server = await asyncio.start_server(lambda r, w: w.write(b"abc"), "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        connector = await TCPConnector.create("localhost", port, auto_reconnect=False, protocol_class=MeteredProtocol)
+        await asyncio.sleep(0.05)
+        connector._increase_delay()
+        connector.close()
+
+    def sample(name: str, peer: str) -> float | None:
+        return registry.get_sample_value(f"veronica_transport_{name}", {"peer": peer})
+
+    peer = f"localhost:{port}"
+    assert sample("connect_latency_seconds_count", peer) == 1
+    assert sample("received_bytes_total", peer) == 3
+    assert sample("reconnect_attempts_total", peer) == 1
+    assert sample("received_bytes_total", f"127.0.0.1:{port}") is None
+
+
+@pytest.mark.asyncio
+async def test_keepalive_failure_closes_transport():
+    """TC05: keepalive 参数非法时构造即失败，设置 socket 选项失败时关闭已建立的连接"""
+    with pytest.raises(ValueError):
+        TCPKeepAlive(idle=0)
+
+    class FailingKeepAlive(TCPKeepAlive):
+        def apply(self, sock: socket.socket) -> None:
+            raise OSError(22, "Invalid argument")
+
+    closed = asyncio.Event()
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await reader.read()
+        closed.set()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        connector = TCPConnector("127.0.0.1", port, False, False, TCPClientProtocol, keepalive=FailingKeepAlive())
+        with pytest.raises(OSError):
+            await connector._connect()
+        await asyncio.wait_for(closed.wait(), 1)
+        assert connector._transport is None and not connector._on_lost_fut.done()
@@ -0,0 +1,160 @@
+import asyncio
+
+import pytest
+
+from veronica.transport.connector import UnixConnector, TCPKeepAlive
+from veronica.transport.datagram import UDPClientProtocol, UDPConnector
+from veronica.transport.protocol import TCPClientProtocol
+
+
+class EchoDatagramServer(asyncio.DatagramProtocol):
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self.transport.sendto(data, addr)
+
+
+class BatchProtocol(UDPClientProtocol):
+    def on_connection_made(self) -> None:
+        self.batches: list[list[bytes]] = []
+        self.errors: list[Exception] = []
+
+    def on_datagrams_received(self, datagrams: list[bytes]) -> None:
+        self.batches.append(datagrams)
+
+    def on_error_received(self, exc: Exception) -> None:
+        self.errors.append(exc)
+
+
+async def wait_until(predicate, timeout: float = 2.0) -> None:
+    for _ in range(int(timeout / 0.01)):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not met in time")
+
+
+@pytest.mark.asyncio
+async def test_udp_batched_receive():
+    """TC01: 数据报保持边界，按接收顺序交付"""
+    loop = asyncio.get_running_loop()
+    server, _ = await loop.create_datagram_endpoint(EchoDatagramServer, local_addr=("127.0.0.1", 0))
+    port = server.get_extra_info("sockname")[1]
+    connector = await UDPConnector.create("127.0.0.1", port, auto_reconnect=False, protocol_class=BatchProtocol)
+    protocol = connector._protocol
+    for i in range(20):
+        protocol.transmit_data(bytes([i]) * (i + 1))
+    await wait_until(lambda: sum(map(len, protocol.batches)) == 20)
+    received = [d for batch in protocol.batches for d in batch]
+    assert received == [bytes([i]) * (i + 1) for i in range(20)]
+    connector.close()
+    server.close()
+
+
+@pytest.mark.asyncio
+async def test_udp_batch_per_iteration():
+    """TC06: 同一轮事件循环收到的数据报一次交付，达到 max_batch 时立即交付"""
+    class SmallBatchProtocol(BatchProtocol):
+        max_batch = 3
+
+    loop = asyncio.get_running_loop()
+    server, _ = await loop.create_datagram_endpoint(EchoDatagramServer, local_addr=("127.0.0.1", 0))
+    port = server.get_extra_info("sockname")[1]
+    connector = await UDPConnector.create("127.0.0.1", port, auto_reconnect=False, protocol_class=SmallBatchProtocol)
+    protocol = connector._protocol
+    addr = ("127.0.0.1", port)
+    for data in (b"a", b"b", b"c", b"d"):
+        protocol.datagram_received(data, addr)
+    assert protocol.batches == [[b"a", b"b", b"c"]]
+    await asyncio.sleep(0)
+    assert protocol.batches == [[b"a", b"b", b"c"], [b"d"]]
+    connector.close()
+    server.close()
+
+
+
+@pytest.mark.asyncio
+async def test_udp_connection_lost_flushes_batch():
+    """TC05: 断开时待交付的数据报在 on_connection_lost 之前交付，之后不再回调"""
+    events = []
+
+    class LostProtocol(BatchProtocol):
+        def on_datagrams_received(self, datagrams: list[bytes]) -> None:
+            events.append(("data", list(datagrams)))
+
+        def on_connection_lost(self) -> None:
+            events.append(("lost", None))
+
+    loop = asyncio.get_running_loop()
+    server, _ = await loop.create_datagram_endpoint(EchoDatagramServer, local_addr=("127.0.0.1", 0))
+    port = server.get_extra_info("sockname")[1]
+    connector = await UDPConnector.create("127.0.0.1", port, auto_reconnect=False, protocol_class=LostProtocol)
+    protocol = connector._protocol
+    protocol.datagram_received(b"a", ("127.0.0.1", port))
+    assert protocol._rx_flush_handle is not None
+    protocol.connection_lost(None)
+    await asyncio.sleep(0.05)
+    assert events == [("data", [b"a"]), ("lost", None)]
+    assert protocol._rx_flush_handle is None
+    connector.close()
+    server.close()
+
+@pytest.mark.asyncio
+async def test_udp_idle_reconnect():
+    """TC02: 对端无响应时看门狗中止传输，连接器重新创建套接字"""
+    class IdleProtocol(BatchProtocol):
+        idle_timeout = 0.2
+
+    connector = UDPConnector("127.0.0.1", 9, True, False, IdleProtocol)
+    connector.backoff.min_delay = 0.01
+    task = asyncio.create_task(connector._start())
+    await wait_until(connector.is_connected)
+    first = connector._transport
+    await wait_until(lambda: connector._transport is not first and connector.is_connected())
+    connector.close()
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_udp_rejects_tls_and_tcp_protocol():
+    """TC03: UDP 不支持 TLS，协议类必须是 UDPClientProtocol"""
+    with pytest.raises(TypeError):
+        UDPConnector("127.0.0.1", 9, False, False, TCPClientProtocol)
+
+
+@pytest.mark.asyncio
+async def test_unix_connector(tmp_path):
+    """TC04: Unix 域套接字连接、收发数据，断开后自动重连，keepalive 被忽略"""
+    path = str(tmp_path / "echo.sock")
+    writers: list[asyncio.StreamWriter] = []
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        writers.append(writer)
+        while data := await reader.read(1024):
+            writer.write(data)
+
+    class EchoProtocol(TCPClientProtocol):
+        def on_connection_made(self) -> None:
+            self.received = b""
+
+        def on_data_received(self, data: bytes) -> None:
+            self.received += data
+
+    server = await asyncio.start_unix_server(handle, path)
+    async with server:
+        connector = UnixConnector(path, protocol_class=EchoProtocol, keepalive=TCPKeepAlive())
+        connector.backoff.min_delay = 0.01
+        task = asyncio.create_task(connector._start())
+        await wait_until(connector.is_connected)
+        assert connector._protocol._peername == (path, 0)
+        connector._protocol.transmit_data(b"ping")
+        await wait_until(lambda: connector._protocol.received == b"ping")
+
+        writers[0].close()
+        await wait_until(lambda: len(writers) == 2 and connector.is_connected())
+        assert connector.log_address() == path
+        connector.close()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
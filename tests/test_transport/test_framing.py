@@ -0,0 +1,113 @@
+import pytest
+
+from veronica.transport.framing import (
+    Framer,
+    FramingError,
+    FramedTCPClientProtocol,
+    LengthPrefixFramer,
+    DelimiterFramer,
+    FixedLengthFramer,
+    StartStopFramer,
+)
+
+
+class RecordingProtocol(FramedTCPClientProtocol):
+    buffer_size = 16
+
+    def __init__(self, framer: Framer) -> None:
+        self.framer = framer
+        self.frames: list[bytes] = []
+        super().__init__()
+
+    def create_framer(self) -> Framer:
+        return self.framer
+
+    def on_frame_received(self, frame: memoryview) -> None:
+        self.frames.append(bytes(frame))
+
+
+@pytest.fixture
+def feed(make_transport):
+    def feed(framer: Framer, chunks: list[bytes]) -> RecordingProtocol:
+        """按事件循环的方式把数据块写入协议的接收缓冲区，一个数据块可能分多次写入"""
+        protocol, transport = RecordingProtocol(framer), make_transport()
+        protocol.connection_made(transport)
+        for chunk in chunks:
+            view = memoryview(chunk)
+            while view and not transport.is_closing():
+                buf = protocol.get_buffer(-1)
+                n = min(len(buf), len(view))
+                buf[:n] = view[:n]
+                protocol.buffer_updated(n)
+                view = view[n:]
+        return protocol
+    return feed
+
+
+@pytest.fixture
+def split(feed):
+    def split(framer: Framer, chunks: list[bytes]) -> list[bytes]:
+        return feed(framer, chunks).frames
+    return split
+
+
+class TestFramers:
+
+    @pytest.mark.asyncio
+    async def test_length_prefix(self, split):
+        """TC01: 长度前缀帧跨数据块拼接"""
+        data = b"\x00\x03abc\x00\x01d"
+        frames = split(LengthPrefixFramer(2, strip_header=True), [data[:3], data[3:6], data[6:]])
+        assert frames == [b"abc", b"d"]
+
+    @pytest.mark.asyncio
+    async def test_length_prefix_adjustment(self, split):
+        """TC02: 长度字段包含帧头长度"""
+        framer = LengthPrefixFramer(1, length_offset=1, length_adjustment=-2)
+        assert split(framer, [b"\xaa\x04xy\xaa\x02"]) == [b"\xaa\x04xy", b"\xaa\x02"]
+
+    @pytest.mark.asyncio
+    async def test_delimiter(self, split):
+        """TC03: 分隔符跨数据块"""
+        frames = split(DelimiterFramer(b"\r\n"), [b"ab\r", b"\ncd", b"\r\n"])
+        assert frames == [b"ab", b"cd"]
+
+    @pytest.mark.asyncio
+    async def test_fixed_length(self, split):
+        """TC04: 定长帧"""
+        assert split(FixedLengthFramer(2), [b"abc", b"d"]) == [b"ab", b"cd"]
+
+    @pytest.mark.asyncio
+    async def test_start_stop_discards_noise(self, split):
+        """TC05: 起始符之前的噪声被丢弃"""
+        frames = split(StartStopFramer(b"\x02", b"\x03"), [b"xx\x02ab", b"\x03\x02c\x03"])
+        assert frames == [b"ab", b"c"]
+
+    @pytest.mark.asyncio
+    async def test_max_frame_size(self, feed):
+        """TC06: 超过帧长度上限时交付之前的完整帧，随后断开连接并丢弃剩余数据"""
+        with pytest.raises(FramingError):
+            DelimiterFramer(b"\n", max_frame_size=4).find(bytearray(b"abcdef"), 0, 6)
+        protocol = feed(DelimiterFramer(b"\n", max_frame_size=4), [b"ab\ncdefgh", b"ij\n"])
+        assert protocol.frames == [b"ab"]
+        assert protocol._transport.is_closing()
+        assert len(protocol._rx_buffer) == 0
+
+    @pytest.mark.asyncio
+    async def test_burst_split(self, split):
+        """TC07: 1 MB 突发数据一次切分为 10k 帧"""
+        payload = b"x" * 98
+        burst = (len(payload).to_bytes(2, "big") + payload) * 10_000
+        frames = split(LengthPrefixFramer(2, strip_header=True), [burst])
+        assert len(frames) == 10_000
+        assert frames[-1] == payload
+
+    @pytest.mark.asyncio
+    async def test_coalesced_and_partial(self, split):
+        """TC08: 多帧合并在一个数据块中、帧头和帧体被拆开时都按帧回调"""
+        frame = lambda payload: len(payload).to_bytes(2, "big") + payload
+        data = frame(b"abc") + frame(b"") + frame(b"defgh") + frame(b"ij")
+        expected = [b"abc", b"", b"defgh", b"ij"]
+        for size in (1, 2, 3, 7, len(data)):
+            chunks = [data[i:i + size] for i in range(0, len(data), size)]
+            assert split(LengthPrefixFramer(2, strip_header=True), chunks) == expected
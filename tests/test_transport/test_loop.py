@@ -0,0 +1,51 @@
+import asyncio
+import sys
+
+import pytest
+
+from veronica.transport.loop import fast_loop_factory, loop_name, run, use_fast_loop
+
+
+@pytest.fixture
+def no_uvloop(monkeypatch):
+    # sys.modules 中为 None 时 import 会抛出 ImportError，模拟未安装 uvloop
+    monkeypatch.setitem(sys.modules, "uvloop", None)
+
+
+def test_fast_loop_factory_without_uvloop(no_uvloop):
+    """TC01: 未安装 uvloop 时不提供事件循环工厂"""
+    assert fast_loop_factory() is None
+
+
+def test_use_fast_loop_without_uvloop(no_uvloop):
+    """TC02: 未安装 uvloop 时返回 False 且不修改事件循环策略"""
+    policy = asyncio.get_event_loop_policy()
+    assert use_fast_loop() is False
+    assert asyncio.get_event_loop_policy() is policy
+
+
+def test_run_fast_without_uvloop(no_uvloop):
+    """TC03: 未安装 uvloop 时 run(fast=True) 回退到 asyncio 事件循环"""
+    async def main() -> tuple[str, str]:
+        return "done", loop_name()
+
+    policy = asyncio.get_event_loop_policy()
+    assert run(main(), fast=True) == ("done", "asyncio")
+    assert asyncio.get_event_loop_policy() is policy
+
+
+def test_run_without_fast():
+    """TC04: fast=False 时始终使用 asyncio 事件循环"""
+    async def main() -> str:
+        return loop_name()
+
+    assert run(main(), fast=False) == "asyncio"
+
+
+def test_loop_name_explicit_loop():
+    """TC05: 指定事件循环时不要求处于运行状态"""
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop_name(loop) == "asyncio"
+    finally:
+        loop.close()
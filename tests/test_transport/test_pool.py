@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from veronica.transport.connector import UnixConnector
+from veronica.transport.datagram import UDPClientProtocol, UDPConnector
+from veronica.transport.pool import ConnectorPool, ConnectorState
+
+
+async def wait_for_status(pool: ConnectorPool, **expected: int) -> None:
+    for _ in range(200):
+        status = pool.status()
+        if all(status[k] == v for k, v in expected.items()):
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(pool.status())
+
+
+@pytest.mark.asyncio
+async def test_pool_connects_and_reschedules(unused_port):
+    """TC01: 连接池建立连接、失败进入退避、断线后重新连接、移除后关闭"""
+    server_transports: list[asyncio.StreamWriter] = []
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        server_transports.append(writer)
+        await reader.read()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    dead_port = unused_port()
+    async with server, ConnectorPool(max_connecting=2) as pool:
+        pool.add("127.0.0.1", port)
+        pool.add("localhost", port)
+        pool.add("127.0.0.1", dead_port)
+        with pytest.raises(KeyError):
+            pool.add("127.0.0.1", port)
+
+        await wait_for_status(pool, connected=2, backoff=1)
+        assert pool.state("127.0.0.1", dead_port) is ConnectorState.BACKOFF
+
+        server_transports[0].close()
+        for _ in range(200):
+            if len(server_transports) == 3:
+                break
+            await asyncio.sleep(0.01)
+        await wait_for_status(pool, connected=2)
+        assert len(server_transports) == 3
+
+        connector = pool.remove("127.0.0.1", port)
+        assert connector is not None and not connector.is_connected()
+        assert len(pool) == 2
+        await wait_for_status(pool, connected=1)
+
+
+@pytest.mark.asyncio
+async def test_pool_connector_class(unused_port):
+    """TC02: 连接器按关键字参数创建，支持 UDPConnector，不支持 UnixConnector"""
+    with pytest.raises(TypeError):
+        ConnectorPool(connector_class=UnixConnector)
+
+    async with ConnectorPool(connector_class=UDPConnector, protocol_class=UDPClientProtocol) as pool:
+        connector = pool.add("127.0.0.1", unused_port())
+        assert isinstance(connector, UDPConnector)
+        assert connector.auto_reconnect and connector.protocol_class is UDPClientProtocol
+        await wait_for_status(pool, connected=1)
@@ -0,0 +1,158 @@
+import asyncio
+
+import pytest
+
+from veronica.transport.protocol import TCPClientProtocol
+
+
+class CoalescingProtocol(TCPClientProtocol):
+    coalesce_writes = True
+    coalesce_max_size = 8
+    write_high_water = 1024
+    write_low_water = 256
+
+
+@pytest.mark.asyncio
+async def test_small_writes_are_coalesced(make_transport):
+    """TC01: 同一轮事件循环中的小包合并为一次写入，大包到达前先刷新"""
+    transport = make_transport()
+    protocol = CoalescingProtocol()
+    protocol.connection_made(transport)
+    assert transport.limits == (1024, 256)
+    protocol.transmit_data(b"a")
+    protocol.transmit_data(bytearray(b"b"))
+    assert transport.writes == []
+    await asyncio.sleep(0)
+    assert transport.writes == [b"ab"]
+    protocol.transmit_data(b"c")
+    protocol.transmit_data(b"large-payload")
+    assert transport.writes == [b"ab", b"c", b"large-payload"]
+
+
+@pytest.mark.asyncio
+async def test_drain_waits_for_resume_writing(make_transport):
+    """TC02: 暂停写入时 drain 挂起，恢复后返回，连接丢失时抛出 ConnectionError"""
+    transport = make_transport()
+    protocol = TCPClientProtocol()
+    protocol.connection_made(transport)
+    protocol.pause_writing()
+    waiter = asyncio.ensure_future(protocol.send(b"x"))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    protocol.resume_writing()
+    await asyncio.wait_for(waiter, 1)
+
+    protocol.pause_writing()
+    waiter = asyncio.ensure_future(protocol.drain())
+    await asyncio.sleep(0)
+    protocol.connection_lost(None)
+    with pytest.raises(ConnectionError):
+        await waiter
+
+
+class SeqProtocol(TCPClientProtocol):
+    max_in_flight = 2
+
+    def on_data_received(self, data: bytes) -> None:
+        self.resolve_request(data[0], data[1:])
+
+
+@pytest.mark.asyncio
+async def test_pipelined_requests(make_transport):
+    """TC03: 多个请求同时在途，响应乱序到达时按关联 ID 匹配，在途数量受窗口限制"""
+    transport = make_transport()
+    protocol = SeqProtocol()
+    protocol.connection_made(transport)
+    tasks = [asyncio.ensure_future(protocol.request(bytes([i]), key=i)) for i in range(3)]
+    await asyncio.sleep(0)
+    assert transport.writes == [b"\x00", b"\x01"]
+    protocol.data_received(b"\x01b")
+    protocol.data_received(b"\x00a")
+    for _ in range(3):
+        await asyncio.sleep(0)
+    assert transport.writes[-1] == b"\x02"
+    protocol.data_received(b"\x02c")
+    assert await asyncio.gather(*tasks) == [b"a", b"b", b"c"]
+
+
+@pytest.mark.asyncio
+async def test_requests_fail_on_timeout_and_connection_lost(make_transport):
+    """TC04: 请求超时抛出 TimeoutError，连接丢失时所有在途请求抛出 ConnectionError"""
+    transport = make_transport()
+    protocol = SeqProtocol()
+    protocol.connection_made(transport)
+    with pytest.raises(TimeoutError):
+        await protocol.request(b"\x00", key=0, timeout=0.05)
+    waiter = asyncio.ensure_future(protocol.request(b"\x01", key=1))
+    await asyncio.sleep(0)
+    protocol.connection_lost(None)
+    with pytest.raises(ConnectionError):
+        await waiter
+
+
+@pytest.mark.asyncio
+async def test_idle_watchdog_sends_heartbeat_and_aborts(make_transport):
+    """TC05: 空闲时发送心跳，超过 idle_timeout 未收到数据则中止连接"""
+    from veronica.transport.timer import TimerWheel
+
+    class HeartbeatProtocol(TCPClientProtocol):
+        timer_wheel = TimerWheel(tick=0.01)
+        heartbeat_interval = 0.03
+        idle_timeout = 0.2
+
+        def on_heartbeat(self) -> None:
+            self.transmit_data(b"ping")
+
+    on_lost_fut = asyncio.get_running_loop().create_future()
+    transport = make_transport()
+    protocol = HeartbeatProtocol(on_lost_fut)
+    transport.set_protocol(protocol)
+    protocol.connection_made(transport)
+    await asyncio.sleep(0.1)
+    assert b"ping" in transport.writes
+    assert not on_lost_fut.done()
+    await asyncio.wait_for(on_lost_fut, 1)
+    assert protocol._timers == set()
+
+
+@pytest.mark.asyncio
+async def test_metrics(make_transport):
+    """TC06: 统计收发字节数与连接数，超过标签数量上限的连接归入 other"""
+    from prometheus_client import CollectorRegistry
+    from veronica.transport.metrics import TransportMetrics
+
+    registry = CollectorRegistry()
+    metrics = TransportMetrics(registry=registry, label_mode="address", max_peers=1)
+
+    class MeteredProtocol(TCPClientProtocol):
+        pass
+    MeteredProtocol.metrics = metrics
+
+    protocol = MeteredProtocol()
+    protocol.connection_made(make_transport())
+    protocol.data_received(b"abc")
+    protocol.transmit_data(b"de")
+
+    def sample(name: str, peer: str = "127.0.0.1:8888") -> float | None:
+        return registry.get_sample_value(f"veronica_transport_{name}", {"peer": peer})
+
+    assert sample("received_bytes_total") == 3
+    assert sample("sent_bytes_total") == 2
+    assert sample("sent_messages_total") == 1
+    assert sample("connections") == 1
+    assert metrics.peer("10.0.0.1", 502) is metrics.peer("10.0.0.2", 502)
+    assert sample("connections", "other") == 0
+    protocol.connection_lost(None)
+    assert sample("connections") == 0
+
+
+def test_metrics_default_registry():
+    """TC07: 使用默认 registry 创建多个实例不会重复注册，实例之间共用指标"""
+    from prometheus_client import REGISTRY
+    from veronica.transport.metrics import TransportMetrics
+
+    first = TransportMetrics(namespace="veronica_test")
+    second = TransportMetrics(namespace="veronica_test", label_mode="address")
+    assert first.bytes_in is second.bytes_in
+    second.peer("10.0.0.1", 502).bytes_in.inc(5)
+    assert REGISTRY.get_sample_value("veronica_test_transport_received_bytes_total", {"peer": "10.0.0.1:502"}) == 5
@@ -0,0 +1,60 @@
+import time
+import ssl
+
+import pytest
+
+from veronica.transport.shard import ShardSupervisor, partition_hosts
+
+
+def wait_until(predicate, timeout: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return
+        time.sleep(0.05)
+    raise AssertionError("condition not met in time")
+
+
+def test_partition_is_stable():
+    """TC01: 分配结果只取决于地址，增加地址不影响已有地址的分配"""
+    hosts = [(f"10.0.0.{i}", 502) for i in range(100)]
+    shards = partition_hosts(hosts, 4)
+    assert sorted(h for shard in shards for h in shard) == sorted(hosts)
+    more = partition_hosts(hosts + [("10.0.1.1", 502)], 4)
+    for before, after in zip(shards, more):
+        assert set(before) <= set(after)
+
+
+def test_supervisor_aggregates_and_restarts(unused_port):
+    """TC02: 汇总工作进程上报的状态，工作进程异常退出后重启"""
+    port = unused_port()
+    hosts = [("127.0.0.1", port), ("localhost", port), ("127.0.0.2", port)]
+    supervisor = ShardSupervisor(hosts, workers=2, report_interval=0.1, restart_delay=0.1, fast_loop=False)
+    with supervisor:
+        wait_until(lambda: supervisor.status()["counters"].get("failures", 0) >= 3)
+        status = supervisor.status()
+        assert status["hosts"] == 3 and status["alive"] == 2
+
+        supervisor._processes[0].kill()
+        wait_until(lambda: supervisor.status()["restarts"] == 1 and supervisor.status()["alive"] == 2)
+    assert supervisor.status()["alive"] == 0
+
+
+def report_pool_options(pool) -> dict[str, int]:
+    return {"connect_timeout_ms": int(pool.connect_timeout * 1000), "jitter": int(pool.use_jitter)}
+
+
+def test_supervisor_pool_kwargs(unused_port):
+    """TC03: pool_kwargs 传给工作进程中的连接池，SSLContext 只能通过工厂函数在工作进程中创建"""
+    with pytest.raises(ValueError):
+        ShardSupervisor([], workers=1, pool_kwargs={"ssl_context": ssl.create_default_context()})
+
+    hosts = [("127.0.0.1", unused_port())]
+    supervisor = ShardSupervisor(
+        hosts, workers=1, report_interval=0.1, report_hook=report_pool_options, fast_loop=False,
+        pool_kwargs={"connect_timeout": 0.5, "use_jitter": True}
+    )
+    with supervisor:
+        wait_until(lambda: "jitter" in supervisor.status()["counters"])
+        counters = supervisor.status()["counters"]
+    assert counters["connect_timeout_ms"] == 500 and counters["jitter"] == 1
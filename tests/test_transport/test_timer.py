@@ -0,0 +1,108 @@
+import gc
+import asyncio
+import weakref
+
+from veronica.transport.timer import TimerWheel
+
+
+class FakeLoop:
+    """只实现时间轮用到的接口，时间由测试推进"""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.scheduled: list[tuple[float, object]] = []
+        self.errors: list[dict] = []
+
+    def time(self) -> float:
+        return self.now
+
+    def call_at(self, when, callback):
+        self.scheduled.append((when, callback))
+        return self
+
+    def cancel(self) -> None:
+        pass
+
+    def call_exception_handler(self, context: dict) -> None:
+        self.errors.append(context)
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+        while self.scheduled and self.scheduled[0][0] <= self.now + 1e-9:
+            _, callback = self.scheduled.pop(0)
+            callback()
+
+
+class TestTimerWheel:
+
+    def test_after_and_every(self):
+        """TC01: 单次与周期定时器按 tick 触发，整个时间轮只占用一个事件循环定时器"""
+        loop = FakeLoop()
+        wheel = TimerWheel(tick=0.1, slots=8, loop=loop)
+        fired: list[str] = []
+        wheel.after(0.25, fired.append, "once")
+        wheel.every(0.2, fired.append, "tick")
+        assert len(loop.scheduled) == 1
+        for _ in range(6):
+            loop.advance(0.1)
+        assert fired == ["tick", "once", "tick", "tick"]
+        assert len(wheel) == 1
+
+    def test_rounds_beyond_one_revolution(self):
+        """TC02: 超过一圈的定时器在正确的圈数触发"""
+        loop = FakeLoop()
+        wheel = TimerWheel(tick=1, slots=4, loop=loop)
+        fired: list[float] = []
+        wheel.after(10, lambda: fired.append(loop.now))
+        for _ in range(12):
+            loop.advance(1)
+        assert fired == [10]
+        assert loop.scheduled == []
+
+    def test_cancel_and_owner(self):
+        """TC03: 取消后不再触发，并从登记集合中移除"""
+        loop = FakeLoop()
+        wheel = TimerWheel(tick=0.1, slots=8, loop=loop)
+        owner: set = set()
+        fired: list[int] = []
+        handle = wheel.every(0.1, fired.append, 1, owner=owner)
+        wheel.after(0.1, fired.append, 2, owner=owner)
+        loop.advance(0.1)
+        assert fired == [1, 2] and owner == {handle}
+        handle.cancel()
+        loop.advance(0.1)
+        assert fired == [1, 2] and owner == set() and len(wheel) == 0
+
+    def test_callback_exception_is_reported(self):
+        """TC04: 回调异常交给事件循环异常处理器，不影响其他定时器"""
+        loop = FakeLoop()
+        wheel = TimerWheel(tick=0.1, slots=8, loop=loop)
+        fired: list[int] = []
+        wheel.after(0.1, lambda: 1 / 0)
+        wheel.after(0.1, fired.append, 1)
+        loop.advance(0.1)
+        assert fired == [1]
+        assert isinstance(loop.errors[0]["exception"], ZeroDivisionError)
+
+    def test_default_wheel_released_with_loop(self):
+        """TC05: 默认时间轮不阻止事件循环被回收，关闭时仍有定时器的事件循环在下次获取时清理"""
+        async def pending():
+            TimerWheel.get_default().after(60, print)
+            return weakref.ref(TimerWheel.get_default())
+
+        async def idle():
+            return TimerWheel.get_default()
+
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(asyncio.sleep(0))
+        assert TimerWheel.get_default(loop) is TimerWheel.get_default(loop)
+        loop_ref = weakref.ref(loop)
+        loop.close()
+        del loop
+        gc.collect()
+        assert loop_ref() is None
+
+        wheel_ref = asyncio.run(pending())
+        asyncio.run(idle())
+        gc.collect()
+        assert wheel_ref() is None
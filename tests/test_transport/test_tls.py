@@ -0,0 +1,76 @@
+import ssl
+import shutil
+import asyncio
+
+import pytest
+
+from veronica.transport.benchmark import _self_signed_cert
+from veronica.transport.connector import TCPConnector
+from veronica.transport.protocol import TCPClientProtocol
+from veronica.transport.tls import enable_session_reuse
+
+pytestmark = pytest.mark.skipif(shutil.which("openssl") is None, reason="openssl not found")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("reuse", [True, False])
+async def test_reconnect_resumes_session(tmp_path, reuse):
+    """TC01: 服务器断开后自动重连，开启会话复用时恢复上一次的 TLS 会话"""
+    cert, key = _self_signed_cert(str(tmp_path))
+    server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    server_context.load_cert_chain(cert, key)
+    writers: list[asyncio.StreamWriter] = []
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        writers.append(writer)
+        writer.write(b"hello")
+        await reader.read()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0, ssl=server_context)
+    port = server.sockets[0].getsockname()[1]
+    context = ssl.create_default_context(cafile=cert)
+    async with server:
+        connector = TCPConnector(
+            "127.0.0.1",
+            port,
+            True,
+            False,
+            TCPClientProtocol,
+            ssl_context=context,
+            server_hostname="localhost",
+            ssl_handshake_timeout=5,
+            session_reuse=reuse
+        )
+        task = asyncio.create_task(connector._reconnect())
+        for _ in range(200):
+            if connector.is_connected():
+                break
+            await asyncio.sleep(0.01)
+        assert connector.is_connected() and not connector.session_reused
+        await asyncio.sleep(0.05)
+
+        writers[0].close()
+        for _ in range(200):
+            if len(writers) == 2 and connector.is_connected():
+                break
+            await asyncio.sleep(0.01)
+        assert len(writers) == 2
+        assert connector.session_reused is reuse
+
+        connector.close()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        for writer in writers:
+            writer.close()
+        assert context.sslobject_class is ssl.SSLObject
+
+
+def test_enable_session_reuse_wraps_context(tmp_path):
+    """TC02: 会话复用包装调用方的 SSLContext，不修改其配置，创建的 SSLObject 使用原 SSLContext"""
+    cert, _ = _self_signed_cert(str(tmp_path))
+    context = ssl.create_default_context(cafile=cert)
+    wrapped = enable_session_reuse(context)
+    assert wrapped is not context and enable_session_reuse(wrapped) is wrapped
+    assert context.sslobject_class is ssl.SSLObject
+    sslobj = wrapped.wrap_bio(ssl.MemoryBIO(), ssl.MemoryBIO(), server_hostname="localhost")
+    assert sslobj.context is context and sslobj.server_hostname == "localhost"
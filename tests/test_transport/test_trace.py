@@ -0,0 +1,55 @@
+import os
+import signal
+import asyncio
+import logging
+
+import pytest
+
+from veronica.transport.trace import WireTracer, RX, TX
+
+
+class TestWireTracer:
+
+    def test_ring_keeps_latest_records(self):
+        """TC01: 每个连接只保留最近 maxlen 个报文"""
+        tracer = WireTracer(maxlen=2)
+        tracer.enable()
+        for i in range(3):
+            tracer.record("a:1", RX, bytes([i]))
+        tracer.record("b:2", TX, memoryview(b"\xff"))
+        assert [data for _, _, data in tracer.snapshot("a:1")] == [b"\x01", b"\x02"]
+        assert tracer.snapshot("b:2")[0][1:] == (TX, b"\xff")
+
+    def test_dump(self):
+        """TC02: 导出文本包含方向和十六进制数据"""
+        tracer = WireTracer()
+        tracer.record("a:1", TX, b"\x01\x02")
+        assert tracer.dump().endswith("[a:1] TXD >> 01 02")
+        assert tracer.dump("missing") == ""
+
+    def test_max_names(self):
+        """TC03: 连接名称超过上限时丢弃最早创建的记录"""
+        tracer = WireTracer(max_names=2)
+        for name in ("a:1", "b:2", "c:3"):
+            tracer.record(name, RX, b"\x00")
+        assert tracer.names() == ["b:2", "c:3"]
+
+    @pytest.mark.skipif(not hasattr(signal, "SIGUSR1"), reason="SIGUSR1 is not supported")
+    def test_signal_dump_runs_on_loop(self, caplog):
+        """TC04: 信号在事件循环中处理，持有锁时收到信号不会死锁"""
+        tracer = WireTracer()
+        tracer.record("a:1", RX, b"\x01")
+
+        async def main():
+            tracer.install_signal_handler(signal.SIGUSR1)
+            try:
+                with tracer._lock:
+                    os.kill(os.getpid(), signal.SIGUSR1)
+                    await asyncio.sleep(0)
+                await asyncio.sleep(0.05)
+            finally:
+                asyncio.get_running_loop().remove_signal_handler(signal.SIGUSR1)
+
+        with caplog.at_level(logging.INFO, logger="veronica.transport.trace"):
+            asyncio.run(main())
+        assert "[a:1] RXD << 01" in caplog.text
@@ -1,9 +1,11 @@
+import time
 import uuid
 import logging
 import asyncio
 import threading
-from typing import Optional, Callable, Any
-from dataclasses import dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING, Optional, Callable, Any, Iterable
+from dataclasses import dataclass, field, fields
 
 try:
     import confluent_kafka
@@ -11,18 +13,42 @@ except ImportError:
     raise ImportError("confluent_kafka is not installed., Please install it using pip insall confluent-kafka")
 
 from veronica.base.models import DataModel
+from veronica.encap.serializer import Serializer
+
+if TYPE_CHECKING:
+    from veronica.encap.kafka_metrics import KafkaMetrics
 
 logger = logging.getLogger(__name__)
 
+DeliveryCallback = Callable[[Optional[confluent_kafka.KafkaError], Optional[confluent_kafka.Message]], None]
+
 __all__ = [
     "AIOProducer",
-    "Producer"
+    "Producer",
+    "AIOConsumer"
 ]
 
+def _payload_size(value: Any) -> int:
+    try:
+        return len(value)
+    except TypeError:
+        return 0
+
+
 @dataclass
-class BaseProducer(DataModel):
-    """Base producer
+class BaseClient(DataModel):
+    """Config shared by producers and consumers
+
+    Notes:
+        Dataclass fields are mapped to librdkafka config by `to_config`, fields declared with
+        `metadata={"config": False}` are options of this wrapper and are left out.
+
+        When `metrics` is set, `to_config` adds its `on_stats` as `stats_cb` and enables
+        librdkafka statistics every `statistics_interval_ms` (5000 if not set).
 
+    Attributes:
+        statistics_interval_ms (Optional[int]): librdkafka statistics interval
+        metrics (Optional[KafkaMetrics]): Prometheus metrics fed by the statistics
     """
     bootstrap_servers: str = "localhost:9092"
     client_id: Optional[str] = None
@@ -30,28 +56,360 @@ class BaseProducer(DataModel):
     sasl_mechanism: Optional[str] = None
     sasl_username: Optional[str] = None
     sasl_password: Optional[str] = field(default=None, repr=False)
+    statistics_interval_ms: Optional[int] = None
+    metrics: Optional["KafkaMetrics"] = field(default=None, repr=False, metadata={"config": False})
 
 
-    def  __post_init__(self) -> None:
+    def __post_init__(self) -> None:
         if self.client_id is None:
             self.client_id = f"{self.__class__.__name__}_{uuid.uuid4()}"
-    
-        self._producer = confluent_kafka.Producer(self.to_config())
+
+
+    def to_config(self) -> dict:
+        """Formatting fields to build config for kafka client
+
+        Returns:
+            dict: librdkafka config
+        """
+        config = {}
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if value is not None and f.metadata.get("config", True):
+                config[f.name.replace("_", ".")] = value
+        if self.metrics is not None:
+            config["stats_cb"] = self.metrics.on_stats
+            config.setdefault("statistics.interval.ms", 5000)
+        return config
+
+
+class _SharedProducer:
+    """A confluent_kafka.Producer and its poll thread, used by one or more `BaseProducer`
+
+    Notes:
+        The poll thread only blocks in `poll()` while messages are in flight, where librdkafka wakes
+        it as soon as reports arrive. When nothing is in flight it sleeps on `wakeup`, which is set
+        by `produce`, `flush` and `close`, and only polls every `idle_interval` seconds to serve
+        errors and other events. After every poll the reports collected by each user are handed
+        to that user's event loop in one batch.
+
+        Producers created with `shared=True` and the same config get the same instance from
+        `_registry`, the instance is reference counted and the last `release` flushes the queue,
+        stops the poll thread and removes it from the registry. Messages still queued when its
+        timeout expires are purged and reported with a `_PURGE_QUEUE` or `_PURGE_INFLIGHT` error.
+
+    Attributes:
+        key (tuple | None): registry key, None for a producer that is not shared
+        producer (confluent_kafka.Producer): librdkafka client
+        users (tuple[BaseProducer, ...]): attached producers, replaced on change so the poll thread can iterate it without locking
+        refs (int): number of attached producers, guarded by `_registry_lock`
+        wakeup (threading.Event): wakes the idle poll thread
+        _closing (list[tuple[BaseProducer, threading.Event]]): producers detaching once their messages are delivered
+    """
+    def __init__(self, config: dict, key: tuple | None, poll_timeout: float, idle_interval: float) -> None:
+        self.key = key
+        self.client_id: str = config.get("client.id", "")
+        self.producer = confluent_kafka.Producer(config)
+        self.poll_timeout = poll_timeout
+        self.idle_interval = idle_interval
+        self.users: tuple["BaseProducer", ...] = ()
+        self.refs: int = 0
+        self.wakeup = threading.Event()
+        self.cancelled: bool = False
+        self.deadline: float | None = None
+        self._closing: list[tuple["BaseProducer", threading.Event]] = []
+        self._lock = threading.Lock()
+        self.thread: threading.Thread = threading.Thread(target=self._poll_loop)
+        self.thread.daemon = True
+        self.thread.start()
+
+
+    @classmethod
+    def acquire(cls, user: "BaseProducer", config: dict, shared: bool, ignore: tuple[str, ...] = ()) -> "_SharedProducer":
+        """Attach a producer to the shared client of its config, or to a new private client
+
+        Args:
+            user (BaseProducer): producer
+            config (dict): librdkafka config
+            shared (bool): look up and register the client in `_registry`
+            ignore (tuple[str, ...], optional): config keys left out of the registry key. Defaults to ().
+        """
+        key = None
+        if shared:
+            key = tuple(sorted((k, v) for k, v in config.items() if k not in ignore))
+            try:
+                hash(key)
+            except TypeError:
+                logger.warning(f"Config of {user.__class__.__name__} is not hashable, the producer is not shared")
+                key = None
+        with _registry_lock:
+            client = None if key is None else _registry.get(key)
+            if client is None:
+                client = cls(config, key, user.poll_timeout, user.idle_interval)
+                if key is not None:
+                    _registry[key] = client
+            client.refs += 1
+            with client._lock:
+                client.users += (user, )
+        return client
+
+
+    def release(self, user: "BaseProducer", timeout: float | None = None) -> int:
+        """Detach a producer once its messages are delivered, the last producer also stops the client
+
+        A producer that is not the last one stays attached until the reports of its remaining
+        messages are served, so they still reach its event loop after the timeout.
+
+        Args:
+            user (BaseProducer): producer
+            timeout (float | None, optional): max seconds to wait for its messages, None waits forever. Defaults to None.
+
+        Returns:
+            int: number of messages of the producer that are still not delivered
+        """
+        with _registry_lock:
+            self.refs -= 1
+            last = self.refs == 0
+            if last and self.key is not None and _registry.get(self.key) is self:
+                del _registry[self.key]
+        if last:
+            self.deadline = None if timeout is None else time.monotonic() + timeout
+            self.cancelled = True
+            self.wakeup.set()
+            self.thread.join()
+            remaining = user.pending
+            if len(self.producer):
+                # the poll thread has stopped, serve the reports of the purged messages here
+                self.producer.purge(blocking=False)
+                self.producer.poll(0)
+                self._serve_users()
+        elif user.pending:
+            done = threading.Event()
+            with self._lock:
+                self._closing.append((user, done))
+            self.wakeup.set()
+            if not done.wait(timeout):
+                return user.pending
+            remaining = user.pending
+        else:
+            remaining = 0
+        with self._lock:
+            self.users = tuple(u for u in self.users if u is not user)
+            self._closing = [(u, e) for u, e in self._closing if u is not user]
+        return remaining
+
+
+    def _poll_loop(self) -> None:
+        producer, wakeup = self.producer, self.wakeup
+        while True:
+            if len(producer):
+                if self.cancelled and self.deadline is not None and time.monotonic() >= self.deadline:
+                    break
+                producer.poll(self.poll_timeout)
+            else:
+                if self.cancelled and not len(producer):
+                    break
+                wakeup.wait(self.idle_interval)
+                wakeup.clear()
+                producer.poll(0)
+            self._serve_users()
+        self._serve_users()
+
+
+    def _serve_users(self) -> None:
+        """Dispatch the reports of every user and resolve flushes and closes that are complete"""
+        for user in self.users:
+            if user._reports:
+                user._dispatch_reports()
+            if user._flush_waiters and not user.pending:
+                user._notify_flushed()
+        if self._closing:
+            with self._lock:
+                for user, done in self._closing:
+                    if not user.pending:
+                        done.set()
+                        self.users = tuple(u for u in self.users if u is not user)
+                self._closing = [(u, e) for u, e in self._closing if not e.is_set()]
+
+
+_registry: dict[tuple, _SharedProducer] = {}
+_registry_lock = threading.Lock()
+
+
+@dataclass
+class BaseProducer(BaseClient):
+    """Base producer
+
+    Notes:
+        Delivery reports are served by a background poll thread (see `_SharedProducer`). Reports
+        triggered by one `poll()` call are collected in `_reports` and handed to the event loop
+        with a single `call_soon_threadsafe`, so the cost of waking the loop does not grow with
+        message rate.
+
+        With `shared=True`, producers with the same config share one librdkafka client and one
+        poll thread. Each producer keeps its own event loop, serializer, `flush` and `close`,
+        which only wait for the messages it produced. Without an explicit `client_id` the id of
+        the first producer is used.
+
+        Keys and values go through `serializer` before reaching librdkafka, bytes and str are
+        passed through and other types need a registered or fallback encoder.
+
+    Attributes:
+        poll_timeout (float): max blocking time of one `poll()` while messages are in flight
+        idle_interval (float): poll interval while nothing is in flight
+        serializer (Serializer): encoder of message keys and values
+        shared (bool): share the librdkafka client with other producers of the same config
+    """
+    poll_timeout = 0.1
+    idle_interval = 1.0
+
+    serializer: Serializer = field(default_factory=Serializer, repr=False, metadata={"config": False})
+    shared: bool = field(default=False, metadata={"config": False})
+
+
+    def  __post_init__(self) -> None:
+        auto_id = self.client_id is None
+        super().__post_init__()
+        self._reports: list[tuple[asyncio.Future | None, DeliveryCallback | None, Any, Any]] = []
+        self._submitted: int = 0
+        self._completed: int = 0
+        self._in_flight: int = 0
+        self._space = asyncio.Event()
         self._cancelled: bool = False
+        self._flush_waiters: list[asyncio.Future] = []
+        self._flush_lock = threading.Lock()
         self._loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
-        self._poll_thread: threading.Thread = threading.Thread(target=self._poll_loop)
-        self._poll_thread.daemon = True
-        self._poll_thread.start()
+        self._client = _SharedProducer.acquire(self, self.to_config(), self.shared, ("client.id", ) if auto_id else ())
+        self._producer = self._client.producer
+        self._wakeup = self._client.wakeup
+        self.client_id = self._client.client_id
 
 
-    def _poll_loop(self) -> None:
-        while not self._cancelled:
-            self._producer.poll(timeout=0.1)
-            
+    @property
+    def pending(self) -> int:
+        """Number of messages produced by this producer whose delivery reports were not served yet"""
+        return self._submitted - self._completed
+
+
+    def _wake(self) -> None:
+        """Wake the poll thread if it is sleeping because nothing was in flight"""
+        if not self._wakeup.is_set():
+            self._wakeup.set()
+
+
+    def _notify_flushed(self) -> None:
+        """Resolve pending `flush` calls, run in the poll thread once nothing is pending"""
+        with self._flush_lock:
+            waiters, self._flush_waiters = self._flush_waiters, []
+        try:
+            self._loop.call_soon_threadsafe(self._resolve_flushed, waiters, self.pending)
+        except RuntimeError:
+            pass
+
+
+    @staticmethod
+    def _resolve_flushed(waiters: list[asyncio.Future], remaining: int) -> None:
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(remaining)
+
+
+    def _collect_report(
+        self,
+        future: asyncio.Future | None,
+        on_delivery: DeliveryCallback | None,
+        err: Optional[confluent_kafka.KafkaError],
+        msg: Optional[confluent_kafka.Message]
+    ) -> None:
+        """Delivery callback run by librdkafka inside `poll()`, only records the report"""
+        self._reports.append((future, on_delivery, err, msg))
+        self._completed += 1
+
+
+    def _dispatch_reports(self) -> None:
+        """Hand the reports collected during the last `poll()` to the event loop in one batch"""
+        reports, self._reports = self._reports, []
+        try:
+            self._loop.call_soon_threadsafe(self._resolve_reports, reports)
+        except RuntimeError:
+            logger.warning(f"Event loop is closed, dropping {len(reports)} delivery reports")
+
+
+    def _resolve_reports(self, reports: list[tuple[asyncio.Future | None, DeliveryCallback | None, Any, Any]]) -> None:
+        """Resolve futures and run user callbacks of a batch of reports in the event loop"""
+        self._in_flight -= len(reports)
+        if not self._space.is_set():
+            self._space.set()
+        for future, on_delivery, err, msg in reports:
+            if future is not None and not future.done():
+                if err:
+                    future.set_exception(confluent_kafka.KafkaException(err))
+                else:
+                    future.set_result(msg)
+            if on_delivery is not None:
+                try:
+                    on_delivery(err, msg)
+                except Exception:
+                    logger.exception("Error in on_delivery callback")
+
             
-    def close(self) -> None:
+    async def flush(self, timeout: float | None = None) -> int:
+        """Wait until the messages of this producer are delivered and their futures are resolved
+
+        Args:
+            timeout (float | None, optional): max seconds to wait, None waits forever. Defaults to None.
+
+        Returns:
+            int: number of messages still pending, 0 on success
+        """
+        if not self._client.thread.is_alive():
+            return self.pending
+        waiter = self._loop.create_future()
+        with self._flush_lock:
+            self._flush_waiters.append(waiter)
+        self._wakeup.set()
+        try:
+            async with asyncio.timeout(timeout):
+                return await asyncio.shield(waiter)
+        except TimeoutError:
+            return self.pending
+
+
+    def close(self, timeout: float | None = 5.0) -> int:
+        """Stop accepting messages and wait for the delivery of queued messages, the last user
+        of a shared client also stops its poll thread
+
+        This blocks the calling thread, inside a coroutine use `await aclose()` instead. Messages
+        still pending after `timeout` are reported as failed: the last user of a client purges
+        them with a `_PURGE_QUEUE` or `_PURGE_INFLIGHT` error, otherwise they are reported when
+        librdkafka delivers them or they reach `message.timeout.ms`.
+
+        Args:
+            timeout (float | None, optional): max seconds to wait for queued messages, None waits forever. Defaults to 5.0.
+
+        Returns:
+            int: number of messages of this producer that were not delivered
+        """
+        if self._cancelled:
+            return self.pending
         self._cancelled = True
-        self._poll_thread.join()
+        remaining = self._client.release(self, timeout)
+        if remaining:
+            logger.warning(f"{remaining} messages were not delivered before close")
+        return remaining
+
+
+    async def aclose(self, timeout: float | None = 5.0) -> int:
+        """Same as `close`, but waits for the delivery of queued messages in the event loop
+
+        Args:
+            timeout (float | None, optional): max seconds to wait for queued messages, None waits forever. Defaults to 5.0.
+
+        Returns:
+            int: number of messages of this producer that were not delivered
+        """
+        if not self._cancelled:
+            await self.flush(timeout)
+        return self.close(0)
     
     
     @staticmethod
@@ -65,20 +423,16 @@ class BaseProducer(DataModel):
             logger.debug(f"Message delivered to {msg.topic()} [{msg.partition()}]")
     
 
-    def to_config(self) -> dict:
-        """Formatting fields to build config for kafka producer
-
-        Returns:
-            dict: _description_
-        """
-        return {k.replace("_", "."): v for k, v in self.to_dict(exclude_none=True).items()}
-    
-    
     def produce(
         self, 
         topic: str, 
-        value: str, 
-        on_delivery: Optional[Callable[[Any, Any], None]] = None
+        value: Any, 
+        on_delivery: Optional[Callable[[Any, Any], None]] = None,
+        *,
+        key: Any = None,
+        headers: Optional[list[tuple[str, bytes]] | dict[str, bytes]] = None,
+        partition: Optional[int] = None,
+        timestamp: Optional[int] = None
     ) -> Any:
         raise NotImplementedError
 
@@ -93,45 +447,162 @@ class AIOProducer(BaseProducer):
         
         refer: https://github.com/confluentinc/confluent-kafka-python/blob/master/examples/asyncio_example.py
 
-    Args:
-        BaseProducer (_type_): _description_
+        `send` and `produce_many` wait instead of raising `BufferError` when the local queue is
+        full, and keep at most `max_in_flight_messages` messages waiting for their delivery reports, so
+        the memory used by a burst of messages stays bounded.
+
+        `send` serializes values whose `len()` reaches `offload_threshold` in the loop's default
+        executor. Encoders such as orjson hold the GIL, so this does not add parallelism, but the
+        event loop keeps running during the encoding of large payloads.
+
+    Attributes:
+        max_in_flight_messages (Optional[int]): max number of messages waiting for delivery reports
+            before `send` and `produce_many` wait, None leaves the limit to librdkafka's
+            `queue.buffering.max.messages`
+        offload_threshold (Optional[int]): min `len()` of a value serialized in a worker thread by `send`, None never offloads
     """
+    max_in_flight_messages: Optional[int] = field(default=None, metadata={"config": False})
+    offload_threshold: Optional[int] = field(default=None, metadata={"config": False})
+
+
     def produce(
         self, 
         topic: str, 
-        value: str, 
-        on_delivery: Optional[Callable[[Optional[confluent_kafka.KafkaError], Optional[confluent_kafka.Message]], None]] = None
+        value: Any, 
+        on_delivery: Optional[DeliveryCallback] = None,
+        *,
+        key: Any = None,
+        headers: Optional[list[tuple[str, bytes]] | dict[str, bytes]] = None,
+        partition: Optional[int] = None,
+        timestamp: Optional[int] = None
     ) -> asyncio.Future[Any]:
         """Produces a message to the given topic with a callback
 
         Args:
-            topic (str): _description_
-            value (str): _description_
-            on_delivery (Optional[Callable[[Optional[confluent_kafka.KafkaError], Optional[confluent_kafka.Message]], None]], optional): _description_. Defaults to None.
+            topic (str): topic
+            value (Any): message value, encoded by `serializer`
+            on_delivery (Optional[DeliveryCallback], optional): called in the event loop after the future is resolved. Defaults to None.
+            key (Any, optional): message key, encoded by `serializer`, messages with the same key go to the same partition. Defaults to None.
+            headers (Optional[list[tuple[str, bytes]] | dict[str, bytes]], optional): message headers. Defaults to None.
+            partition (Optional[int], optional): target partition, None lets the partitioner choose. Defaults to None.
+            timestamp (Optional[int], optional): message timestamp in milliseconds since epoch, None uses the current time. Defaults to None.
 
         Returns:
-            asyncio.Future[Any]: _description_
+            asyncio.Future[Any]: resolved with the message when delivered
+
+        Raises:
+            BufferError: the local queue is full
+            RuntimeError: the producer is closed
         """
+        if self._cancelled:
+            raise RuntimeError("Producer is closed")
+        serialize = self.serializer
+        value, key = serialize(value), serialize(key)
         result = self._loop.create_future()
-        def ack(err, msg) -> None:
-            if err:
-                self._loop.call_soon_threadsafe(
-                    result.set_exception, 
-                    confluent_kafka.KafkaException(err),
-                )
-            else:
-                self._loop.call_soon_threadsafe(
-                    result.set_result,
-                    msg,
-                )
-            if on_delivery:
-                self._loop.call_soon_threadsafe(
-                    on_delivery,
-                    err,
-                    msg,
-                )
-        self._producer.produce(topic, value, on_delivery=ack)
+        # counted before produce, the poll thread may report the message before produce returns
+        self._submitted += 1
+        try:
+            self._producer.produce(
+                topic,
+                value,
+                key,
+                partition=-1 if partition is None else partition,
+                on_delivery=partial(self._collect_report, result, on_delivery),
+                timestamp=timestamp or 0,
+                headers=headers,
+            )
+        except BaseException:
+            self._submitted -= 1
+            raise
+        self._in_flight += 1
+        self._wake()
         return result
+
+
+    async def send(
+        self,
+        topic: str,
+        value: Any,
+        on_delivery: Optional[DeliveryCallback] = None,
+        **kwargs: Any
+    ) -> asyncio.Future[Any]:
+        """Same as `produce`, but waits for local queue space and the in-flight limit
+
+        Returns:
+            asyncio.Future[Any]: resolved with the message when delivered
+        """
+        threshold = self.offload_threshold
+        if threshold is not None and not isinstance(value, (bytes, str)) and _payload_size(value) >= threshold:
+            value = await self._loop.run_in_executor(None, self.serializer, value)
+        while True:
+            if self.max_in_flight_messages is not None and self._in_flight >= self.max_in_flight_messages:
+                await self._wait_for_space()
+                continue
+            try:
+                return self.produce(topic, value, on_delivery, **kwargs)
+            except BufferError:
+                await self._wait_for_space()
+
+
+    async def produce_many(
+        self,
+        topic: str,
+        values: Iterable[Any],
+        on_delivery: Optional[DeliveryCallback] = None,
+        *,
+        key: Optional[Callable[[Any], Any]] = None
+    ) -> int:
+        """Produces messages from an iterable, waiting for queue space when needed
+
+        No future is created per message, delivery errors are reported to `on_delivery`,
+        use `flush` to wait for the delivery of all messages.
+
+        Args:
+            topic (str): topic
+            values (Iterable[Any]): message values
+            on_delivery (Optional[DeliveryCallback], optional): called in the event loop for every message. Defaults to None.
+            key (Optional[Callable[[Any], Any]], optional): derives the message key from a value. Defaults to None.
+
+        Returns:
+            int: number of messages queued
+        """
+        if self._cancelled:
+            raise RuntimeError("Producer is closed")
+        produce, callback, limit = self._producer.produce, partial(self._collect_report, None, on_delivery), self.max_in_flight_messages
+        serialize, count = self.serializer, 0
+        for value in values:
+            data = serialize(value)
+            key_data = None if key is None else serialize(key(value))
+            while True:
+                if limit is not None and self._in_flight >= limit:
+                    await self._wait_for_space()
+                    continue
+                self._submitted += 1
+                try:
+                    produce(topic, data, key_data, on_delivery=callback)
+                except BufferError:
+                    self._submitted -= 1
+                    await self._wait_for_space()
+                    continue
+                except BaseException:
+                    self._submitted -= 1
+                    raise
+                self._in_flight += 1
+                self._wake()
+                count += 1
+                break
+        return count
+
+
+    async def _wait_for_space(self) -> None:
+        """Wait until the next batch of delivery reports is resolved"""
+        if self._cancelled:
+            raise RuntimeError("Producer is closed")
+        self._space.clear()
+        try:
+            await asyncio.wait_for(self._space.wait(), self.poll_timeout)
+        except TimeoutError:
+            pass
         
         
 @dataclass
@@ -141,6 +612,275 @@ class Producer(BaseProducer):
         self,
         topic: str,
         value: Any,
-        on_delivery: Optional[Callable[[Optional[confluent_kafka.KafkaError], Optional[confluent_kafka.Message]], None]] = None
+        on_delivery: Optional[DeliveryCallback] = None,
+        *,
+        key: Any = None,
+        headers: Optional[list[tuple[str, bytes]] | dict[str, bytes]] = None,
+        partition: Optional[int] = None,
+        timestamp: Optional[int] = None
+    ) -> None:
+        if self._cancelled:
+            raise RuntimeError("Producer is closed")
+        serialize = self.serializer
+        value, key = serialize(value), serialize(key)
+        self._submitted += 1
+        try:
+            self._producer.produce(
+                topic,
+                value,
+                key,
+                partition=-1 if partition is None else partition,
+                on_delivery=partial(self._count_report, on_delivery),
+                timestamp=timestamp or 0,
+                headers=headers,
+            )
+        except BaseException:
+            self._submitted -= 1
+            raise
+        self._wake()
+
+
+    def _count_report(
+        self,
+        on_delivery: Optional[DeliveryCallback],
+        err: Optional[confluent_kafka.KafkaError],
+        msg: Optional[confluent_kafka.Message]
     ) -> None:
-        self._producer.produce(topic, value, on_delivery=on_delivery)
\ No newline at end of file
+        """Delivery callback run in the poll thread, counts the report and calls `on_delivery`"""
+        self._completed += 1
+        if on_delivery is not None:
+            try:
+                on_delivery(err, msg)
+            except Exception:
+                logger.exception("Error in on_delivery callback")
+
+
+@dataclass
+class AIOConsumer(BaseClient):
+    """async kafka consumer
+
+    Notes:
+        A worker thread calls `consume(batch_size, batch_timeout)` and hands every non-empty batch
+        to the event loop with one `call_soon_threadsafe`. At most `max_batches` batches wait in
+        memory, after that the worker stops consuming until the application catches up.
+
+        Offsets are committed at-least-once: a batch counts as processed when the next batch is
+        requested or `commit` is called, and processed offsets are committed asynchronously once
+        `commit_every` messages or `commit_interval` seconds have accumulated. `close` and `aclose`
+        commit the remaining processed offsets synchronously. With `enable_auto_commit` librdkafka
+        commits offsets itself and no manual commit is made.
+
+        When partitions are revoked by a rebalance, the processed offsets of those partitions are
+        committed synchronously before the partitions are handed over. Messages of the revoked
+        partitions that were consumed but not yet returned are dropped, and so are the offsets of
+        the batch being processed; the new owner consumes them again.
+
+    Example:
+    >>> consumer = AIOConsumer(group_id="telemetry", topics=["telemetry"])
+    >>> async for batch in consumer:
+    ...     handle([msg.value() for msg in batch])
+
+    Attributes:
+        topics (list[str]): topics to subscribe
+        batch_size (int): max number of messages of one batch
+        batch_timeout (float): max seconds to wait for a batch, also bounds the time `close` waits for the worker
+        max_batches (int): max number of batches waiting to be processed
+        commit_every (int): commit after this many messages are processed
+        commit_interval (float): commit after this many seconds since the last commit
+    """
+    group_id: Optional[str] = None
+    auto_offset_reset: Optional[str] = None
+    enable_auto_commit: bool = False
+    topics: list[str] = field(default_factory=list, metadata={"config": False})
+    batch_size: int = field(default=500, metadata={"config": False})
+    batch_timeout: float = field(default=0.5, metadata={"config": False})
+    max_batches: int = field(default=4, metadata={"config": False})
+    commit_every: int = field(default=1000, metadata={"config": False})
+    commit_interval: float = field(default=5.0, metadata={"config": False})
+
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        self._consumer = confluent_kafka.Consumer(self.to_config())
+        self._loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+        self._batches: asyncio.Queue[tuple[list[confluent_kafka.Message], dict[tuple[str, int], int], int] | None] = asyncio.Queue()
+        self._slots = threading.Semaphore(self.max_batches)
+        self._current: tuple[dict[tuple[str, int], int], int, int] | None = None
+        self._offsets: dict[tuple[str, int], int] = {}
+        self._uncommitted: int = 0
+        self._last_commit: float = time.monotonic()
+        self._generation: int = 0
+        self._revoked: dict[tuple[str, int], int] = {}
+        self._lock = threading.Lock()
+        self._cancelled: bool = False
+        self._closed: bool = False
+        if self.topics:
+            self._consumer.subscribe(self.topics, on_revoke=self._on_revoke)
+        self._consume_thread: threading.Thread = threading.Thread(target=self._consume_loop)
+        self._consume_thread.daemon = True
+        self._consume_thread.start()
+
+
+    def __aiter__(self) -> "AIOConsumer":
+        return self
+
+
+    async def __anext__(self) -> list[confluent_kafka.Message]:
+        self._mark_processed()
+        while True:
+            item = await self._batches.get()
+            if item is None:
+                self._batches.put_nowait(None)
+                raise StopAsyncIteration
+            self._slots.release()
+            batch, offsets, generation = item
+            if generation != self._generation:
+                batch, offsets = self._drop_revoked(batch, offsets, generation)
+                if not batch:
+                    continue
+            self._current = (offsets, len(batch), generation)
+            return batch
+
+
+    def _consume_loop(self) -> None:
+        consumer, slots = self._consumer, self._slots
+        while not self._cancelled:
+            if not slots.acquire(timeout=self.batch_timeout):
+                continue
+            # rebalance callbacks run inside consume, a batch is tagged with the generation it started in
+            generation = self._generation
+            try:
+                messages = consumer.consume(self.batch_size, self.batch_timeout)
+            except confluent_kafka.KafkaException as e:
+                logger.error(f"Consume failed: {e}")
+                messages = []
+            batch, offsets = [], {}
+            for msg in messages:
+                err = msg.error()
+                if err is not None:
+                    if err.code() != confluent_kafka.KafkaError._PARTITION_EOF:
+                        logger.error(f"Consumer error: {err}")
+                    continue
+                batch.append(msg)
+                offsets[(msg.topic(), msg.partition())] = msg.offset()
+            if not batch:
+                slots.release()
+                continue
+            try:
+                self._loop.call_soon_threadsafe(self._batches.put_nowait, (batch, offsets, generation))
+            except RuntimeError:
+                logger.warning(f"Event loop is closed, dropping {len(batch)} messages")
+                break
+        try:
+            self._loop.call_soon_threadsafe(self._batches.put_nowait, None)
+        except RuntimeError:
+            pass
+
+
+    def _on_revoke(self, consumer: confluent_kafka.Consumer, partitions: list[confluent_kafka.TopicPartition]) -> None:
+        """Commit the processed offsets of the revoked partitions before they are handed over
+
+        Runs in the thread calling `consume` or `close`.
+        """
+        with self._lock:
+            self._generation += 1
+            offsets = {}
+            for tp in partitions:
+                key = (tp.topic, tp.partition)
+                self._revoked[key] = self._generation
+                if key in self._offsets:
+                    offsets[key] = self._offsets.pop(key)
+        self._commit_partitions(offsets, asynchronous=False)
+
+
+    def _drop_revoked(
+        self,
+        batch: list[confluent_kafka.Message],
+        offsets: dict[tuple[str, int], int],
+        generation: int
+    ) -> tuple[list[confluent_kafka.Message], dict[tuple[str, int], int]]:
+        revoked = {key for key in offsets if self._revoked.get(key, 0) > generation}
+        if not revoked:
+            return batch, offsets
+        logger.debug(f"Dropping messages of revoked partitions {sorted(revoked)}")
+        batch = [msg for msg in batch if (msg.topic(), msg.partition()) not in revoked]
+        return batch, {key: offset for key, offset in offsets.items() if key not in revoked}
+
+
+    def _mark_processed(self) -> None:
+        """Record the offsets of the current batch and commit when enough have accumulated"""
+        current = self._current
+        if current is None:
+            return
+        self._current = None
+        offsets, count, generation = current
+        with self._lock:
+            if generation != self._generation:
+                offsets = {key: offset for key, offset in offsets.items() if self._revoked.get(key, 0) <= generation}
+            self._offsets.update(offsets)
+        self._uncommitted += count
+        if self._uncommitted >= self.commit_every or time.monotonic() - self._last_commit >= self.commit_interval:
+            self._commit(asynchronous=True)
+
+
+    def _commit(self, asynchronous: bool) -> None:
+        with self._lock:
+            offsets, self._offsets = self._offsets, {}
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+        self._commit_partitions(offsets, asynchronous)
+
+
+    def _commit_partitions(self, offsets: dict[tuple[str, int], int], asynchronous: bool) -> None:
+        if not offsets or self.enable_auto_commit:
+            return
+        partitions = [confluent_kafka.TopicPartition(topic, partition, offset + 1) for (topic, partition), offset in offsets.items()]
+        try:
+            self._commit_offsets(partitions, asynchronous)
+        except confluent_kafka.KafkaException as e:
+            logger.error(f"Commit failed: {e}")
+
+
+    def _commit_offsets(self, partitions: list[confluent_kafka.TopicPartition], asynchronous: bool) -> None:
+        self._consumer.commit(offsets=partitions, asynchronous=asynchronous)
+
+
+    def commit(self, asynchronous: bool = True) -> None:
+        """Mark the current batch as processed and commit all processed offsets now
+
+        Args:
+            asynchronous (bool, optional): return without waiting for the broker. Defaults to True.
+        """
+        self._mark_processed()
+        self._commit(asynchronous)
+
+
+    def close(self) -> None:
+        """Stop consuming, commit processed offsets and close the consumer
+
+        This blocks the calling thread while the worker thread is joined and librdkafka leaves the
+        group, inside a coroutine use `await aclose()` instead. The batch returned last is not
+        committed unless `commit` was called after processing it, batches not yet returned are
+        discarded and will be consumed again.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._cancelled = True
+        self._shutdown()
+
+    async def aclose(self) -> None:
+        """Same as `close`, but joins the worker thread and closes the consumer in the default
+        executor, so the event loop keeps running while librdkafka leaves the group
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._cancelled = True
+        await self._loop.run_in_executor(None, self._shutdown)
+
+
+    def _shutdown(self) -> None:
+        self._consume_thread.join()
+        self._commit(asynchronous=False)
+        self._consumer.close()
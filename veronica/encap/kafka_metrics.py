@@ -0,0 +1,186 @@
+import json
+import queue
+import logging
+import threading
+from typing import Any
+
+try:
+    from prometheus_client import Gauge, Histogram, CollectorRegistry, REGISTRY
+except ImportError:
+    raise ImportError("prometheus-client is not installed., Please install it using pip insall prometheus-client")
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "KafkaMetrics"
+]
+
+# librdkafka 窗口统计中导出的分位数
+_QUANTILES = (("0.5", "p50"), ("0.99", "p99"))
+
+# 每个 registry 中已注册的指标，同一 registry 上的多个 KafkaMetrics 共用
+_collectors: dict[tuple[CollectorRegistry, str], Gauge | Histogram] = {}
+_collectors_lock = threading.Lock()
+
+
+def _collector(cls, name: str, documentation: str, labelnames: tuple[str, ...], *, registry: CollectorRegistry | None, **kwargs):
+    if registry is None:
+        return cls(name, documentation, labelnames, registry=None, **kwargs)
+    key = (registry, f"{kwargs['namespace']}_{kwargs['subsystem']}_{name}")
+    with _collectors_lock:
+        collector = _collectors.get(key)
+        if collector is None:
+            collector = _collectors[key] = cls(name, documentation, labelnames, registry=registry, **kwargs)
+    return collector
+
+
+class KafkaMetrics:
+    """librdkafka 统计信息的 Prometheus 指标
+
+    赋值给生产者或消费者的 `metrics` 字段即可开启，`to_config` 会设置 `stats_cb` 和 `statistics.interval.ms`。
+    `stats_cb` 在 poll/consume 线程中调用，只把 JSON 字符串放入队列，解析和更新指标在单独的线程中进行，
+    不占用投递报告和消息批次的处理时间；队列满时丢弃最新的统计并计入 `dropped`。
+    同一 registry 和 namespace 下可以创建多个实例，它们共用第一次注册的指标。
+
+    Example:
+    >>> metrics = KafkaMetrics()
+    >>> producer = AIOProducer(metrics=metrics, statistics_interval_ms=5000)
+
+    Attributes:
+        max_pending (int): 等待解析的统计信息数量上限
+        dropped (int): 因队列已满丢弃的统计信息数量
+        _queue (queue.Queue[str | None]): 等待解析的统计信息
+        _thread (threading.Thread | None): 解析线程
+    """
+    def __init__(
+        self,
+        *,
+        namespace: str = "veronica",
+        registry: CollectorRegistry | None = REGISTRY,
+        max_pending: int = 16,
+        latency_buckets: tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+        size_buckets: tuple[float, ...] = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+        count_buckets: tuple[float, ...] = (1, 10, 100, 1000, 10000, 100000)
+    ) -> None:
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._queue: queue.Queue[str | None] = queue.Queue(max_pending)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+        kwargs = dict(namespace=namespace, subsystem="kafka", registry=registry)
+        client = ("client", )
+        broker = ("client", "broker")
+        topic = ("client", "topic")
+        self.queue_messages = _collector(Gauge, "queue_messages", "Messages in the producer queues", client, **kwargs)
+        self.queue_bytes = _collector(Gauge, "queue_bytes", "Bytes of messages in the producer queues", client, **kwargs)
+        self.reply_queue = _collector(Gauge, "reply_queue_ops", "Ops waiting to be served by poll()", client, **kwargs)
+        self.outbuf_messages = _collector(
+            Gauge, "broker_outbuf_messages", "Messages waiting to be sent to the broker", broker, **kwargs
+        )
+        self.waitresp_requests = _collector(
+            Gauge, "broker_waitresp_requests", "Requests in flight waiting for a broker response", broker, **kwargs
+        )
+        self.rtt = _collector(
+            Gauge, "broker_rtt_seconds", "Broker round-trip time in the last statistics window", broker + ("quantile", ), **kwargs
+        )
+        self.queue_latency = _collector(
+            Gauge, "broker_queue_latency_seconds",
+            "Time messages spend in the producer queue in the last statistics window",
+            broker + ("quantile", ),
+            **kwargs
+        )
+        self.consumer_lag = _collector(Gauge, "consumer_lag_messages", "Consumer lag summed over partitions", topic, **kwargs)
+        self.request_latency = _collector(
+            Histogram, "broker_rtt_window_seconds", "Average broker round-trip time of each statistics window",
+            broker, buckets=latency_buckets, **kwargs
+        )
+        self.batch_size = _collector(
+            Histogram, "batch_size_bytes", "Average producer batch size of each statistics window",
+            topic, buckets=size_buckets, **kwargs
+        )
+        self.batch_messages = _collector(
+            Histogram, "batch_messages", "Average number of messages per producer batch of each statistics window",
+            topic, buckets=count_buckets, **kwargs
+        )
+
+    def on_stats(self, stats: str) -> None:
+        """librdkafka 的 `stats_cb`，只入队不解析
+
+        Args:
+            stats (str): JSON 格式的统计信息
+        """
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(stats)
+        except queue.Full:
+            self.dropped += 1
+
+    def update(self, stats: dict[str, Any]) -> None:
+        """用解析后的统计信息更新指标
+
+        Args:
+            stats (dict[str, Any]): 统计信息
+        """
+        client = stats.get("client_id", "")
+        self.queue_messages.labels(client).set(stats.get("msg_cnt", 0))
+        self.queue_bytes.labels(client).set(stats.get("msg_size", 0))
+        self.reply_queue.labels(client).set(stats.get("replyq", 0))
+
+        for name, broker in stats.get("brokers", {}).items():
+            if broker.get("nodeid", -1) < 0:
+                continue
+            self.outbuf_messages.labels(client, name).set(broker.get("outbuf_msg_cnt", 0))
+            self.waitresp_requests.labels(client, name).set(broker.get("waitresp_cnt", 0))
+            rtt = broker.get("rtt", {})
+            if rtt.get("cnt"):
+                self.request_latency.labels(client, name).observe(rtt["avg"] / 1e6)
+                for quantile, key in _QUANTILES:
+                    self.rtt.labels(client, name, quantile).set(rtt[key] / 1e6)
+            latency = broker.get("int_latency", {})
+            if latency.get("cnt"):
+                for quantile, key in _QUANTILES:
+                    self.queue_latency.labels(client, name, quantile).set(latency[key] / 1e6)
+
+        for name, topic in stats.get("topics", {}).items():
+            batch_size, batch_count = topic.get("batchsize", {}), topic.get("batchcnt", {})
+            if batch_size.get("cnt"):
+                self.batch_size.labels(client, name).observe(batch_size["avg"])
+            if batch_count.get("cnt"):
+                self.batch_messages.labels(client, name).observe(batch_count["avg"])
+            if stats.get("type") == "consumer":
+                lag = sum(
+                    p["consumer_lag"] for p in topic.get("partitions", {}).values()
+                    if p.get("partition", -1) >= 0 and p.get("consumer_lag", -1) >= 0
+                )
+                self.consumer_lag.labels(client, name).set(lag)
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """处理完已入队的统计信息后停止解析线程
+
+        Args:
+            timeout (float | None, optional): 等待线程退出的时间. Defaults to 5.0.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="veronica-kafka-stats", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            stats = self._queue.get()
+            if stats is None:
+                break
+            try:
+                self.update(json.loads(stats))
+            except Exception:
+                logger.exception("Failed to process kafka statistics")
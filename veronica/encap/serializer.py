@@ -0,0 +1,106 @@
+import logging
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "Serializer"
+]
+
+Encoder = Callable[[Any], Any]
+
+
+def _passthrough(value: Any) -> Any:
+    return value
+
+
+class Serializer:
+    """Turn message values into bytes for clients such as the kafka producers
+
+    Notes:
+        bytes and str are passed through untouched (librdkafka encodes str as UTF-8),
+        bytearray and memoryview are copied to bytes and None stays None (kafka tombstones).
+        Any other type is handled by an encoder registered with `register`, looked up along
+        the MRO, or by the fallback encoder (orjson / msgpack).
+
+        The encoder chosen for a type is cached in `_encoders`, so the lookup runs once per
+        type and every later value costs one dict lookup.
+
+    Example:
+    >>> serializer = Serializer.orjson()
+    >>> serializer.register(Telemetry, lambda t: t.to_bytes())
+    >>> producer = AIOProducer(serializer=serializer)
+
+    Attributes:
+        fallback (Optional[Encoder]): encoder for types without a registered encoder, None raises TypeError
+        _registered (dict[type, Encoder]): encoders registered by type
+        _encoders (dict[type, Encoder]): encoder resolved for every exact type seen so far
+    """
+    def __init__(self, fallback: Optional[Encoder] = None) -> None:
+        self.fallback = fallback
+        self._registered: dict[type, Encoder] = {
+            bytes: _passthrough,
+            str: _passthrough,
+            type(None): _passthrough,
+            bytearray: bytes,
+            memoryview: bytes,
+        }
+        self._encoders: dict[type, Encoder] = dict(self._registered)
+
+
+    @classmethod
+    def orjson(cls, option: Optional[int] = None) -> "Serializer":
+        """Serializer encoding other values as JSON with orjson
+
+        Args:
+            option (Optional[int], optional): orjson option flags, e.g. orjson.OPT_SERIALIZE_NUMPY. Defaults to None.
+        """
+        try:
+            import orjson
+        except ImportError:
+            raise ImportError("orjson is not installed., Please install it using pip insall orjson") from None
+        if option is None:
+            return cls(orjson.dumps)
+        return cls(lambda value: orjson.dumps(value, option=option))
+
+
+    @classmethod
+    def msgpack(cls) -> "Serializer":
+        """Serializer encoding other values with msgpack"""
+        try:
+            import msgpack
+        except ImportError:
+            raise ImportError("msgpack is not installed., Please install it using pip insall msgpack") from None
+        return cls(msgpack.packb)
+
+
+    def register(self, type_: type, encoder: Encoder) -> None:
+        """Register the encoder of a type and its subclasses
+
+        Args:
+            type_ (type): value type
+            encoder (Encoder): callable returning bytes or str
+        """
+        self._registered[type_] = encoder
+        self._encoders = dict(self._registered)
+
+
+    def __call__(self, value: Any) -> Any:
+        try:
+            encoder = self._encoders[type(value)]
+        except KeyError:
+            encoder = self._resolve(type(value))
+        return encoder(value)
+
+
+    def _resolve(self, type_: type) -> Encoder:
+        for base in type_.__mro__:
+            encoder = self._registered.get(base)
+            if encoder is not None:
+                break
+        else:
+            encoder = self.fallback
+            if encoder is None:
+                raise TypeError(f"No encoder for {type_.__name__}, register one or use a fallback encoder")
+        self._encoders[type_] = encoder
+        return encoder
@@ -1,2 +1,29 @@
-from .connector import TCPConnector
-from .protocol import TCPClientProtocol
\ No newline at end of file
+from .connector import TCPConnector, TCPKeepAlive, UnixConnector
+from .tls import enable_session_reuse, resume_session, get_session
+from .protocol import TCPClientProtocol, BufferedTCPClientProtocol
+from .framing import (
+    FramingError,
+    Framer,
+    LengthPrefixFramer,
+    DelimiterFramer,
+    FixedLengthFramer,
+    StartStopFramer,
+    FramedTCPClientProtocol,
+)
+from .codec import Field, Schema
+from .datagram import UDPClientProtocol, UDPConnector
+from .pool import ConnectorState, ConnectorPool
+from .timer import TimerWheel, WheelTimerHandle
+from .request import RequestTracker
+from .loop import use_fast_loop, run, loop_name
+from .bridge import LoopBridge
+from .shard import ShardStatus, ShardSupervisor
+from .metrics import TransportMetrics, PeerMetrics
+from .backoff import (
+    Backoff,
+    GoldenRatioBackoff,
+    ExponentialBackoff,
+    FullJitterBackoff,
+    DecorrelatedJitterBackoff,
+    ReconnectLimiter,
+)
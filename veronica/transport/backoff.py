@@ -0,0 +1,176 @@
+import time
+import random
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "Backoff",
+    "GoldenRatioBackoff",
+    "ExponentialBackoff",
+    "FullJitterBackoff",
+    "DecorrelatedJitterBackoff",
+    "ReconnectLimiter"
+]
+
+
+class Backoff:
+    """重连退避策略基类
+
+    策略对象不保存状态，重连次数和上一次延迟由连接器保存，因此同一个实例可以被任意多个连接器共享。
+
+    Attributes:
+        min_delay (float): 最小延迟，也是连接成功后的初始延迟
+        max_delay (float): 最大延迟
+    """
+    def __init__(self, min_delay: float = 1.0, max_delay: float = 60.0) -> None:
+        if min_delay < 0 or max_delay < min_delay:
+            raise ValueError(f"Invalid delay range: [{min_delay}, {max_delay}]")
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, previous: float) -> float:
+        """计算下一次重连前的延迟
+
+        Args:
+            attempt (int): 连续失败次数，从 1 开始
+            previous (float): 上一次延迟
+
+        Returns:
+            float: 延迟时间，位于 [0, max_delay] 内
+        """
+        raise NotImplementedError
+
+    def _clamp(self, delay: float) -> float:
+        return min(max(delay, 0.0), self.max_delay)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(min_delay={self.min_delay}, max_delay={self.max_delay})"
+
+
+class GoldenRatioBackoff(Backoff):
+    """按黄金分割比增长的退避，可选正态分布抖动，`TCPConnector` 的默认策略
+
+    Attributes:
+        factor (float): 增长系数
+        jitter (float): 正态分布标准差与延迟的比值, 0 表示不抖动
+    """
+    def __init__(
+        self,
+        min_delay: float = 1.0,
+        max_delay: float = 60.0,
+        *,
+        factor: float = 1.6180339887498948,
+        jitter: float = 0.0
+    ) -> None:
+        super().__init__(min_delay, max_delay)
+        self.factor = factor
+        self.jitter = jitter
+
+    def delay(self, attempt: int, previous: float) -> float:
+        delay = min(max(previous, self.min_delay) * self.factor, self.max_delay)
+        if self.jitter:
+            delay = random.normalvariate(delay, self.jitter * delay)
+        return self._clamp(delay)
+
+
+class ExponentialBackoff(Backoff):
+    """有上限的指数退避, delay = min(max_delay, min_delay * factor ** attempt)
+
+    Attributes:
+        factor (float): 增长系数
+    """
+    def __init__(self, min_delay: float = 1.0, max_delay: float = 60.0, *, factor: float = 2.0) -> None:
+        super().__init__(min_delay, max_delay)
+        if factor < 1:
+            raise ValueError(f"Invalid factor: {factor}")
+        self.factor = factor
+
+    def _exponential(self, attempt: int) -> float:
+        # 避免 factor ** attempt 在连续失败很多次后溢出
+        try:
+            return min(self.max_delay, self.min_delay * self.factor ** attempt)
+        except OverflowError:
+            return self.max_delay
+
+    def delay(self, attempt: int, previous: float) -> float:
+        return self._exponential(attempt)
+
+
+class FullJitterBackoff(ExponentialBackoff):
+    """全抖动指数退避, delay = uniform(0, min(max_delay, min_delay * factor ** attempt))
+
+    大量连接器同时掉线后的重连时间均匀分散在整个退避窗口内。
+    """
+    def delay(self, attempt: int, previous: float) -> float:
+        return random.uniform(0.0, self._exponential(attempt))
+
+
+class DecorrelatedJitterBackoff(Backoff):
+    """去相关抖动退避, delay = min(max_delay, uniform(min_delay, previous * 3))
+
+    延迟取决于上一次延迟而不是失败次数，各连接器的重连时间很快失去相关性。
+    """
+    def delay(self, attempt: int, previous: float) -> float:
+        return self._clamp(random.uniform(self.min_delay, max(previous, self.min_delay) * 3))
+
+
+class ReconnectLimiter:
+    """令牌桶，限制进程内所有连接器的连接尝试速率
+
+    多个连接器共享同一个实例，每次连接尝试前获取一个令牌。令牌以 `rate` 个/秒的速率补充，最多积累 `burst` 个，
+    故障恢复时先以 `burst` 的突发量快速重连，之后以稳定速率继续，不会出现连接风暴。等待者按先后顺序获取令牌。
+
+    Example:
+    >>> limiter = ReconnectLimiter(rate=200, burst=50)
+    >>> connector = await TCPConnector.create(host, port, limiter=limiter)
+
+    Attributes:
+        rate (float): 每秒补充的令牌数
+        burst (int): 令牌桶容量
+        _tokens (float): 当前令牌数
+        _updated (float): 上一次补充令牌的时间
+        _lock (asyncio.Lock): 保证等待者按顺序获取令牌
+    """
+    def __init__(self, rate: float, burst: int | None = None) -> None:
+        if rate <= 0:
+            raise ValueError(f"Invalid rate: {rate}")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        if self.burst < 1:
+            raise ValueError(f"Invalid burst: {self.burst}")
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> float:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        return self._tokens
+
+    @property
+    def tokens(self) -> float:
+        """当前可用令牌数
+        """
+        return self._refill()
+
+    def try_acquire(self) -> bool:
+        """尝试立即获取一个令牌
+
+        Returns:
+            bool: 是否获取成功
+        """
+        if self._lock.locked() or self._refill() < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    async def acquire(self) -> None:
+        """获取一个令牌，令牌不足时等待
+        """
+        async with self._lock:
+            while self._refill() < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+            self._tokens -= 1
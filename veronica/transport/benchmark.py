@@ -0,0 +1,681 @@
+"""传输层基准测试
+
+在进程内启动回显/接收服务器，通过 `TCPConnector` + `TCPClientProtocol` 测量建连速率、回显吞吐量、
+单向发送吞吐量、往返时延、重连风暴恢复时间、每连接内存占用以及 TLS 会话恢复对重连耗时的影响，可以分别在 asyncio 默认事件循环与 uvloop 下运行并对比。
+结果以 JSON 输出，并可与上一版本的结果对比以发现性能退化。
+
+Usage:
+    python -m veronica.transport.benchmark --loop both --json result.json
+    python -m veronica.transport.benchmark --scenarios connect latency --compare baseline.json
+"""
+import gc
+import os
+import ssl
+import sys
+import json
+import time
+import shutil
+import asyncio
+import logging
+import argparse
+import tempfile
+import subprocess
+import tracemalloc
+from dataclasses import dataclass, asdict, field
+from typing import Any
+
+from veronica.transport.backoff import ReconnectLimiter
+from veronica.transport.connector import TCPConnector
+from veronica.transport.protocol import TCPClientProtocol, BufferedTCPClientProtocol
+from veronica.transport.loop import fast_loop_factory, loop_name
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "BenchmarkConfig",
+    "EchoServerProtocol",
+    "SinkServerProtocol",
+    "SCENARIOS",
+    "run_benchmarks",
+    "compare_reports",
+    "main"
+]
+
+# 基准测试场景，按顺序运行
+SCENARIOS = ("connect", "throughput", "sink", "latency", "reconnect", "memory", "tls")
+
+# 对比结果时数值越大越好、越小越好的指标，其他字段不参与对比
+HIGHER_IS_BETTER = frozenset({"connections_per_s", "messages_per_s", "mbytes_per_s"})
+LOWER_IS_BETTER = frozenset({
+    "connect_p50_ms",
+    "connect_p99_ms",
+    "p50_us",
+    "p90_us",
+    "p99_us",
+    "recovery_s",
+    "bytes_per_connection",
+    "full_p50_ms",
+    "resumed_p50_ms",
+})
+
+
+@dataclass
+class BenchmarkConfig:
+    """基准测试参数
+
+    Attributes:
+        host (str): 回显服务器监听地址
+        connections (int): 建连测试的连接数
+        connect_concurrency (int): 建连测试的并发数
+        streams (int): 吞吐量测试的连接数
+        messages (int): 吞吐量测试每个连接发送的消息数
+        message_size (int): 消息大小
+        pings (int): 时延测试的往返次数
+        storm_connections (int): 重连风暴测试的连接数
+        storm_outage (float): 重连风暴测试中服务器停止的时长
+        storm_rate (float | None): 重连风暴测试中 `ReconnectLimiter` 的速率, None 表示不限制
+        memory_connections (int): 内存测试的连接数
+        tls_reconnects (int): TLS 测试中每种方式的重连次数
+        scenarios (list[str]): 运行的场景
+    """
+    host: str = "127.0.0.1"
+    connections: int = 500
+    connect_concurrency: int = 100
+    streams: int = 10
+    messages: int = 10_000
+    message_size: int = 128
+    pings: int = 2_000
+    storm_connections: int = 200
+    storm_outage: float = 0.5
+    storm_rate: float | None = None
+    memory_connections: int = 500
+    tls_reconnects: int = 200
+    scenarios: list[str] = field(default_factory=lambda: list(SCENARIOS))
+
+
+class EchoServerProtocol(asyncio.Protocol):
+    """进程内回显服务器协议
+    """
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self._transport = transport
+
+    def data_received(self, data: bytes) -> None:
+        self._transport.write(data)
+
+
+class SinkServerProtocol(asyncio.Protocol):
+    """进程内接收服务器协议，只统计接收字节数，收到指定字节数后唤醒等待者
+
+    Attributes:
+        received (int): 所有连接累计接收的字节数
+    """
+    received = 0
+    _target = 0
+    _waiter: asyncio.Future | None = None
+
+    def data_received(self, data: bytes) -> None:
+        cls = SinkServerProtocol
+        cls.received += len(data)
+        waiter = cls._waiter
+        if waiter is not None and cls.received >= cls._target and not waiter.done():
+            waiter.set_result(None)
+
+    @classmethod
+    async def wait_received(cls, target: int) -> None:
+        if cls.received >= target:
+            return
+        cls._target = target
+        cls._waiter = asyncio.get_running_loop().create_future()
+        try:
+            await cls._waiter
+        finally:
+            cls._waiter = None
+
+
+class _ServerTracker:
+    """记录服务器端连接，以便模拟服务器宕机时断开所有连接
+    """
+    def __init__(self) -> None:
+        self.transports: set[asyncio.BaseTransport] = set()
+
+    def factory(self) -> asyncio.Protocol:
+        tracker = self
+
+        class _Protocol(EchoServerProtocol):
+            def connection_made(self, transport: asyncio.BaseTransport) -> None:
+                super().connection_made(transport)
+                tracker.transports.add(transport)
+
+            def connection_lost(self, exc: Exception | None) -> None:
+                tracker.transports.discard(self._transport)
+
+        return _Protocol()
+
+    def abort_all(self) -> None:
+        for transport in list(self.transports):
+            transport.abort()
+        self.transports.clear()
+
+
+class _StormConnector(TCPConnector):
+    """重连风暴测试使用较短的退避延迟，恢复时间主要反映调度与建连开销，并统计连接尝试次数
+    """
+    min_delay = 0.05
+    max_delay = 1.0
+    attempts = 0
+
+    async def _connect(self) -> None:
+        _StormConnector.attempts += 1
+        await super()._connect()
+
+
+class _EchoClientProtocol(BufferedTCPClientProtocol):
+    """统计回显字节数，收到指定字节数后唤醒等待者
+    """
+    def on_connection_made(self) -> None:
+        self.received = 0
+        self._target = 0
+        self._waiter: asyncio.Future | None = None
+
+    def on_data_received(self, data: memoryview) -> int | None:
+        self.received += len(data)
+        waiter = self._waiter
+        if waiter is not None and self.received >= self._target and not waiter.done():
+            waiter.set_result(None)
+        return None
+
+    async def wait_received(self, target: int) -> None:
+        if self.received >= target:
+            return
+        self._target = target
+        self._waiter = self._loop.create_future()
+        try:
+            await self._waiter
+        finally:
+            self._waiter = None
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """最近秩法计算百分位数
+
+    Args:
+        samples (list[float]): 已排序的样本
+        pct (float): 百分位, 0-100
+
+    Returns:
+        float: 百分位数
+    """
+    if not samples:
+        return float("nan")
+    index = min(len(samples) - 1, max(0, round(pct / 100 * len(samples) + 0.5) - 1))
+    return samples[index]
+
+
+async def _open(config: BenchmarkConfig, port: int) -> TCPConnector:
+    return await TCPConnector.create(
+        config.host, port, auto_reconnect=False, protocol_class=_EchoClientProtocol
+    )
+
+
+def _close_all(connectors: list[TCPConnector]) -> None:
+    for connector in connectors:
+        connector.close()
+
+
+async def bench_connect(config: BenchmarkConfig, port: int) -> dict[str, Any]:
+    """建连速率
+
+    Args:
+        config (BenchmarkConfig): 基准测试参数
+        port (int): 回显服务器端口
+
+    Returns:
+        dict[str, Any]: 测试结果
+    """
+    semaphore = asyncio.Semaphore(config.connect_concurrency)
+    latencies: list[float] = []
+
+    async def _connect_one() -> TCPConnector:
+        async with semaphore:
+            start = time.perf_counter()
+            connector = await _open(config, port)
+            latencies.append(time.perf_counter() - start)
+            return connector
+
+    start = time.perf_counter()
+    connectors = await asyncio.gather(*(_connect_one() for _ in range(config.connections)))
+    elapsed = time.perf_counter() - start
+    _close_all(connectors)
+    latencies.sort()
+    return {
+        "connections": config.connections,
+        "elapsed_s": elapsed,
+        "connections_per_s": config.connections / elapsed,
+        "connect_p50_ms": percentile(latencies, 50) * 1000,
+        "connect_p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+async def bench_throughput(config: BenchmarkConfig, port: int) -> dict[str, Any]:
+    """回显吞吐量，发送端受 `send` 背压控制
+
+    Args:
+        config (BenchmarkConfig): 基准测试参数
+        port (int): 回显服务器端口
+
+    Returns:
+        dict[str, Any]: 测试结果
+    """
+    connectors = [await _open(config, port) for _ in range(config.streams)]
+    message = b"x" * config.message_size
+    total = config.messages * config.message_size
+
+    async def _stream(protocol: _EchoClientProtocol) -> None:
+        for _ in range(config.messages):
+            await protocol.send(message)
+        await protocol.wait_received(total)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_stream(c._protocol) for c in connectors))
+    elapsed = time.perf_counter() - start
+    _close_all(connectors)
+    messages = config.streams * config.messages
+    return {
+        "streams": config.streams,
+        "messages": messages,
+        "message_size": config.message_size,
+        "elapsed_s": elapsed,
+        "messages_per_s": messages / elapsed,
+        "mbytes_per_s": messages * config.message_size / elapsed / 1e6,
+    }
+
+
+async def bench_sink(config: BenchmarkConfig, port: int) -> dict[str, Any]:
+    """单向发送吞吐量，服务器只接收不回显，测量纯发送路径
+
+    Args:
+        config (BenchmarkConfig): 基准测试参数
+        port (int): 接收服务器端口
+
+    Returns:
+        dict[str, Any]: 测试结果
+    """
+    connectors = [await _open(config, port) for _ in range(config.streams)]
+    message = b"x" * config.message_size
+    total = config.streams * config.messages * config.message_size
+    target = SinkServerProtocol.received + total
+
+    async def _stream(protocol: _EchoClientProtocol) -> None:
+        for _ in range(config.messages):
+            await protocol.send(message)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_stream(c._protocol) for c in connectors))
+    await SinkServerProtocol.wait_received(target)
+    elapsed = time.perf_counter() - start
+    _close_all(connectors)
+    messages = config.streams * config.messages
+    return {
+        "streams": config.streams,
+        "messages": messages,
+        "message_size": config.message_size,
+        "elapsed_s": elapsed,
+        "messages_per_s": messages / elapsed,
+        "mbytes_per_s": total / elapsed / 1e6,
+    }
+
+
+async def bench_latency(config: BenchmarkConfig, port: int) -> dict[str, Any]:
+    """单连接往返时延
+
+    Args:
+        config (BenchmarkConfig): 基准测试参数
+        port (int): 回显服务器端口
+
+    Returns:
+        dict[str, Any]: 测试结果
+    """
+    connector = await _open(config, port)
+    protocol = connector._protocol
+    message = b"x" * config.message_size
+    samples: list[float] = []
+    for i in range(1, config.pings + 1):
+        start = time.perf_counter()
+        protocol.transmit_data(message)
+        await protocol.wait_received(i * config.message_size)
+        samples.append(time.perf_counter() - start)
+    connector.close()
+    samples.sort()
+    return {
+        "pings": config.pings,
+        "p50_us": percentile(samples, 50) * 1e6,
+        "p90_us": percentile(samples, 90) * 1e6,
+        "p99_us": percentile(samples, 99) * 1e6,
+        "max_us": samples[-1] * 1e6,
+    }
+
+
+async def bench_reconnect(config: BenchmarkConfig) -> dict[str, Any]:
+    """重连风暴恢复时间
+
+    所有自动重连的连接建立后停止服务器并断开所有连接，等待 `storm_outage` 后在同一端口重启服务器，
+    测量从重启到所有连接恢复的时间以及期间的连接尝试次数。
+
+    Args:
+        config (BenchmarkConfig): 基准测试参数
+
+    Returns:
+        dict[str, Any]: 测试结果
+    """
+    loop = asyncio.get_running_loop()
+    tracker = _ServerTracker()
+    server = await loop.create_server(tracker.factory, config.host, 0, backlog=4096)
+    port = server.sockets[0].getsockname()[1]
+    limiter = ReconnectLimiter(config.storm_rate) if config.storm_rate else None
+    connectors = [
+        _StormConnector(config.host, port, True, True, TCPClientProtocol, loop, limiter=limiter)
+        for _ in range(config.storm_connections)
+    ]
+    tasks = [loop.create_task(c._reconnect()) for c in connectors]
+
+    async def _wait_connected() -> None:
+        while not all(c.is_connected() for c in connectors):
+            await asyncio.sleep(0.005)
+
+    try:
+        await _wait_connected()
+        server.close()
+        tracker.abort_all()
+        await server.wait_closed()
+        attempts = _StormConnector.attempts
+        await asyncio.sleep(config.storm_outage)
+
+        server = await loop.create_server(tracker.factory, config.host, port, backlog=4096)
+        start = time.perf_counter()
+        await _wait_connected()
+        recovery = time.perf_counter() - start
+        attempts = _StormConnector.attempts - attempts
+    finally:
+        _close_all(connectors)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        server.close()
+        tracker.abort_all()
+        await server.wait_closed()
+    return {
+        "connections": config.storm_connections,
+        "outage_s": config.storm_outage,
+        "recovery_s": recovery,
+        "attempts": attempts,
+    }
+
+
+async def bench_memory(config: BenchmarkConfig, port: int) -> dict[str, Any]:
+    """每连接内存占用，使用 tracemalloc 统计建立连接后新增的 Python 内存
+
+    Note:
+        服务器运行在同一进程中，结果包含服务器一侧的传输和协议对象，适合版本间对比而非绝对值。
+
+    Args:
+        config (BenchmarkConfig): 基准测试参数
+        port (int): 回显服务器端口
+
+    Returns:
+        dict[str, Any]: 测试结果, 分别统计 `TCPClientProtocol` 与 `BufferedTCPClientProtocol`
+    """
+    result: dict[str, Any] = {"connections": config.memory_connections}
+    started = tracemalloc.is_tracing()
+    if not started:
+        tracemalloc.start()
+    try:
+        for name, protocol_class in (("plain", TCPClientProtocol), ("buffered", _EchoClientProtocol)):
+            gc.collect()
+            before = tracemalloc.get_traced_memory()[0]
+            connectors = [
+                await TCPConnector.create(config.host, port, auto_reconnect=False, protocol_class=protocol_class)
+                for _ in range(config.memory_connections)
+            ]
+            gc.collect()
+            used = tracemalloc.get_traced_memory()[0] - before
+            _close_all(connectors)
+            del connectors
+            await asyncio.sleep(0)
+            result[f"{name}_bytes_per_connection"] = used / config.memory_connections
+    finally:
+        if not started:
+            tracemalloc.stop()
+    result["bytes_per_connection"] = result["plain_bytes_per_connection"]
+    return result
+
+
+def _self_signed_cert(directory: str) -> tuple[str, str]:
+    """使用 openssl 命令生成 localhost 的自签名证书
+
+    Returns:
+        tuple[str, str]: (证书路径, 私钥路径)
+    """
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048",
+            "-nodes", "-days", "1", "-subj", "/CN=localhost",
+            "-addext", "subjectAltName=DNS:localhost,IP:127.0.0.1",
+            "-keyout", key, "-out", cert,
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return cert, key
+
+
+async def bench_tls(config: BenchmarkConfig) -> dict[str, Any]:
+    """TLS 重连耗时，对比完整握手与会话恢复
+
+    在进程内启动使用自签名证书的 TLS 回显服务器，同一个连接器反复断开重连，每次连接后完成一次往返以收到 TLS 1.3 会话票据。
+
+    Args:
+        config (BenchmarkConfig): 基准测试参数
+
+    Returns:
+        dict[str, Any]: 测试结果，未找到 openssl 命令时只包含 skipped
+    """
+    if shutil.which("openssl") is None:
+        return {"skipped": "openssl not found"}
+    loop = asyncio.get_running_loop()
+    with tempfile.TemporaryDirectory() as directory:
+        cert, key = _self_signed_cert(directory)
+        server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        server_context.load_cert_chain(cert, key)
+        server = await loop.create_server(EchoServerProtocol, config.host, 0, ssl=server_context, backlog=4096)
+        port = server.sockets[0].getsockname()[1]
+        result: dict[str, Any] = {"reconnects": config.tls_reconnects}
+        async with server:
+            for name, reuse in (("full", False), ("resumed", True)):
+                connector = TCPConnector(
+                    config.host,
+                    port,
+                    False,
+                    False,
+                    _EchoClientProtocol,
+                    loop,
+                    ssl_context=ssl.create_default_context(cafile=cert),
+                    server_hostname="localhost",
+                    session_reuse=reuse
+                )
+                samples: list[float] = []
+                reused = 0
+                for _ in range(config.tls_reconnects):
+                    start = time.perf_counter()
+                    await connector._connect()
+                    samples.append(time.perf_counter() - start)
+                    reused += connector.session_reused
+                    connector._protocol.transmit_data(b"x")
+                    await connector._protocol.wait_received(1)
+                    connector._transport.close()
+                    await connector._on_lost_fut
+                    connector._on_lost_fut = loop.create_future()
+                connector.close()
+                samples.sort()
+                result[f"{name}_p50_ms"] = percentile(samples, 50) * 1000
+                result[f"{name}_p99_ms"] = percentile(samples, 99) * 1000
+                result[f"{name}_reused"] = reused
+    return result
+
+
+async def _run_suite(config: BenchmarkConfig) -> dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    scenarios = set(config.scenarios)
+    server = await loop.create_server(EchoServerProtocol, config.host, 0, backlog=4096)
+    sink = await loop.create_server(SinkServerProtocol, config.host, 0, backlog=4096)
+    port = server.sockets[0].getsockname()[1]
+    sink_port = sink.sockets[0].getsockname()[1]
+    result: dict[str, Any] = {"loop": loop_name(loop)}
+    async with server, sink:
+        if "connect" in scenarios:
+            result["connect"] = await bench_connect(config, port)
+        if "throughput" in scenarios:
+            result["throughput"] = await bench_throughput(config, port)
+        if "sink" in scenarios:
+            result["sink"] = await bench_sink(config, sink_port)
+        if "latency" in scenarios:
+            result["latency"] = await bench_latency(config, port)
+        if "memory" in scenarios:
+            result["memory"] = await bench_memory(config, port)
+    if "reconnect" in scenarios:
+        result["reconnect"] = await bench_reconnect(config)
+    if "tls" in scenarios:
+        result["tls"] = await bench_tls(config)
+    return result
+
+
+def run_benchmarks(config: BenchmarkConfig, loops: list[str]) -> dict[str, Any]:
+    """在指定的事件循环下依次运行基准测试
+
+    Args:
+        config (BenchmarkConfig): 基准测试参数
+        loops (list[str]): 事件循环名称列表, "asyncio" 或 "uvloop"，未安装 uvloop 时跳过
+
+    Returns:
+        dict[str, Any]: 测试参数与每个事件循环的测试结果
+    """
+    results: dict[str, Any] = {}
+    for name in loops:
+        loop_factory = None
+        if name == "uvloop":
+            loop_factory = fast_loop_factory()
+            if loop_factory is None:
+                logger.warning("uvloop is not installed, skipping")
+                continue
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            results[name] = runner.run(_run_suite(config))
+    return {
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "config": asdict(config),
+        "results": results,
+    }
+
+
+def compare_reports(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    tolerance: float = 0.1
+) -> list[str]:
+    """对比两次测试结果，找出超过容差的性能退化
+
+    只对比两次结果中都存在的事件循环、场景和指标，指标方向见 `HIGHER_IS_BETTER` 和 `LOWER_IS_BETTER`。
+
+    Args:
+        current (dict[str, Any]): 本次结果, `run_benchmarks` 的返回值
+        baseline (dict[str, Any]): 基准结果
+        tolerance (float, optional): 允许的相对变化. Defaults to 0.1.
+
+    Returns:
+        list[str]: 退化描述，为空表示没有退化
+    """
+    regressions: list[str] = []
+    for loop, scenarios in current.get("results", {}).items():
+        base_scenarios = baseline.get("results", {}).get(loop)
+        if not base_scenarios:
+            continue
+        for scenario, metrics in scenarios.items():
+            base_metrics = base_scenarios.get(scenario)
+            if not isinstance(metrics, dict) or not isinstance(base_metrics, dict):
+                continue
+            for key, value in metrics.items():
+                if key not in HIGHER_IS_BETTER and key not in LOWER_IS_BETTER:
+                    continue
+                base = base_metrics.get(key)
+                if not base or value != value or base != base:
+                    continue
+                change = (value - base) / abs(base)
+                if change < -tolerance if key in HIGHER_IS_BETTER else change > tolerance:
+                    regressions.append(f"{loop}.{scenario}.{key}: {base:.6g} -> {value:.6g} ({change:+.1%})")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    defaults = BenchmarkConfig()
+    parser = argparse.ArgumentParser(description="veronica transport benchmark")
+    parser.add_argument("--loop", choices=["asyncio", "uvloop", "both"], default="both")
+    parser.add_argument("--connections", type=int, default=defaults.connections)
+    parser.add_argument("--connect-concurrency", type=int, default=defaults.connect_concurrency)
+    parser.add_argument("--streams", type=int, default=defaults.streams)
+    parser.add_argument("--messages", type=int, default=defaults.messages)
+    parser.add_argument("--message-size", type=int, default=defaults.message_size)
+    parser.add_argument("--pings", type=int, default=defaults.pings)
+    parser.add_argument("--storm-connections", type=int, default=defaults.storm_connections)
+    parser.add_argument("--storm-outage", type=float, default=defaults.storm_outage)
+    parser.add_argument("--storm-rate", type=float, default=defaults.storm_rate)
+    parser.add_argument("--memory-connections", type=int, default=defaults.memory_connections)
+    parser.add_argument("--tls-reconnects", type=int, default=defaults.tls_reconnects)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--json", dest="json_path", help="write machine-readable result to this file")
+    parser.add_argument("--compare", dest="baseline_path", help="compare with a previous result and exit with 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed relative change when comparing")
+    parser.add_argument("--log-level", default="CRITICAL", help="log level of veronica.transport during the run")
+    args = parser.parse_args(argv)
+
+    config = BenchmarkConfig(
+        connections=args.connections,
+        connect_concurrency=args.connect_concurrency,
+        streams=args.streams,
+        messages=args.messages,
+        message_size=args.message_size,
+        pings=args.pings,
+        storm_connections=args.storm_connections,
+        storm_outage=args.storm_outage,
+        storm_rate=args.storm_rate,
+        memory_connections=args.memory_connections,
+        tls_reconnects=args.tls_reconnects,
+        scenarios=args.scenarios,
+    )
+    loops = ["asyncio", "uvloop"] if args.loop == "both" else [args.loop]
+    # 建连与重连风暴测试会产生大量连接日志，默认只保留严重错误，结束后恢复原日志级别
+    transport_logger = logging.getLogger("veronica.transport")
+    level = transport_logger.level
+    transport_logger.setLevel(args.log_level.upper())
+    try:
+        report = run_benchmarks(config, loops)
+    finally:
+        transport_logger.setLevel(level)
+    text = json.dumps(report, indent=2)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+
+    if args.baseline_path:
+        with open(args.baseline_path, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_reports(report, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
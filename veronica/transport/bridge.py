@@ -0,0 +1,190 @@
+import asyncio
+import logging
+import threading
+import concurrent.futures
+from collections import Counter
+from typing import Any, Coroutine, TypeVar
+
+from veronica.transport.connector import TCPConnector
+from veronica.transport.protocol import TCPClientProtocol
+from veronica.transport.loop import fast_loop_factory
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "LoopBridge"
+]
+
+T = TypeVar("T")
+
+
+class LoopBridge:
+    """在后台线程中运行事件循环，供同步代码（MQTT 回调、Kafka 投递线程等）线程安全地发送数据
+
+    `submit` 只把数据放入待发送队列，队列由空变为非空时才调用一次 `call_soon_threadsafe` 唤醒事件循环，
+    事件循环在一次回调中发送队列中的所有数据，跨线程提交的开销与消息数量无关。
+
+    Example:
+    >>> with LoopBridge() as bridge:
+    ...     bridge.spawn(pool_main())
+    ...     connector = bridge.run(TCPConnector.create(host, port, auto_reconnect=False))
+    ...     bridge.submit(connector, b"hello")   # 任意线程
+
+    Attributes:
+        fast_loop (bool): 是否尝试使用 uvloop
+        name (str): 线程名称
+        counters (Counter[str]): 累计计数, submitted 提交数, sent 发送数, dropped 连接不可用而丢弃的数量,
+            wakeups 唤醒事件循环的次数
+        _loop (asyncio.AbstractEventLoop | None): 事件循环
+        _thread (threading.Thread | None): 事件循环线程
+        _pending (list[tuple[TCPConnector | TCPClientProtocol, bytes]]): 待发送数据
+        _scheduled (bool): 是否已经唤醒事件循环、等待发送
+        _lock (threading.Lock): 保护 `_pending` 和 `_scheduled`
+    """
+    def __init__(self, *, fast_loop: bool = True, name: str = "veronica-loop") -> None:
+        self.fast_loop = fast_loop
+        self.name = name
+        self.counters: Counter[str] = Counter()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._pending: list[tuple[TCPConnector | TCPClientProtocol, bytes]] = []
+        self._scheduled = False
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "LoopBridge":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """后台线程的事件循环
+
+        Raises:
+            RuntimeError: 未启动
+        """
+        if self._loop is None:
+            raise RuntimeError("LoopBridge is not running")
+        return self._loop
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """启动事件循环线程，返回时事件循环已经开始运行
+        """
+        if self._thread is not None:
+            return
+        factory = fast_loop_factory() if self.fast_loop else None
+        self._loop = factory() if factory is not None else asyncio.new_event_loop()
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready, ), name=self.name, daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """发送完已提交的数据，取消事件循环中的所有任务并停止线程
+
+        Args:
+            timeout (float | None, optional): 等待线程退出的时间. Defaults to 5.0.
+        """
+        thread, loop = self._thread, self._loop
+        if thread is None or loop is None:
+            return
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning(f"Loop thread {self.name} did not exit in {timeout} s")
+            return
+        self._thread = None
+        self._loop = None
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+        """在事件循环中运行协程并等待结果，不能在事件循环线程中调用
+
+        Args:
+            coro (Coroutine[Any, Any, T]): 协程
+            timeout (float | None, optional): 超时时间. Defaults to None.
+
+        Raises:
+            TimeoutError: 等待超时
+
+        Returns:
+            T: 协程的返回值
+        """
+        return self.spawn(coro).result(timeout)
+
+    def spawn(self, coro: Coroutine[Any, Any, T]) -> concurrent.futures.Future[T]:
+        """在事件循环中启动协程，不等待结果，适合自动重连等长期运行的任务
+
+        Args:
+            coro (Coroutine[Any, Any, T]): 协程
+
+        Returns:
+            concurrent.futures.Future[T]: 协程的结果
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def submit(self, connection: TCPConnector | TCPClientProtocol, data: bytes) -> None:
+        """线程安全地发送数据，可以在任意线程中调用
+
+        数据在事件循环线程中通过 `transmit_data` 发送，连接当时不可用的数据会被丢弃并计入 dropped。
+
+        Args:
+            connection (TCPConnector | TCPClientProtocol): 连接器或协议对象
+            data (bytes): 需要发送的数据
+
+        Raises:
+            RuntimeError: 未启动
+        """
+        loop = self.loop
+        with self._lock:
+            self._pending.append((connection, data))
+            if self._scheduled:
+                return
+            self._scheduled = True
+        loop.call_soon_threadsafe(self._flush)
+
+    def _flush(self) -> None:
+        """在事件循环线程中发送所有待发送数据
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._scheduled = False
+        counters = self.counters
+        counters["wakeups"] += 1
+        counters["submitted"] += len(pending)
+        sent = 0
+        for connection, data in pending:
+            protocol = connection._protocol if isinstance(connection, TCPConnector) else connection
+            try:
+                if protocol is None:
+                    raise ConnectionError("Not connected")
+                protocol.transmit_data(data)
+            except ConnectionError as e:
+                counters["dropped"] += 1
+                logger.debug(f"Dropping {len(data)} bytes for {connection!r}: {e}")
+            else:
+                sent += 1
+        counters["sent"] += sent
+
+    def _run(self, ready: threading.Event) -> None:
+        loop = self._loop
+        assert loop is not None
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        try:
+            loop.run_forever()
+            self._flush()
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
@@ -0,0 +1,167 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "ReceiveBuffer"
+]
+
+class ReceiveBuffer:
+    """偏移量跟踪的可增长接收缓冲区
+
+    数据直接写入预分配的 bytearray，通过 `_start`/`_end` 偏移量记录未消费数据的范围，
+    消费数据只移动偏移量而不复制。空间不足时，若已消费部分不少于未消费部分则原地压缩，否则按倍数扩容，
+    保证搬移数据的总量与接收数据量成线性关系。
+
+    扩容时总是分配新的 bytearray 而不是原地 resize，因此外部持有的 memoryview 不会导致 BufferError。
+
+    Attributes:
+        _buf (bytearray): 底层缓冲区
+        _view (memoryview): 底层缓冲区的视图
+        _start (int): 未消费数据的起始偏移
+        _end (int): 未消费数据的结束偏移
+        _min_free (int): 每次接收至少预留的空闲空间
+        _max_size (int | None): 缓冲区大小上限
+    """
+    __slots__ = ("_buf", "_view", "_start", "_end", "_min_free", "_max_size")
+
+    def __init__(
+        self,
+        size: int = 64 * 1024,
+        max_size: int | None = None,
+        min_free: int = 4096
+    ) -> None:
+        if size <= 0:
+            raise ValueError(f"Invalid buffer size: {size}")
+        if max_size is not None and max_size < size:
+            raise ValueError(f"max_size must not be less than size: {max_size} < {size}")
+        self._buf = bytearray(size)
+        self._view = memoryview(self._buf)
+        self._start = 0
+        self._end = 0
+        self._min_free = min(min_free, size)
+        self._max_size = max_size
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def capacity(self) -> int:
+        """缓冲区当前容量
+        """
+        return len(self._buf)
+
+    @property
+    def buffer(self) -> bytearray:
+        """底层缓冲区，用于 `bytearray.find` 等免复制扫描
+        """
+        return self._buf
+
+    @property
+    def view(self) -> memoryview:
+        """底层缓冲区的完整视图
+        """
+        return self._view
+
+    @property
+    def start(self) -> int:
+        """未消费数据在底层缓冲区中的起始偏移
+        """
+        return self._start
+
+    @property
+    def end(self) -> int:
+        """未消费数据在底层缓冲区中的结束偏移
+        """
+        return self._end
+
+    @property
+    def data(self) -> memoryview:
+        """未消费数据的视图，缓冲区下一次写入前有效
+        """
+        return self._view[self._start:self._end]
+
+    def get_buffer(self, sizehint: int = -1) -> memoryview:
+        """获取可写入的空闲空间
+
+        Args:
+            sizehint (int): 期望的空闲空间大小, -1 表示不限. Defaults to -1.
+
+        Raises:
+            BufferError: 未消费数据已达到缓冲区上限
+
+        Returns:
+            memoryview: 空闲空间视图
+        """
+        need = max(sizehint, self._min_free)
+        if len(self._buf) - self._end < need:
+            self._reserve(need)
+        return self._view[self._end:]
+
+    def commit(self, nbytes: int) -> None:
+        """确认写入 `get_buffer` 返回空间的字节数
+
+        Args:
+            nbytes (int): 写入的字节数
+        """
+        self._end += nbytes
+
+    def consume(self, nbytes: int) -> None:
+        """消费未处理数据头部的字节
+
+        Args:
+            nbytes (int): 消费的字节数
+        """
+        self._start += nbytes
+        if self._start >= self._end:
+            self._start = self._end = 0
+
+    def extend(self, data: bytes | bytearray | memoryview) -> None:
+        """追加数据，用于非 BufferedProtocol 的场景
+
+        Args:
+            data (bytes | bytearray | memoryview): 追加的数据
+        """
+        nbytes = len(data)
+        if len(self._buf) - self._end < nbytes:
+            self._reserve(nbytes, strict=True)
+        self._view[self._end:self._end + nbytes] = data
+        self._end += nbytes
+
+    def clear(self) -> None:
+        """清空未消费数据
+        """
+        self._start = self._end = 0
+
+    def _reserve(self, need: int, strict: bool = False) -> None:
+        """保证尾部至少有 `need` 字节空闲空间
+
+        Args:
+            need (int): 需要的空闲空间
+            strict (bool): 为 False 时达到上限后允许返回小于 `need` 的空间. Defaults to False.
+
+        Raises:
+            BufferError: 超过缓冲区上限
+        """
+        used = self._end - self._start
+        size = len(self._buf)
+        if self._start >= used and size - used >= need:
+            # 已消费部分不少于未消费部分，原地搬移的代价可以由之前的消费摊还
+            self._view[:used] = self._view[self._start:self._end]
+        else:
+            while size - used < need:
+                size *= 2
+            if self._max_size is not None and size > self._max_size:
+                size = self._max_size
+                if size - used < (need if strict else 1):
+                    raise BufferError(f"Receive buffer overflow: {used} bytes pending, limit {self._max_size}")
+            if size != len(self._buf):
+                buf = bytearray(size)
+                view = memoryview(buf)
+                view[:used] = self._view[self._start:self._end]
+                self._buf = buf
+                self._view = view
+            else:
+                self._view[:used] = self._view[self._start:self._end]
+        self._start = 0
+        self._end = used
@@ -0,0 +1,288 @@
+import struct
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, Mapping
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "Field",
+    "Schema"
+]
+
+# 字段类型 -> (struct 格式字符, numpy 类型)
+_TYPES: dict[str, tuple[str, str]] = {
+    "u8": ("B", "u1"),
+    "i8": ("b", "i1"),
+    "u16": ("H", "u2"),
+    "i16": ("h", "i2"),
+    "u32": ("I", "u4"),
+    "i32": ("i", "i4"),
+    "u64": ("Q", "u8"),
+    "i64": ("q", "i8"),
+    "f16": ("e", "f2"),
+    "f32": ("f", "f4"),
+    "f64": ("d", "f8"),
+    "bool": ("?", "?"),
+    "bytes": ("s", "S"),
+    "pad": ("x", "V"),
+}
+
+_BYTEORDERS = {"big": ">", "little": "<"}
+
+
+@dataclass(frozen=True)
+class Field:
+    """报文字段
+
+    Attributes:
+        name (str): 字段名, pad 类型的字段不出现在解码结果中
+        type (str): 字段类型, u8/i8/u16/i16/u32/i32/u64/i64/f16/f32/f64/bool/bytes/pad
+        count (int): 重复次数, 大于 1 时字段值为元组; bytes 和 pad 类型表示字节数
+    """
+    name: str
+    type: str
+    count: int = 1
+
+    def __post_init__(self) -> None:
+        if self.type not in _TYPES:
+            raise ValueError(f"Unknown field type: {self.type}")
+        if self.count < 1:
+            raise ValueError(f"Invalid count of field {self.name}: {self.count}")
+
+    @property
+    def repeated(self) -> bool:
+        return self.count > 1 and self.type not in ("bytes", "pad")
+
+
+@lru_cache(maxsize=256)
+def _compile(fields: tuple[Field, ...], byteorder: str) -> struct.Struct:
+    """编译 struct 格式，相同布局的 Schema 共享同一个 `struct.Struct`
+    """
+    parts = [_BYTEORDERS[byteorder]]
+    for f in fields:
+        code = _TYPES[f.type][0]
+        parts.append(code if f.count == 1 else f"{f.count}{code}")
+    return struct.Struct("".join(parts))
+
+
+class Schema:
+    """声明式定长二进制报文格式
+
+    字段列表只在创建时编译一次为 `struct.Struct`，解码直接在 bytes/bytearray/memoryview 上按偏移进行，不切片、不复制。
+    `decode_array` 将连续的多条记录一次性解码为 NumPy 结构化数组，适合高频遥测数据，需要安装 numpy。
+
+    Note:
+        整个报文使用同一字节序，各字段之间没有对齐填充，需要填充时使用 pad 字段。
+
+    Example:
+    >>> telemetry = Schema([
+    ...     ("seq", "u32"),
+    ...     ("status", "u8"),
+    ...     ("", "pad", 3),
+    ...     ("values", "i16", 8),
+    ...     ("tag", "bytes", 4),
+    ... ], byteorder="little")
+    >>> telemetry.decode(frame)
+    {'seq': 1, 'status': 0, 'values': (0, 1, 2, 3, 4, 5, 6, 7), 'tag': b'abcd'}
+    >>> class MyProtocol(BufferedTCPClientProtocol):
+    ...     def on_data_received(self, data: memoryview) -> int | None:
+    ...         n = len(data) // telemetry.size
+    ...         records = telemetry.decode_array(data, n)
+    ...         return n * telemetry.size
+
+    Attributes:
+        fields (tuple[Field, ...]): 字段
+        byteorder (str): 字节序, "big" 或 "little"
+        names (tuple[str, ...]): 解码结果中的字段名
+        size (int): 报文长度
+        _struct (struct.Struct): 编译后的解析器
+        _layout (tuple[tuple[str, int, int], ...] | None): 重复字段在解包结果中的 (名称, 起始位置, 个数), 没有重复字段时为 None
+        _dtype (numpy.dtype | None): 缓存的 NumPy 结构化类型
+    """
+    def __init__(
+        self,
+        fields: Iterable[Field | tuple[str, str] | tuple[str, str, int]],
+        *,
+        byteorder: str = "big"
+    ) -> None:
+        if byteorder not in _BYTEORDERS:
+            raise ValueError(f"Invalid byteorder: {byteorder}")
+        self.fields = tuple(f if isinstance(f, Field) else Field(*f) for f in fields)
+        self.byteorder = byteorder
+        self.names = tuple(f.name for f in self.fields if f.type != "pad")
+        if len(set(self.names)) != len(self.names):
+            raise ValueError(f"Duplicate field names: {self.names}")
+        self._struct = _compile(self.fields, byteorder)
+        self.size = self._struct.size
+
+        layout, pos = [], 0
+        for f in self.fields:
+            if f.type == "pad":
+                continue
+            n = f.count if f.repeated else 1
+            layout.append((f.name, pos, n if f.repeated else 0))
+            pos += n
+        self._layout = tuple(layout) if any(n for _, _, n in layout) else None
+        self._dtype = None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(format={self._struct.format!r}, size={self.size})"
+
+    @property
+    def format(self) -> str:
+        """struct 格式字符串
+        """
+        return self._struct.format
+
+    def unpack(self, buf: bytes | bytearray | memoryview, offset: int = 0) -> tuple[Any, ...]:
+        """解包为扁平元组，重复字段展开，最快的解码方式
+
+        Args:
+            buf (bytes | bytearray | memoryview): 数据
+            offset (int, optional): 报文起始偏移. Defaults to 0.
+
+        Raises:
+            struct.error: 数据不足一个报文
+
+        Returns:
+            tuple[Any, ...]: 字段值
+        """
+        return self._struct.unpack_from(buf, offset)
+
+    def decode(self, buf: bytes | bytearray | memoryview, offset: int = 0) -> dict[str, Any]:
+        """解码一个报文
+
+        Args:
+            buf (bytes | bytearray | memoryview): 数据
+            offset (int, optional): 报文起始偏移. Defaults to 0.
+
+        Raises:
+            struct.error: 数据不足一个报文
+
+        Returns:
+            dict[str, Any]: 字段名到字段值的映射，重复字段为元组
+        """
+        return self._to_dict(self._struct.unpack_from(buf, offset))
+
+    def iter_decode(self, buf: bytes | bytearray | memoryview) -> Iterator[dict[str, Any]]:
+        """逐条解码连续的多条记录，末尾不足一条的数据被忽略
+
+        Args:
+            buf (bytes | bytearray | memoryview): 数据
+
+        Yields:
+            dict[str, Any]: 每条记录的解码结果
+        """
+        end = len(buf) - len(buf) % self.size
+        if isinstance(buf, memoryview):
+            buf = buf[:end]
+        else:
+            buf = memoryview(buf)[:end]
+        with buf:
+            for values in self._struct.iter_unpack(buf):
+                yield self._to_dict(values)
+
+    def encode(self, values: Mapping[str, Any] | None = None, /, **kwargs: Any) -> bytes:
+        """编码一个报文
+
+        Args:
+            values (Mapping[str, Any] | None, optional): 字段值. Defaults to None.
+            **kwargs: 字段值，与 values 合并
+
+        Raises:
+            KeyError: 缺少字段
+            struct.error: 字段值超出类型范围
+
+        Returns:
+            bytes: 报文
+        """
+        return self._struct.pack(*self._flatten({**values, **kwargs} if values else kwargs))
+
+    def encode_into(self, buf: bytearray | memoryview, offset: int, values: Mapping[str, Any]) -> None:
+        """将报文编码到已有缓冲区
+
+        Args:
+            buf (bytearray | memoryview): 可写缓冲区
+            offset (int): 写入偏移
+            values (Mapping[str, Any]): 字段值
+        """
+        self._struct.pack_into(buf, offset, *self._flatten(values))
+
+    @property
+    def dtype(self) -> Any:
+        """对应的 NumPy 结构化类型，pad 字段以偏移量跳过
+        """
+        if self._dtype is None:
+            np = _import_numpy()
+            prefix = _BYTEORDERS[self.byteorder]
+            names, formats, offsets, offset = [], [], [], 0
+            for f in self.fields:
+                code, np_code = _TYPES[f.type]
+                if f.type in ("bytes", "pad"):
+                    size, fmt = f.count, f"S{f.count}"
+                else:
+                    size = struct.calcsize(prefix + code) * f.count
+                    fmt = (prefix + np_code, (f.count, )) if f.repeated else prefix + np_code
+                if f.type != "pad":
+                    names.append(f.name)
+                    formats.append(fmt)
+                    offsets.append(offset)
+                offset += size
+            self._dtype = np.dtype({"names": names, "formats": formats, "offsets": offsets, "itemsize": self.size})
+        return self._dtype
+
+    def decode_array(
+        self,
+        buf: bytes | bytearray | memoryview,
+        count: int | None = None,
+        offset: int = 0,
+        *,
+        copy: bool = True
+    ) -> Any:
+        """将连续的多条记录一次性解码为 NumPy 结构化数组
+
+        Args:
+            buf (bytes | bytearray | memoryview): 数据
+            count (int | None, optional): 记录条数, None 表示所有完整记录. Defaults to None.
+            offset (int, optional): 起始偏移. Defaults to 0.
+            copy (bool, optional): 是否复制数据。为 False 时数组直接引用 buf，
+                `BufferedTCPClientProtocol` 的接收缓冲区在回调返回后会被复用，此时必须复制. Defaults to True.
+
+        Returns:
+            numpy.ndarray: 结构化数组
+        """
+        np = _import_numpy()
+        if count is None:
+            count = (len(buf) - offset) // self.size
+        array = np.frombuffer(buf, dtype=self.dtype, count=count, offset=offset)
+        return array.copy() if copy else array
+
+    def _to_dict(self, values: tuple[Any, ...]) -> dict[str, Any]:
+        layout = self._layout
+        if layout is None:
+            return dict(zip(self.names, values))
+        return {name: values[pos:pos + n] if n else values[pos] for name, pos, n in layout}
+
+    def _flatten(self, values: Mapping[str, Any]) -> list[Any]:
+        if self._layout is None:
+            return [values[name] for name in self.names]
+        flat: list[Any] = []
+        for name, _, n in self._layout:
+            value = values[name]
+            if n:
+                if len(value) != n:
+                    raise ValueError(f"Field {name} expects {n} values, got {len(value)}")
+                flat.extend(value)
+            else:
+                flat.append(value)
+        return flat
+
+
+def _import_numpy() -> Any:
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("numpy is not installed, Please install it using pip install numpy") from None
+    return numpy
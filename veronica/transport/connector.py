@@ -1,15 +1,71 @@
+import ssl
+import socket
 import logging
 import asyncio
-import random
-from typing import Type, Self
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Sequence, Type, Self
 from veronica.transport.protocol import TCPClientProtocol
+from veronica.transport.metrics import PeerMetrics
+from veronica.transport.backoff import Backoff, GoldenRatioBackoff, ReconnectLimiter
+from veronica.transport.tls import enable_session_reuse, resume_session, get_session
 
 logger = logging.getLogger(__name__)
 
 __all__ = [
-    "TCPConnector"
+    "TCPKeepAlive",
+    "TCPConnector",
+    "UnixConnector"
 ]
 
+@dataclass(frozen=True)
+class TCPKeepAlive:
+     """内核 TCP keepalive 参数
+
+     对端掉电、NAT 表项超时等半开连接不会触发 `connection_lost`，开启 keepalive 后内核在
+     idle + interval * count 秒内探测失败即断开连接，进而触发重连。
+
+     Attributes:
+          idle (int): 连接空闲多久后开始探测，单位秒
+          interval (int): 探测间隔，单位秒
+          count (int): 探测失败多少次后断开
+          user_timeout (float | None): TCP_USER_TIMEOUT，已发送数据多久未被确认即断开，单位秒, 仅 Linux 支持
+     """
+     idle: int = 10
+     interval: int = 5
+     count: int = 3
+     user_timeout: float | None = None
+
+     def __post_init__(self) -> None:
+          for name in ("idle", "interval", "count"):
+               if getattr(self, name) < 1:
+                    raise ValueError(f"Invalid keepalive {name}: {getattr(self, name)}")
+          if self.user_timeout is not None and self.user_timeout < 0:
+               raise ValueError(f"Invalid keepalive user_timeout: {self.user_timeout}")
+
+     def apply(self, sock: socket.socket) -> None:
+          """设置 socket 选项，当前平台不支持的选项会被忽略
+
+          Args:
+               sock (socket.socket): socket 对象
+          """
+          sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+          if hasattr(socket, "TCP_KEEPIDLE"):
+               sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, self.idle)
+          elif hasattr(socket, "TCP_KEEPALIVE"):
+               # macOS
+               sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, self.idle)
+          elif hasattr(socket, "SIO_KEEPALIVE_VALS"):
+               # Windows 只支持 idle 和 interval
+               sock.ioctl(socket.SIO_KEEPALIVE_VALS, (1, self.idle * 1000, self.interval * 1000))
+          if hasattr(socket, "TCP_KEEPINTVL"):
+               sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, self.interval)
+          if hasattr(socket, "TCP_KEEPCNT"):
+               sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, self.count)
+          if self.user_timeout is not None and hasattr(socket, "TCP_USER_TIMEOUT"):
+               sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_USER_TIMEOUT, int(self.user_timeout * 1000))
+
+
 class TCPConnector:
      """TCP连接类
 
@@ -19,13 +75,33 @@ class TCPConnector:
           auto_reconnect (bool): 是否自动重连. Defaults to True.
           use_jitter (bool): 是否使用重连抖动. Defaults to False.
           protocol_class (Type[TcpClientProtocol], optional): 协议类. Defaults to TcpClientProtocol.
+          keepalive (TCPKeepAlive | None): TCP keepalive 参数, None 表示不开启. Defaults to None.
+          backoff (Backoff): 重连退避策略, 默认按黄金分割比增长, use_jitter 时叠加正态分布抖动
+          limiter (ReconnectLimiter | None): 连接尝试速率限制, 多个连接器共享同一个实例, None 表示不限制
+          ssl_context (ssl.SSLContext | None): TLS 上下文, None 表示不使用 TLS
+          server_hostname (str | None): TLS 校验的服务器主机名, None 表示使用 host
+          ssl_handshake_timeout (float | None): TLS 握手超时, None 表示使用事件循环默认值 60 秒
+          session_reuse (bool): 重连时是否恢复上一次连接的 TLS 会话
+          connect_timeout (float | None): 单个地址的连接超时（包括 TLS 握手）, None 表示不限制
+          endpoints (list[tuple[str, int]]): 按优先级排列的地址, 第一个为 (host, port), 其余为备用地址
+          happy_eyeballs_delay (float | None): 域名解析出多个地址时, 下一个地址在上一个尚未连上多久后开始尝试, None 表示依次尝试
+          interleave (int | None): 按地址族交替排列解析结果, None 表示设置 happy_eyeballs_delay 时为 1
           _loop (asyncio.AbstractEventLoop): 事件循环
           _retry_delay (float): 重连延迟
+          _retry_count (int): 连续失败次数
           _continue_trying (bool): 是否继续尝试连接
           _on_lost_fut (asyncio.Future): 非正常连接丢失回调Future
+          _transport (asyncio.Transport | None): 传输对象
+          _protocol (TCPClientProtocol | None): 协议对象
+          _ssl_context (ssl.SSLContext | None): 建连使用的 TLS 上下文, 开启会话复用时为包装后的 ssl_context
+          _tls_session (ssl.SSLSession | None): 上一次连接的 TLS 会话
+          _endpoint_index (int): 最近一次连接成功的地址序号，下次连接从该地址开始尝试
           
      Example:
      >>> connector = TcpConnector.create("127.0.0.1", 8000, protocol_class=YourProtocol)
+     >>> context = ssl.create_default_context(cafile="ca.pem")
+     >>> connector = TcpConnector.create("device.local", 8443, ssl_context=context, ssl_handshake_timeout=5)
+     >>> connector = TcpConnector.create("10.0.0.1", 502, fallbacks=[("10.0.1.1", 502)], connect_timeout=0.5)
      
      """
      
@@ -35,6 +111,9 @@ class TCPConnector:
      factor: float = 1.6180339887498948
      jitter: float = 0.119626565582 
 
+     backoff: Backoff | None = None
+     limiter: ReconnectLimiter | None = None
+
      def __init__(
           self, 
           host: str,
@@ -42,18 +121,53 @@ class TCPConnector:
           auto_reconnect: bool,
           use_jitter: bool,
           protocol_class: Type[TCPClientProtocol],
-          loop: asyncio.AbstractEventLoop | None = None
+          loop: asyncio.AbstractEventLoop | None = None,
+          *,
+          keepalive: TCPKeepAlive | None = None,
+          backoff: Backoff | None = None,
+          limiter: ReconnectLimiter | None = None,
+          ssl_context: ssl.SSLContext | None = None,
+          server_hostname: str | None = None,
+          ssl_handshake_timeout: float | None = None,
+          session_reuse: bool = True,
+          connect_timeout: float | None = None,
+          fallbacks: Sequence[tuple[str, int]] = (),
+          happy_eyeballs_delay: float | None = None,
+          interleave: int | None = None
      ):
           self.host = host
           self.port = port
           self.auto_reconnect = auto_reconnect
           self.protocol_class = protocol_class
           self.use_jitter = use_jitter
+          self.keepalive = keepalive
+          self.backoff = backoff or self.backoff or GoldenRatioBackoff(
+               self.min_delay,
+               self.max_delay,
+               factor=self.factor,
+               jitter=self.jitter if use_jitter else 0.0
+          )
+          if limiter is not None:
+               self.limiter = limiter
+          self.ssl_context = ssl_context
+          self.server_hostname = server_hostname
+          self.ssl_handshake_timeout = ssl_handshake_timeout
+          self.session_reuse = session_reuse and ssl_context is not None
+          self._ssl_context = enable_session_reuse(ssl_context) if self.session_reuse else ssl_context
+          self.connect_timeout = connect_timeout
+          self.endpoints = [(host, port), *fallbacks]
+          self.happy_eyeballs_delay = happy_eyeballs_delay
+          self.interleave = interleave
           
           self._loop = loop or asyncio.get_running_loop()
-          self._retry_delay = self.min_delay
+          self._retry_delay = self.backoff.min_delay
+          self._retry_count = 0
           self._continue_trying = True
           self._on_lost_fut = self._loop.create_future()
+          self._transport: asyncio.Transport | None = None
+          self._protocol: TCPClientProtocol | None = None
+          self._tls_session: ssl.SSLSession | None = None
+          self._endpoint_index = 0
           
      @classmethod
      async def create(
@@ -64,7 +178,18 @@ class TCPConnector:
           auto_reconnect: bool = True,
           use_jitter: bool = False,
           protocol_class: Type[TCPClientProtocol] = TCPClientProtocol,
-          loop: asyncio.AbstractEventLoop | None = None
+          loop: asyncio.AbstractEventLoop | None = None,
+          keepalive: TCPKeepAlive | None = None,
+          backoff: Backoff | None = None,
+          limiter: ReconnectLimiter | None = None,
+          ssl_context: ssl.SSLContext | None = None,
+          server_hostname: str | None = None,
+          ssl_handshake_timeout: float | None = None,
+          session_reuse: bool = True,
+          connect_timeout: float | None = None,
+          fallbacks: Sequence[tuple[str, int]] = (),
+          happy_eyeballs_delay: float | None = None,
+          interleave: int | None = None
      ) -> Self:
           """创建连接
 
@@ -74,6 +199,17 @@ class TCPConnector:
                auto_reconnect (bool): 是否自动重连. Defaults to True.
                use_jitter (bool): 是否使用重连抖动. Defaults to False.
                protocol_class (Type[TcpClientProtocol], optional): 协议类. Defaults to TcpClientProtocol.
+               keepalive (TCPKeepAlive | None, optional): TCP keepalive 参数, None 表示不开启. Defaults to None.
+               backoff (Backoff | None, optional): 重连退避策略, None 表示使用默认策略. Defaults to None.
+               limiter (ReconnectLimiter | None, optional): 连接尝试速率限制. Defaults to None.
+               ssl_context (ssl.SSLContext | None, optional): TLS 上下文, None 表示不使用 TLS. Defaults to None.
+               server_hostname (str | None, optional): TLS 校验的服务器主机名, None 表示使用 host. Defaults to None.
+               ssl_handshake_timeout (float | None, optional): TLS 握手超时. Defaults to None.
+               session_reuse (bool, optional): 重连时是否恢复上一次连接的 TLS 会话. Defaults to True.
+               connect_timeout (float | None, optional): 单个地址的连接超时, None 表示不限制. Defaults to None.
+               fallbacks (Sequence[tuple[str, int]], optional): 备用地址, 主地址连接失败时依次尝试. Defaults to ().
+               happy_eyeballs_delay (float | None, optional): 多地址并行连接的间隔 (RFC 8305). Defaults to None.
+               interleave (int | None, optional): 按地址族交替排列解析结果. Defaults to None.
 
           Returns:
                Self: 连接实例
@@ -84,35 +220,152 @@ class TCPConnector:
                auto_reconnect,
                use_jitter,
                protocol_class,
-               loop
+               loop,
+               keepalive=keepalive,
+               backoff=backoff,
+               limiter=limiter,
+               ssl_context=ssl_context,
+               server_hostname=server_hostname,
+               ssl_handshake_timeout=ssl_handshake_timeout,
+               session_reuse=session_reuse,
+               connect_timeout=connect_timeout,
+               fallbacks=fallbacks,
+               happy_eyeballs_delay=happy_eyeballs_delay,
+               interleave=interleave
           )
-          
-          if connector.auto_reconnect:
-               await connector._reconnect()
-          else:
-               await connector._connect()
-     
+          await connector._start()
           return connector
+
+     async def _start(self) -> None:
+          """首次连接，自动重连时直到调用 `close` 才返回
+          """
+          if self.auto_reconnect:
+               await self._reconnect()
+          else:
+               await self._connect()
      
      
      def close(self) -> None:
-          """关闭连接
+          """关闭连接，并停止重连
           """
-          if not self.is_connected():
+          self.stop_retry()
+          if self.is_connected():
                assert self._transport is not None, (
                     "transport is None"
                )
                self._transport.close()
                self._transport = None
+
      async def _connect(self) -> None:
           """连接
+
+          从最近一次连接成功的地址开始依次尝试所有地址，全部失败时抛出最后一个地址的异常
+
+          Raises:
+               OSError: 所有地址均连接失败, 超时为 TimeoutError
           """
-          transport, protocol = await self._loop.create_connection(
-               lambda: self.protocol_class(self._on_lost_fut, self._loop),
-               self.host, self.port   
-          )
+          start = self._loop.time()
+          if self.session_reuse:
+               self._tls_session = get_session(self._transport) or self._tls_session
+          endpoints = self.endpoints
+          for i in range(len(endpoints)):
+               index = (self._endpoint_index + i) % len(endpoints)
+               host, port = endpoints[index]
+               factory = partial(self._make_protocol, self._peer_metrics(host, port))
+               try:
+                    transport, protocol = await self._open(factory, host, port)
+               except OSError as e:
+                    if i == len(endpoints) - 1:
+                         raise
+                    logger.info(f"Failed to connect to {host}:{port}: {e!r}, trying next endpoint")
+                    continue
+               if index != self._endpoint_index:
+                    logger.info(f"Failed over from {self.endpoint_address()} to {host}:{port}")
+                    self._endpoint_index = index
+               break
+          if self.keepalive is not None:
+               sock = transport.get_extra_info("socket")
+               if sock is not None and sock.type == socket.SOCK_STREAM and sock.family != getattr(socket, "AF_UNIX", None):
+                    try:
+                         self.keepalive.apply(sock)
+                    except OSError:
+                         # 连接已建立，按连接失败处理前先关闭，并与连接器的 _on_lost_fut 解绑，避免误触发重连
+                         protocol._on_lost_fut = None
+                         transport.close()
+                         raise
           self._transport = transport
           self._protocol = protocol
+          peer = self._peer_metrics(*self.endpoints[self._endpoint_index])
+          if peer is not None:
+               peer.connect_latency.observe(self._loop.time() - start)
+
+     def _make_protocol(self, peer: PeerMetrics | None) -> TCPClientProtocol:
+          """创建协议对象，流量指标与连接器的建连、重连指标记录在同一个标签下
+          """
+          protocol = self.protocol_class(self._on_lost_fut, self._loop)
+          protocol._metrics = peer
+          return protocol
+
+     def _peer_metrics(self, host: str, port: int) -> PeerMetrics | None:
+          """配置地址对应的指标对象，而不是解析后的对端地址，同一条链路只有一组标签
+          """
+          metrics = self.protocol_class.metrics
+          return None if metrics is None else metrics.peer(host, port)
+
+     async def _open(
+          self,
+          factory: Callable[[], asyncio.BaseProtocol],
+          host: str,
+          port: int
+     ) -> tuple[asyncio.BaseTransport, asyncio.BaseProtocol]:
+          """连接单个地址，超时包括 TLS 握手
+
+          Raises:
+               TimeoutError: 超过 `connect_timeout`
+          """
+          kwargs: dict[str, Any] = {}
+          if self.ssl_context is not None:
+               kwargs.update(
+                    ssl=self._ssl_context,
+                    server_hostname=self.server_hostname,
+                    ssl_handshake_timeout=self.ssl_handshake_timeout
+               )
+          try:
+               async with asyncio.timeout(self.connect_timeout):
+                    with resume_session(self._tls_session if self.session_reuse else None):
+                         return await self._create_connection(factory, host, port, **kwargs)
+          except TimeoutError as e:
+               if e.args:
+                    raise
+               raise TimeoutError(f"Connect timeout after {self.connect_timeout} s") from None
+
+     async def _create_connection(
+          self,
+          factory: Callable[[], asyncio.BaseProtocol],
+          host: str,
+          port: int,
+          **kwargs: Any
+     ) -> tuple[asyncio.BaseTransport, asyncio.BaseProtocol]:
+          """创建传输对象，子类重写以使用其他类型的传输
+
+          Args:
+               factory (Callable[[], asyncio.BaseProtocol]): 协议工厂
+               host (str): 地址
+               port (int): 端口
+               **kwargs: TLS 参数
+
+          Returns:
+               tuple[asyncio.BaseTransport, asyncio.BaseProtocol]: 传输对象和协议对象
+          """
+          return await self._loop.create_connection(
+               factory,
+               host,
+               port,
+               happy_eyeballs_delay=self.happy_eyeballs_delay,
+               interleave=self.interleave,
+               **kwargs
+          )
+
      async def _reconnect(self) -> None:
           """重连
           
@@ -122,6 +375,8 @@ class TCPConnector:
           """
           while self._continue_trying:
                try:
+                    if self.limiter is not None:
+                         await self.limiter.acquire()
                     await self._connect()
                     self._reset_delay()
                     on_lost_fut = self._on_lost_fut
@@ -143,18 +398,32 @@ class TCPConnector:
      def _reset_delay(self) -> None:
           """重置重连时延
           """
-          self._retry_delay = self.min_delay
+          self._retry_delay = self.backoff.min_delay
+          self._retry_count = 0
+          peer = self._peer_metrics(*self.endpoints[self._endpoint_index])
+          if peer is not None:
+               peer.retry_delay.set(0)
      
      def _increase_delay(self) -> None:
           """增加重连时延
           
           Note:
-               时延抖动是根据正态分布计算
+               时延由 `backoff` 策略根据连续失败次数和上一次时延计算，始终位于 [0, max_delay] 内
           """
-          self._retry_delay = min(self._retry_delay * self.factor, self.max_delay)
-          if self.use_jitter:
-               self._retry_delay = random.normalvariate(self._retry_delay, self.jitter * self._retry_delay)
+          self._retry_count += 1
+          self._retry_delay = self.backoff.delay(self._retry_count, self._retry_delay)
+          peer = self._peer_metrics(*self.endpoints[self._endpoint_index])
+          if peer is not None:
+               peer.reconnects.inc()
+               peer.retry_delay.set(self._retry_delay)
      
+     @property
+     def session_reused(self) -> bool:
+          """当前 TLS 连接是否恢复了上一次的会话
+          """
+          sslobj = self._transport.get_extra_info("ssl_object") if self._transport is not None else None
+          return sslobj is not None and sslobj.session_reused
+
      def is_connected(self) -> bool:
           return self._transport is not None and not self._transport.is_closing()
      
@@ -163,4 +432,80 @@ class TCPConnector:
      
      
      def log_address(self) -> str:
-          return f"{self.host}:{self.port}"
\ No newline at end of file
+          return f"{self.host}:{self.port}"
+
+     def endpoint_address(self) -> str:
+          """最近一次连接成功（或首选）的地址
+          """
+          host, port = self.endpoints[self._endpoint_index]
+          return f"{host}:{port}"
+
+
+class UnixConnector(TCPConnector):
+     """Unix 域套接字连接类
+
+     与 `TCPConnector` 的重连、退避、限速和生命周期语义相同，协议类同样使用 `TCPClientProtocol` 及其子类，
+     本机进程间通信不经过 TCP 协议栈。
+
+     Note:
+          使用 TLS 时必须指定 server_hostname。备用地址同样是套接字路径, 端口为 0。
+
+     Example:
+     >>> connector = await UnixConnector.create("/run/device.sock", protocol_class=YourProtocol)
+
+     Attributes:
+          path (str): 套接字路径, 在 Linux 上以 "\\0" 开头表示抽象命名空间
+     """
+     def __init__(
+          self,
+          path: str,
+          auto_reconnect: bool = True,
+          use_jitter: bool = False,
+          protocol_class: Type[TCPClientProtocol] = TCPClientProtocol,
+          loop: asyncio.AbstractEventLoop | None = None,
+          **kwargs: Any
+     ):
+          super().__init__(path, 0, auto_reconnect, use_jitter, protocol_class, loop, **kwargs)
+          self.path = path
+
+     @classmethod
+     async def create(
+          cls,
+          path: str,
+          *,
+          auto_reconnect: bool = True,
+          use_jitter: bool = False,
+          protocol_class: Type[TCPClientProtocol] = TCPClientProtocol,
+          loop: asyncio.AbstractEventLoop | None = None,
+          **kwargs: Any
+     ) -> Self:
+          """创建连接
+
+          Args:
+               path (str): 套接字路径
+               auto_reconnect (bool): 是否自动重连. Defaults to True.
+               use_jitter (bool): 是否使用重连抖动. Defaults to False.
+               protocol_class (Type[TcpClientProtocol], optional): 协议类. Defaults to TcpClientProtocol.
+               **kwargs: backoff, limiter 以及 TLS 参数，与 `TCPConnector.create` 相同
+
+          Returns:
+               Self: 连接实例
+          """
+          connector = cls(path, auto_reconnect, use_jitter, protocol_class, loop, **kwargs)
+          await connector._start()
+          return connector
+
+     async def _create_connection(
+          self,
+          factory: Callable[[], asyncio.BaseProtocol],
+          host: str,
+          port: int,
+          **kwargs: Any
+     ) -> tuple[asyncio.BaseTransport, asyncio.BaseProtocol]:
+          return await self._loop.create_unix_connection(factory, host, **kwargs)
+
+     def __repr__(self) -> str:
+          return f"{self.__class__.__name__}(path={self.path})"
+
+     def log_address(self) -> str:
+          return self.path
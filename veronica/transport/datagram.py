@@ -0,0 +1,207 @@
+import asyncio
+import logging
+from typing import final, cast, Any, Callable, Type
+
+from veronica.transport.trace import wire_tracer, RX, TX
+from veronica.transport.protocol import TCPClientProtocol
+from veronica.transport.connector import TCPConnector
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "UDPClientProtocol",
+    "UDPConnector"
+]
+
+
+class UDPClientProtocol(TCPClientProtocol, asyncio.DatagramProtocol):
+    """UDP 客户端协议类
+
+    钩子函数、定时任务、看门狗、请求/响应关联、报文追踪与指标与 `TCPClientProtocol` 一致，
+    每个数据报对应一次 `transmit_data` 或一次 `on_data_received`，不会被合并或拆分。
+
+    同一轮事件循环中收到的数据报先放入列表，本轮结束时通过一次 `on_datagrams_received` 批量交给用户，
+    默认实现逐个调用 `on_data_received`，高频遥测可以重写 `on_datagrams_received` 一次处理整批数据。
+    每批的大小取决于事件循环在一轮中读取的数据报数量：uvloop 会在一轮中连续读取，
+    asyncio 默认事件循环每次可读事件只读取一个数据报。
+
+    Note:
+        UDP 没有连接，对端失联不会触发 `connection_lost`，需要设置 `idle_timeout` 检测并触发重连。
+        ICMP 端口不可达等错误通过 `on_error_received` 通知，不会断开。
+
+    Attributes:
+        batch_datagrams (bool): 是否按事件循环批量交付数据报
+        max_batch (int): 单批数据报数量上限，达到后立即交付
+        _rx_batch (list[bytes]): 等待交付的数据报
+        _rx_flush_handle (asyncio.Handle | None): 批量交付的回调句柄
+    """
+    batch_datagrams: bool = True
+    max_batch: int = 1024
+
+    def __init__(
+        self,
+        on_lost_fut: asyncio.Future | None = None,
+        loop: asyncio.AbstractEventLoop | None = None
+    ) -> None:
+        super().__init__(on_lost_fut, loop)
+        self._rx_batch: list[bytes] = []
+        self._rx_flush_handle: asyncio.Handle | None = None
+
+    def _before_connection_lost(self, exc: Exception | None) -> None:
+        # 断开前收到的数据报先交付，之后不再回调 on_datagrams_received
+        self._flush_datagrams()
+
+    @final
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        """数据报接收时回调
+
+        Args:
+            data (bytes): 数据报
+            addr (Any): 对端地址
+        """
+        self._on_datagram(data)
+        if not self.batch_datagrams:
+            return
+        batch = self._rx_batch
+        if len(batch) >= self.max_batch:
+            self._flush_datagrams()
+        elif batch and self._rx_flush_handle is None:
+            self._rx_flush_handle = self._loop.call_soon(self._flush_datagrams)
+
+    def _on_datagram(self, data: bytes) -> None:
+        """统计并暂存一个数据报，非批量模式下直接交付
+        """
+        self._rx_seen = True
+        if wire_tracer.enabled:
+            wire_tracer.record(self._trace_name, RX, data)
+        metrics = self._metrics
+        if metrics is not None:
+            metrics.bytes_in.inc(len(data))
+            metrics.messages_in.inc()
+        if self.batch_datagrams:
+            self._rx_batch.append(data)
+        else:
+            self.on_data_received(data)
+
+    @final
+    def error_received(self, exc: Exception) -> None:
+        """发送或接收出错时回调，例如对端端口不可达
+
+        Args:
+            exc (Exception): 异常
+        """
+        self.log.warning(f"Error received: {exc}")
+        self.on_error_received(exc)
+
+    def _flush_datagrams(self) -> None:
+        """批量交付本轮事件循环收到的数据报
+        """
+        if self._rx_flush_handle is not None:
+            self._rx_flush_handle.cancel()
+            self._rx_flush_handle = None
+        batch = self._rx_batch
+        if not batch:
+            return
+        self._rx_batch = []
+        self.on_datagrams_received(batch)
+
+    def transmit_data(self, data: bytes) -> None:
+        """发送一个数据报
+
+        Args:
+            data (bytes): 需要发送的数据
+
+        Raises:
+            ConnectionError: transpost 不存在或者正在关闭
+        """
+        if not self.is_connected:
+            raise ConnectionError("Transport can't be used")
+        cast(asyncio.DatagramTransport, self._transport).sendto(data)
+        if wire_tracer.enabled:
+            wire_tracer.record(self._trace_name, TX, data)
+        metrics = self._metrics
+        if metrics is not None:
+            metrics.bytes_out.inc(len(data))
+            metrics.messages_out.inc()
+
+    def on_datagrams_received(self, datagrams: list[bytes]) -> None:
+        """本轮事件循环收到的数据报，用户调用
+
+        Args:
+            datagrams (list[bytes]): 数据报列表，按接收顺序排列
+        """
+        for data in datagrams:
+            self.on_data_received(data)
+
+    def on_error_received(self, exc: Exception) -> None:
+        """发送或接收出错时回调，用户调用
+
+        Args:
+            exc (Exception): 异常
+        """
+        pass
+
+
+class UDPConnector(TCPConnector):
+    """UDP 连接类
+
+    使用已连接的 UDP 套接字，只收发与指定对端之间的数据报。重连、退避、限速和生命周期语义与 `TCPConnector` 相同，
+    `idle_timeout` 看门狗中止传输后自动重新创建套接字。
+
+    Example:
+    >>> class Telemetry(UDPClientProtocol):
+    ...     idle_timeout = 30
+    ...
+    ...     def on_datagrams_received(self, datagrams: list[bytes]) -> None:
+    ...         ...
+    >>> connector = await UDPConnector.create("10.0.0.8", 9000, protocol_class=Telemetry)
+
+    Attributes:
+        local_addr (tuple[str, int] | None): 本地绑定地址, None 表示由系统分配
+    """
+    local_addr: tuple[str, int] | None = None
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        auto_reconnect: bool,
+        use_jitter: bool,
+        protocol_class: Type[TCPClientProtocol],
+        loop: asyncio.AbstractEventLoop | None = None,
+        **kwargs: Any
+    ):
+        if kwargs.get("ssl_context") is not None:
+            raise ValueError("TLS is not supported over UDP")
+        if not issubclass(protocol_class, UDPClientProtocol):
+            raise TypeError(f"{protocol_class.__name__} is not a subclass of UDPClientProtocol")
+        super().__init__(host, port, auto_reconnect, use_jitter, protocol_class, loop, **kwargs)
+
+    @classmethod
+    async def create(
+        cls,
+        host: str,
+        port: int,
+        *,
+        protocol_class: Type[TCPClientProtocol] = UDPClientProtocol,
+        **kwargs: Any
+    ) -> "UDPConnector":
+        """创建连接，参数与 `TCPConnector.create` 相同，协议类默认为 `UDPClientProtocol`
+
+        Returns:
+            UDPConnector: 连接实例
+        """
+        return await super().create(host, port, protocol_class=protocol_class, **kwargs)
+
+    async def _create_connection(
+        self,
+        factory: Callable[[], asyncio.BaseProtocol],
+        host: str,
+        port: int,
+        **kwargs: Any
+    ) -> tuple[asyncio.BaseTransport, asyncio.BaseProtocol]:
+        return await self._loop.create_datagram_endpoint(
+            factory,
+            local_addr=self.local_addr,
+            remote_addr=(host, port)
+        )
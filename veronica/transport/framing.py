@@ -0,0 +1,297 @@
+import logging
+import struct
+from typing import final
+
+from veronica.transport.buffer import ReceiveBuffer
+from veronica.transport.protocol import BufferedTCPClientProtocol
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "FramingError",
+    "Framer",
+    "LengthPrefixFramer",
+    "DelimiterFramer",
+    "FixedLengthFramer",
+    "StartStopFramer",
+    "FramedTCPClientProtocol"
+]
+
+# 未找到完整帧时 `Framer.find` 返回的帧起止位置
+NO_FRAME = -1
+
+
+class FramingError(ValueError):
+    """帧格式错误，例如帧长度超过上限
+    """
+
+
+class Framer:
+    """帧解析器基类
+
+    帧解析器直接在接收缓冲区上按偏移量扫描，不切片、不复制。解析器可以保存扫描进度等状态，
+    因此每个连接需要使用独立的实例，扫描进度以当前帧起始位置为基准，缓冲区压缩后依然有效。
+
+    Attributes:
+        max_frame_size (int | None): 帧长度上限，None 表示不限制
+    """
+    def __init__(self, max_frame_size: int | None = None) -> None:
+        self.max_frame_size = max_frame_size
+
+    def find(self, buf: bytearray, start: int, end: int) -> tuple[int, int, int]:
+        """在 buf[start:end] 中查找一帧
+
+        Args:
+            buf (bytearray): 接收缓冲区
+            start (int): 未处理数据的起始偏移
+            end (int): 未处理数据的结束偏移
+
+        Raises:
+            FramingError: 帧格式错误
+
+        Returns:
+            tuple[int, int, int]: (帧起始偏移, 帧结束偏移, 下一帧起始偏移)。
+                未找到完整帧时前两项为 -1，第三项为需要保留的数据起始偏移（之前的数据被丢弃）
+        """
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        """重置解析状态
+        """
+        pass
+
+    def _check_size(self, size: int) -> None:
+        if self.max_frame_size is not None and size > self.max_frame_size:
+            raise FramingError(f"Frame size {size} exceeds limit {self.max_frame_size}")
+
+
+class LengthPrefixFramer(Framer):
+    """长度前缀帧解析器
+
+    帧长度 = length_offset + length_size + 长度字段值 + length_adjustment
+
+    Example:
+    >>> framer = LengthPrefixFramer(2)   # 2 字节大端长度 + 负载
+    >>> framer = LengthPrefixFramer(4, length_offset=2, byteorder="little", length_adjustment=-4)
+
+    Attributes:
+        length_size (int): 长度字段字节数，支持 1, 2, 4, 8
+        length_offset (int): 长度字段在帧头中的偏移
+        length_adjustment (int): 长度字段值的修正量
+        strip_header (bool): 是否去掉帧头（长度字段及其之前的字节）
+    """
+    _formats = {1: "B", 2: "H", 4: "I", 8: "Q"}
+
+    def __init__(
+        self,
+        length_size: int = 2,
+        *,
+        length_offset: int = 0,
+        byteorder: str = "big",
+        length_adjustment: int = 0,
+        strip_header: bool = False,
+        max_frame_size: int | None = None
+    ) -> None:
+        super().__init__(max_frame_size)
+        if length_size not in self._formats:
+            raise ValueError(f"Unsupported length size: {length_size}")
+        if byteorder not in ("big", "little"):
+            raise ValueError(f"Invalid byteorder: {byteorder}")
+        self.length_size = length_size
+        self.length_offset = length_offset
+        self.length_adjustment = length_adjustment
+        self.strip_header = strip_header
+        self._header_size = length_offset + length_size
+        self._length = struct.Struct((">" if byteorder == "big" else "<") + self._formats[length_size])
+
+    def find(self, buf: bytearray, start: int, end: int) -> tuple[int, int, int]:
+        header_size = self._header_size
+        if end - start < header_size:
+            return NO_FRAME, NO_FRAME, start
+        (length, ) = self._length.unpack_from(buf, start + self.length_offset)
+        frame_size = header_size + length + self.length_adjustment
+        if frame_size < header_size:
+            raise FramingError(f"Invalid frame length: {length}")
+        self._check_size(frame_size)
+        frame_end = start + frame_size
+        if frame_end > end:
+            return NO_FRAME, NO_FRAME, start
+        return (start + header_size if self.strip_header else start), frame_end, frame_end
+
+
+class DelimiterFramer(Framer):
+    """分隔符帧解析器
+
+    Attributes:
+        delimiter (bytes): 分隔符
+        strip (bool): 帧中是否去掉分隔符
+        _scanned (int): 当前帧已扫描过的字节数，避免半帧被重复扫描
+    """
+    def __init__(
+        self,
+        delimiter: bytes = b"\n",
+        *,
+        strip: bool = True,
+        max_frame_size: int | None = None
+    ) -> None:
+        super().__init__(max_frame_size)
+        if not delimiter:
+            raise ValueError("Delimiter must not be empty")
+        self.delimiter = bytes(delimiter)
+        self.strip = strip
+        self._scanned = 0
+
+    def find(self, buf: bytearray, start: int, end: int) -> tuple[int, int, int]:
+        delimiter = self.delimiter
+        pos = buf.find(delimiter, start + self._scanned, end)
+        if pos < 0:
+            self._scanned = max(0, end - start - len(delimiter) + 1)
+            self._check_size(end - start)
+            return NO_FRAME, NO_FRAME, start
+        self._scanned = 0
+        next_start = pos + len(delimiter)
+        self._check_size(next_start - start)
+        return start, (pos if self.strip else next_start), next_start
+
+    def reset(self) -> None:
+        self._scanned = 0
+
+
+class FixedLengthFramer(Framer):
+    """定长帧解析器
+
+    Attributes:
+        size (int): 帧长度
+    """
+    def __init__(self, size: int) -> None:
+        super().__init__(size)
+        if size <= 0:
+            raise ValueError(f"Invalid frame size: {size}")
+        self.size = size
+
+    def find(self, buf: bytearray, start: int, end: int) -> tuple[int, int, int]:
+        frame_end = start + self.size
+        if frame_end > end:
+            return NO_FRAME, NO_FRAME, start
+        return start, frame_end, frame_end
+
+
+class StartStopFramer(Framer):
+    """起止符帧解析器
+
+    起始符之前的数据视为噪声直接丢弃。
+
+    Attributes:
+        start_marker (bytes): 起始符
+        stop_marker (bytes): 结束符
+        include_markers (bool): 帧中是否包含起止符
+        _scanned (int): 当前帧起始符之后已扫描过的字节数
+    """
+    def __init__(
+        self,
+        start_marker: bytes = b"\x02",
+        stop_marker: bytes = b"\x03",
+        *,
+        include_markers: bool = False,
+        max_frame_size: int | None = None
+    ) -> None:
+        super().__init__(max_frame_size)
+        if not start_marker or not stop_marker:
+            raise ValueError("Markers must not be empty")
+        self.start_marker = bytes(start_marker)
+        self.stop_marker = bytes(stop_marker)
+        self.include_markers = include_markers
+        self._scanned = 0
+
+    def find(self, buf: bytearray, start: int, end: int) -> tuple[int, int, int]:
+        start_marker = self.start_marker
+        frame_start = buf.find(start_marker, start, end)
+        if frame_start < 0:
+            # 保留可能是半个起始符的尾部数据
+            self._scanned = 0
+            return NO_FRAME, NO_FRAME, max(start, end - len(start_marker) + 1)
+        if frame_start != start:
+            self._scanned = 0
+        body_start = frame_start + len(start_marker)
+        stop_marker = self.stop_marker
+        pos = buf.find(stop_marker, body_start + self._scanned, end)
+        if pos < 0:
+            self._scanned = max(0, end - body_start - len(stop_marker) + 1)
+            self._check_size(end - frame_start)
+            return NO_FRAME, NO_FRAME, frame_start
+        self._scanned = 0
+        next_start = pos + len(stop_marker)
+        self._check_size(next_start - frame_start)
+        if self.include_markers:
+            return frame_start, next_start, next_start
+        return body_start, pos, next_start
+
+    def reset(self) -> None:
+        self._scanned = 0
+
+
+class FramedTCPClientProtocol(BufferedTCPClientProtocol):
+    """分帧 TCP 客户端协议类
+
+    在 `BufferedTCPClientProtocol` 的接收缓冲区上使用帧解析器切分数据，每个完整帧调用一次
+    `on_frame_received`。切分过程只移动偏移量，帧以缓冲区的 memoryview 切片形式传入，
+    整体为线性时间且无复制。帧格式错误时记录日志并断开连接。
+
+    Note:
+        传入的帧在回调返回后失效，如需保留请使用 bytes(frame) 复制。
+
+    Example:
+    >>> class MyProtocol(FramedTCPClientProtocol):
+    ...     def create_framer(self) -> Framer:
+    ...         return LengthPrefixFramer(2, max_frame_size=65535)
+    ...
+    ...     def on_frame_received(self, frame: memoryview) -> None:
+    ...         print(bytes(frame))
+
+    Attributes:
+        _framer (Framer): 当前连接的帧解析器
+    """
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._framer = self.create_framer()
+
+    @final
+    def _process_rx_buffer(self, rx: ReceiveBuffer) -> None:
+        buf, view, framer, metrics = rx.buffer, rx.view, self._framer, self._metrics
+        pos, end = rx.start, rx.end
+        try:
+            while pos < end:
+                frame_start, frame_end, pos = framer.find(buf, pos, end)
+                if frame_start == NO_FRAME:
+                    break
+                if metrics is not None:
+                    metrics.messages_in.inc()
+                frame = view[frame_start:frame_end]
+                try:
+                    self.on_frame_received(frame)
+                finally:
+                    frame.release()
+        except FramingError as e:
+            self.log.error(f"Framing error: {e}")
+            rx.clear()
+            framer.reset()
+            if self._transport is not None:
+                self._transport.abort()
+            return
+        rx.consume(pos - rx.start)
+
+    def create_framer(self) -> Framer:
+        """创建当前连接的帧解析器，用户实现
+
+        Returns:
+            Framer: 帧解析器
+        """
+        raise NotImplementedError
+
+    def on_frame_received(self, frame: memoryview) -> None:
+        """完整帧接收时回调，用户调用
+
+        Args:
+            frame (memoryview): 帧数据
+        """
+        pass
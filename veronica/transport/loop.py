@@ -0,0 +1,80 @@
+import asyncio
+import logging
+from typing import Any, Callable, Coroutine, TypeVar
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "use_fast_loop",
+    "fast_loop_factory",
+    "run",
+    "loop_name"
+]
+
+T = TypeVar("T")
+
+
+def fast_loop_factory() -> Callable[[], asyncio.AbstractEventLoop] | None:
+    """获取 uvloop 的事件循环工厂函数
+
+    Returns:
+        Callable[[], asyncio.AbstractEventLoop] | None: uvloop 未安装时返回 None
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
+def use_fast_loop() -> bool:
+    """安装 uvloop 事件循环策略，未安装 uvloop 时保持 asyncio 默认事件循环
+
+    需要在创建事件循环（例如 asyncio.run）之前调用。`TCPConnector`、`TCPClientProtocol` 等组件
+    只依赖标准 asyncio 接口，在两种事件循环下行为一致。
+
+    Example:
+    >>> from veronica.transport import use_fast_loop
+    >>> use_fast_loop()
+    >>> asyncio.run(main())
+
+    Returns:
+        bool: 是否已使用 uvloop
+    """
+    try:
+        import uvloop
+    except ImportError:
+        logger.info("uvloop is not installed, using the default asyncio event loop. Please install it using pip install veronica[fast]")
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("uvloop event loop policy installed")
+    return True
+
+
+def run(main: Coroutine[Any, Any, T], *, fast: bool = True, debug: bool | None = None) -> T:
+    """与 asyncio.run 相同，`fast` 为 True 且安装了 uvloop 时使用 uvloop，不修改全局事件循环策略
+
+    Args:
+        main (Coroutine[Any, Any, T]): 入口协程
+        fast (bool, optional): 是否尝试使用 uvloop. Defaults to True.
+        debug (bool | None, optional): 事件循环调试模式. Defaults to None.
+
+    Returns:
+        T: 入口协程的返回值
+    """
+    loop_factory = fast_loop_factory() if fast else None
+    with asyncio.Runner(debug=debug, loop_factory=loop_factory) as runner:
+        return runner.run(main)
+
+
+def loop_name(loop: asyncio.AbstractEventLoop | None = None) -> str:
+    """事件循环实现的名称
+
+    Args:
+        loop (asyncio.AbstractEventLoop | None, optional): 事件循环, None 表示当前运行的事件循环. Defaults to None.
+
+    Returns:
+        str: "uvloop" 或 "asyncio"
+    """
+    loop = loop or asyncio.get_running_loop()
+    return "uvloop" if type(loop).__module__.startswith("uvloop") else "asyncio"
@@ -0,0 +1,164 @@
+import logging
+import threading
+from typing import Callable
+
+try:
+    from prometheus_client import Counter, Gauge, Histogram, CollectorRegistry, REGISTRY
+except ImportError:
+    raise ImportError("prometheus-client is not installed., Please install it using pip insall prometheus-client")
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "PeerMetrics",
+    "TransportMetrics"
+]
+
+OTHER = "other"
+
+# 同一 registry 中已注册的指标，多个 TransportMetrics 实例共用，避免重复注册
+_collectors: dict[tuple[CollectorRegistry, str], Counter | Gauge | Histogram] = {}
+_collectors_lock = threading.Lock()
+
+
+def _collector(cls, name: str, documentation: str, *, registry: CollectorRegistry | None, **kwargs):
+    if registry is None:
+        return cls(name, documentation, registry=None, **kwargs)
+    key = (registry, f"{kwargs['namespace']}_{kwargs['subsystem']}_{name}")
+    with _collectors_lock:
+        collector = _collectors.get(key)
+        if collector is None:
+            collector = _collectors[key] = cls(name, documentation, registry=registry, **kwargs)
+    return collector
+
+
+class PeerMetrics:
+    """同一标签值下的指标对象，连接建立时获取一次，热路径上不再查找标签
+
+    Attributes:
+        bytes_in (Counter): 接收字节数
+        bytes_out (Counter): 发送字节数
+        messages_in (Counter): 接收消息数（数据块或帧）
+        messages_out (Counter): 发送消息数
+        connections (Gauge): 当前连接数
+        write_buffer (Gauge): 发送缓冲区字节数
+        connect_latency (Histogram): 建连耗时
+        reconnects (Counter): 重连尝试次数
+        retry_delay (Gauge): 当前重连延迟
+    """
+    __slots__ = (
+        "bytes_in",
+        "bytes_out",
+        "messages_in",
+        "messages_out",
+        "connections",
+        "write_buffer",
+        "connect_latency",
+        "reconnects",
+        "retry_delay",
+    )
+
+    def __init__(self, metrics: "TransportMetrics", peer: str) -> None:
+        self.bytes_in = metrics.bytes_in.labels(peer)
+        self.bytes_out = metrics.bytes_out.labels(peer)
+        self.messages_in = metrics.messages_in.labels(peer)
+        self.messages_out = metrics.messages_out.labels(peer)
+        self.connections = metrics.connections.labels(peer)
+        self.write_buffer = metrics.write_buffer.labels(peer)
+        self.connect_latency = metrics.connect_latency.labels(peer)
+        self.reconnects = metrics.reconnects.labels(peer)
+        self.retry_delay = metrics.retry_delay.labels(peer)
+
+
+class TransportMetrics:
+    """传输层 Prometheus 指标
+
+    赋值给协议类的 `metrics` 属性即可开启，`TCPConnector` 与 `ConnectorPool` 使用协议类上的同一个实例。
+    所有指标只有一个 `peer` 标签，通过 `label_mode` 控制标签取值，并通过 `max_peers` 限制不同取值的数量，
+    超过上限的连接归入 "other"，避免数千个连接撑爆 registry。同一 registry 和 namespace 下的多个实例共用
+    已注册的指标，指标的 buckets 以第一个实例为准。
+
+    Example:
+    >>> metrics = TransportMetrics(label_mode="host", max_peers=200)
+    >>> class MyProtocol(TCPClientProtocol):
+    ...     metrics = metrics
+
+    Attributes:
+        label_mode (str | Callable[[str, int], str]): 标签取值方式, "none" 所有连接合并为 "all",
+            "host" 按主机, "address" 按 host:port, 或者自定义函数 (host, port) -> label
+        max_peers (int): 不同标签值的数量上限
+        sample_interval (float): 发送缓冲区大小的采样间隔
+        _peers (dict[str, PeerMetrics]): 标签值到指标对象的映射
+    """
+    def __init__(
+        self,
+        *,
+        namespace: str = "veronica",
+        registry: CollectorRegistry | None = REGISTRY,
+        label_mode: str | Callable[[str, int], str] = "none",
+        max_peers: int = 100,
+        sample_interval: float = 1.0,
+        latency_buckets: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    ) -> None:
+        if not callable(label_mode) and label_mode not in ("none", "host", "address"):
+            raise ValueError(f"Invalid label mode: {label_mode}")
+        self.label_mode = label_mode
+        self.max_peers = max_peers
+        self.sample_interval = sample_interval
+        self._peers: dict[str, PeerMetrics] = {}
+        self._lock = threading.Lock()
+
+        kwargs = dict(namespace=namespace, subsystem="transport", labelnames=("peer", ), registry=registry)
+        self.bytes_in = _collector(Counter, "received_bytes", "Bytes received", **kwargs)
+        self.bytes_out = _collector(Counter, "sent_bytes", "Bytes sent", **kwargs)
+        self.messages_in = _collector(Counter, "received_messages", "Messages (chunks or frames) received", **kwargs)
+        self.messages_out = _collector(Counter, "sent_messages", "Messages sent", **kwargs)
+        self.connections = _collector(Gauge, "connections", "Connections currently up", **kwargs)
+        self.write_buffer = _collector(Gauge, "write_buffer_bytes", "Bytes waiting in send buffers", **kwargs)
+        self.connect_latency = _collector(
+            Histogram, "connect_latency_seconds", "Time to establish a connection", buckets=latency_buckets, **kwargs
+        )
+        self.reconnects = _collector(Counter, "reconnect_attempts", "Failed connection attempts followed by a backoff", **kwargs)
+        self.retry_delay = _collector(Gauge, "retry_delay_seconds", "Current reconnect backoff delay", **kwargs)
+
+    def label(self, host: str, port: int) -> str:
+        """计算连接的标签值，不考虑数量上限
+
+        Args:
+            host (str): 地址
+            port (int): 端口
+
+        Returns:
+            str: 标签值
+        """
+        mode = self.label_mode
+        if callable(mode):
+            return mode(host, port)
+        if mode == "host":
+            return host
+        if mode == "address":
+            return f"{host}:{port}"
+        return "all"
+
+    def peer(self, host: str, port: int) -> PeerMetrics:
+        """获取连接的指标对象
+
+        Args:
+            host (str): 地址
+            port (int): 端口
+
+        Returns:
+            PeerMetrics: 指标对象
+        """
+        label = self.label(host, port)
+        peer = self._peers.get(label)
+        if peer is not None:
+            return peer
+        with self._lock:
+            peer = self._peers.get(label)
+            if peer is None:
+                if len(self._peers) >= self.max_peers and label != OTHER:
+                    logger.debug(f"Metric label limit {self.max_peers} reached, {label} is counted as {OTHER}")
+                    return self._peers.get(OTHER) or self._peers.setdefault(OTHER, PeerMetrics(self, OTHER))
+                peer = self._peers[label] = PeerMetrics(self, label)
+        return peer
@@ -0,0 +1,363 @@
+import ssl
+import heapq
+import asyncio
+import logging
+import itertools
+from enum import StrEnum
+from collections import Counter
+from functools import partial
+from typing import Type, Iterator, Sequence
+
+from veronica.transport.backoff import Backoff, ReconnectLimiter
+from veronica.transport.connector import TCPConnector, TCPKeepAlive, UnixConnector
+from veronica.transport.protocol import TCPClientProtocol
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "ConnectorState",
+    "ConnectorPool"
+]
+
+
+class ConnectorState(StrEnum):
+    """连接池中连接器的状态
+    """
+    PENDING = "pending"
+    CONNECTING = "connecting"
+    CONNECTED = "connected"
+    BACKOFF = "backoff"
+
+
+class _PoolEntry:
+    """连接池条目
+
+    Attributes:
+        connector (TCPConnector): 连接器
+        state (ConnectorState): 连接状态
+        seq (int): 最近一次调度的序号，用于使过期的调度失效
+    """
+    __slots__ = ("connector", "state", "seq")
+
+    def __init__(self, connector: TCPConnector) -> None:
+        self.connector = connector
+        self.state = ConnectorState.PENDING
+        self.seq = -1
+
+
+class ConnectorPool:
+    """TCP 连接池，管理大量 `TCPConnector`
+
+    所有连接器的连接与重连由同一个调度任务按到期时间驱动，同时进行的连接尝试数量受 `max_connecting`
+    限制，掉线的连接器不再各自持有一个 sleep 任务，启动和故障恢复时也不会产生连接风暴。
+    需要进一步限制连接尝试速率时传入 `limiter`，可以与连接池之外的连接器共享。
+
+    Example:
+    >>> async with ConnectorPool(protocol_class=YourProtocol, max_connecting=200) as pool:
+    ...     for ip in ip_list:
+    ...         pool.add(ip, 8888)
+    ...     print(pool.status())
+
+    Attributes:
+        protocol_class (Type[TCPClientProtocol]): 默认协议类
+        max_connecting (int): 同时进行的连接尝试上限
+        use_jitter (bool): 是否使用重连抖动
+        connector_class (Type[TCPConnector]): 连接器类, 需要与 `TCPConnector` 的构造参数一致（例如 `UDPConnector`）,
+            不支持按路径连接的 `UnixConnector`
+        keepalive (TCPKeepAlive | None): TCP keepalive 参数, None 表示不开启
+        backoff (Backoff | None): 重连退避策略, 所有连接器共享, None 表示使用连接器的默认策略
+        limiter (ReconnectLimiter | None): 连接尝试速率限制, None 表示不限制
+        ssl_context (ssl.SSLContext | None): TLS 上下文, None 表示不使用 TLS, 服务器主机名使用各连接的地址
+        ssl_handshake_timeout (float | None): TLS 握手超时, None 表示使用事件循环默认值
+        connect_timeout (float | None): 单个地址的连接超时, None 表示不限制
+        happy_eyeballs_delay (float | None): 域名解析出多个地址时并行连接的间隔, None 表示依次尝试
+        interleave (int | None): 按地址族交替排列解析结果
+        _loop (asyncio.AbstractEventLoop): 事件循环
+        _entries (dict[tuple[str, int], _PoolEntry]): 地址到连接池条目的映射
+        _heap (list[tuple[float, int, tuple[str, int]]]): 按到期时间排列的调度队列
+        _semaphore (asyncio.Semaphore): 连接尝试并发限制
+        _wakeup (asyncio.Event): 调度队列变化时唤醒调度任务
+        _scheduler (asyncio.Task | None): 调度任务
+        _attempts (set[asyncio.Task]): 进行中的连接尝试
+        counters (Counter[str]): 累计计数, attempts 连接尝试, failures 连接失败, connects 连接成功, losses 连接丢失
+    """
+    def __init__(
+        self,
+        *,
+        protocol_class: Type[TCPClientProtocol] = TCPClientProtocol,
+        max_connecting: int = 100,
+        use_jitter: bool = False,
+        connector_class: Type[TCPConnector] = TCPConnector,
+        keepalive: TCPKeepAlive | None = None,
+        backoff: Backoff | None = None,
+        limiter: ReconnectLimiter | None = None,
+        ssl_context: ssl.SSLContext | None = None,
+        ssl_handshake_timeout: float | None = None,
+        connect_timeout: float | None = None,
+        happy_eyeballs_delay: float | None = None,
+        interleave: int | None = None,
+        loop: asyncio.AbstractEventLoop | None = None
+    ) -> None:
+        if max_connecting <= 0:
+            raise ValueError(f"Invalid max_connecting: {max_connecting}")
+        if not issubclass(connector_class, TCPConnector) or issubclass(connector_class, UnixConnector):
+            raise TypeError(f"Unsupported connector_class: {connector_class.__name__}")
+        self.protocol_class = protocol_class
+        self.max_connecting = max_connecting
+        self.use_jitter = use_jitter
+        self.connector_class = connector_class
+        self.keepalive = keepalive
+        self.backoff = backoff
+        self.limiter = limiter
+        self.ssl_context = ssl_context
+        self.ssl_handshake_timeout = ssl_handshake_timeout
+        self.connect_timeout = connect_timeout
+        self.happy_eyeballs_delay = happy_eyeballs_delay
+        self.interleave = interleave
+
+        self._loop = loop or asyncio.get_running_loop()
+        self._entries: dict[tuple[str, int], _PoolEntry] = {}
+        self._heap: list[tuple[float, int, tuple[str, int]]] = []
+        self._counter = itertools.count()
+        self._semaphore = asyncio.Semaphore(max_connecting)
+        self._wakeup = asyncio.Event()
+        self._scheduler: asyncio.Task | None = None
+        self._attempts: set[asyncio.Task] = set()
+        self.counters: Counter[str] = Counter()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, address: tuple[str, int]) -> bool:
+        return address in self._entries
+
+    def __iter__(self) -> Iterator[TCPConnector]:
+        return (entry.connector for entry in list(self._entries.values()))
+
+    async def __aenter__(self) -> "ConnectorPool":
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    def start(self) -> None:
+        """启动调度任务
+        """
+        if self._scheduler is None or self._scheduler.done():
+            self._scheduler = self._loop.create_task(self._run_scheduler())
+
+    async def close(self) -> None:
+        """停止调度并关闭所有连接
+        """
+        tasks = [*self._attempts]
+        if self._scheduler is not None:
+            tasks.append(self._scheduler)
+            self._scheduler = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for key in list(self._entries):
+            self.remove(*key)
+        self._heap.clear()
+
+    def add(
+        self,
+        host: str,
+        port: int,
+        *,
+        protocol_class: Type[TCPClientProtocol] | None = None,
+        fallbacks: Sequence[tuple[str, int]] = ()
+    ) -> TCPConnector:
+        """添加连接，连接在调度任务中异步建立
+
+        Args:
+            host (str): 服务器地址
+            port (int): 服务器端口
+            protocol_class (Type[TCPClientProtocol] | None, optional): 协议类, None 表示使用连接池默认值. Defaults to None.
+            fallbacks (Sequence[tuple[str, int]], optional): 备用地址, 连接池仍以 (host, port) 标识该连接. Defaults to ().
+
+        Raises:
+            KeyError: 地址已存在
+
+        Returns:
+            TCPConnector: 连接器
+        """
+        key = (host, port)
+        if key in self._entries:
+            raise KeyError(f"Connector already exists: {host}:{port}")
+        connector = self.connector_class(
+            host,
+            port,
+            auto_reconnect=True,
+            use_jitter=self.use_jitter,
+            protocol_class=protocol_class or self.protocol_class,
+            loop=self._loop,
+            keepalive=self.keepalive,
+            backoff=self.backoff,
+            limiter=self.limiter,
+            ssl_context=self.ssl_context,
+            ssl_handshake_timeout=self.ssl_handshake_timeout,
+            connect_timeout=self.connect_timeout,
+            fallbacks=fallbacks,
+            happy_eyeballs_delay=self.happy_eyeballs_delay,
+            interleave=self.interleave
+        )
+        entry = _PoolEntry(connector)
+        self._entries[key] = entry
+        self._schedule(key, entry, 0)
+        return connector
+
+    def remove(self, host: str, port: int) -> TCPConnector | None:
+        """移除连接并关闭
+
+        Args:
+            host (str): 服务器地址
+            port (int): 服务器端口
+
+        Returns:
+            TCPConnector | None: 被移除的连接器，不存在时返回 None
+        """
+        entry = self._entries.pop((host, port), None)
+        if entry is None:
+            return None
+        entry.connector.close()
+        return entry.connector
+
+    def get(self, host: str, port: int) -> TCPConnector | None:
+        """获取连接器
+
+        Args:
+            host (str): 服务器地址
+            port (int): 服务器端口
+
+        Returns:
+            TCPConnector | None: 连接器，不存在时返回 None
+        """
+        entry = self._entries.get((host, port))
+        return entry.connector if entry is not None else None
+
+    def state(self, host: str, port: int) -> ConnectorState | None:
+        """获取连接状态
+
+        Args:
+            host (str): 服务器地址
+            port (int): 服务器端口
+
+        Returns:
+            ConnectorState | None: 连接状态，不存在时返回 None
+        """
+        entry = self._entries.get((host, port))
+        return entry.state if entry is not None else None
+
+    def status(self) -> dict[str, int]:
+        """按状态统计连接数量
+
+        Returns:
+            dict[str, int]: 状态到数量的映射，包含所有状态
+        """
+        counter = Counter(entry.state for entry in self._entries.values())
+        return {state.value: counter.get(state, 0) for state in ConnectorState}
+
+    def connected(self) -> list[TCPConnector]:
+        """已连接的连接器
+
+        Returns:
+            list[TCPConnector]: 连接器列表
+        """
+        return [
+            entry.connector for entry in self._entries.values()
+            if entry.state is ConnectorState.CONNECTED
+        ]
+
+    def _schedule(self, key: tuple[str, int], entry: _PoolEntry, delay: float) -> None:
+        """将连接尝试加入调度队列
+
+        Args:
+            key (tuple[str, int]): 地址
+            entry (_PoolEntry): 连接池条目
+            delay (float): 延迟时间
+        """
+        entry.seq = next(self._counter)
+        heapq.heappush(self._heap, (self._loop.time() + delay, entry.seq, key))
+        if self._heap[0][1] == entry.seq:
+            self._wakeup.set()
+
+    async def _run_scheduler(self) -> None:
+        """调度任务，按到期时间依次发起连接尝试
+        """
+        heap = self._heap
+        while True:
+            if not heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            due, seq, key = heap[0]
+            delay = due - self._loop.time()
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except TimeoutError:
+                    pass
+                continue
+            heapq.heappop(heap)
+            entry = self._entries.get(key)
+            if entry is None or entry.seq != seq:
+                continue
+            await self._semaphore.acquire()
+            if self._entries.get(key) is not entry or entry.seq != seq:
+                self._semaphore.release()
+                continue
+            entry.state = ConnectorState.CONNECTING
+            task = self._loop.create_task(self._attempt(key, entry))
+            self._attempts.add(task)
+            task.add_done_callback(self._attempts.discard)
+
+    async def _attempt(self, key: tuple[str, int], entry: _PoolEntry) -> None:
+        """连接尝试
+
+        Args:
+            key (tuple[str, int]): 地址
+            entry (_PoolEntry): 连接池条目
+        """
+        connector = entry.connector
+        self.counters["attempts"] += 1
+        try:
+            if connector.limiter is not None:
+                await connector.limiter.acquire()
+            await connector._connect()
+        except OSError as e:
+            self.counters["failures"] += 1
+            connector._increase_delay()
+            logger.info(f"Failed to connect to {connector.log_address()}: {e} Reconnecting...(after {connector._retry_delay: 0.2f} s)")
+            if self._entries.get(key) is entry:
+                entry.state = ConnectorState.BACKOFF
+                self._schedule(key, entry, connector._retry_delay)
+            return
+        finally:
+            self._semaphore.release()
+
+        if self._entries.get(key) is not entry:
+            connector.close()
+            return
+        connector._reset_delay()
+        self.counters["connects"] += 1
+        entry.state = ConnectorState.CONNECTED
+        connector._on_lost_fut.add_done_callback(partial(self._on_lost, key, entry))
+
+    def _on_lost(self, key: tuple[str, int], entry: _PoolEntry, fut: asyncio.Future) -> None:
+        """连接丢失时重新调度
+
+        Args:
+            key (tuple[str, int]): 地址
+            entry (_PoolEntry): 连接池条目
+            fut (asyncio.Future): 连接丢失 Future
+        """
+        connector = entry.connector
+        connector._on_lost_fut = self._loop.create_future()
+        if self._entries.get(key) is not entry or not connector._continue_trying:
+            return
+        self.counters["losses"] += 1
+        entry.state = ConnectorState.PENDING
+        self._schedule(key, entry, 0)
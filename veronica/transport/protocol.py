@@ -1,26 +1,68 @@
+import os
 import logging
 import asyncio
-from typing import final, cast
+from typing import final, cast, Callable, Any, Hashable
 from veronica.core.log import PrefixLoggerAdapter
+from veronica.transport.buffer import ReceiveBuffer
+from veronica.transport.trace import wire_tracer, RX, TX
+from veronica.transport.timer import TimerWheel, WheelTimerHandle
+from veronica.transport.request import RequestTracker
+from veronica.transport.metrics import TransportMetrics, PeerMetrics
 
 logger = logging.getLogger(__name__)
 
 __all__ = [
-    "TCPClientProtocol"
+    "TCPClientProtocol",
+    "BufferedTCPClientProtocol"
 ]
 
 class TCPClientProtocol(asyncio.Protocol):
     """TCP 客户端协议类
     
-    核心功能包括：自定义协议开发、自动重连机制、简单定时任务（使用call_later)
+    核心功能包括：自定义协议开发、自动重连机制、定时任务（使用时间轮）、发送背压与小包合并、
+    请求/响应关联（`request` 发送请求，数据接收回调中通过 `resolve_request` 设置响应）
 
     Attributes:
+        metrics (TransportMetrics | None): Prometheus 指标, None 表示不统计
+        idle_timeout (float | None): 超过该时间未收到任何数据则中止连接并触发重连, None 表示不检测
+        heartbeat_interval (float | None): 超过该时间未收到数据时调用 `on_heartbeat` 发送心跳, None 表示不发送
+        max_in_flight (int): `request` 的在途请求上限
+        request_timeout (float): `request` 的默认超时时间
+        timer_wheel (TimerWheel | None): `every`/`after` 使用的时间轮, None 表示使用事件循环的默认时间轮
+        write_high_water (int | None): 发送缓冲区高水位，超过后 `drain` 挂起, None 表示使用 asyncio 默认值
+        write_low_water (int | None): 发送缓冲区低水位，低于后 `drain` 恢复, None 表示使用 asyncio 默认值
+        coalesce_writes (bool): 是否合并同一轮事件循环中的小包，合并后通过一次 `writelines` 发送
+        coalesce_max_size (int): 参与合并的单包大小上限，同时也是合并缓冲区的刷新阈值
         _on_lost_fut (asyncio.Future): 连接丢失的 Future 对象
         _loop (asyncio.AbstractEventLoop): 事件循环
         _transport (asyncio.Transport): 传输对象
         _peername (tuple[str, int] | None): 连接的远程地址
+        _trace_name (str): 报文追踪使用的连接名称
+        _write_paused (bool): 传输层是否要求暂停写入
+        _drain_waiters (list[asyncio.Future]): 等待发送缓冲区恢复的 Future
+        _tx_pending (list[bytes]): 等待合并发送的数据
+        _tx_pending_size (int): 等待合并发送的字节数
+        _tx_flush_handle (asyncio.Handle | None): 合并发送的回调句柄
+        _timers (set[WheelTimerHandle]): 当前连接注册的定时器，连接丢失时自动取消
+        _requests (RequestTracker | None): 请求/响应关联器，首次调用 `request` 时创建
+        _rx_seen (bool): 上次看门狗检查之后是否收到过数据
+        _last_rx (float): 看门狗记录的最近一次收到数据的时间
+        _last_heartbeat (float): 最近一次发送心跳的时间
+        _metrics (PeerMetrics | None): 当前连接的指标对象
+        _write_buffer_sample (int): 最近一次采样的发送缓冲区大小
         log (PrefixLoggerAdapter): 日志适配器
     """
+    metrics: TransportMetrics | None = None
+    timer_wheel: TimerWheel | None = None
+    idle_timeout: float | None = None
+    heartbeat_interval: float | None = None
+    max_in_flight: int = 64
+    request_timeout: float = 10.0
+    write_high_water: int | None = None
+    write_low_water: int | None = None
+    coalesce_writes: bool = False
+    coalesce_max_size: int = 16 * 1024
+
     def __init__(
         self, 
         on_lost_fut: asyncio.Future | None = None,
@@ -30,6 +72,19 @@ class TCPClientProtocol(asyncio.Protocol):
         self._transport: asyncio.Transport | None = None
         self._loop = loop or asyncio.get_running_loop()
         self._peername: tuple[str, int] | None = None 
+        self._trace_name: str = ""
+        self._write_paused: bool = False
+        self._drain_waiters: list[asyncio.Future] = []
+        self._tx_pending: list[bytes] = []
+        self._tx_pending_size: int = 0
+        self._tx_flush_handle: asyncio.Handle | None = None
+        self._timers: set[WheelTimerHandle] = set()
+        self._requests: RequestTracker | None = None
+        self._rx_seen: bool = False
+        self._last_rx: float = 0.0
+        self._last_heartbeat: float = 0.0
+        self._metrics: PeerMetrics | None = None
+        self._write_buffer_sample: int = 0
         self.log: PrefixLoggerAdapter = PrefixLoggerAdapter(logger)
     @final
     def connection_made(self, transport: asyncio.BaseTransport) -> None:
@@ -41,10 +96,24 @@ class TCPClientProtocol(asyncio.Protocol):
         """
 
         self._transport = cast(asyncio.Transport, transport)
-        self._peername = transport.get_extra_info("peername")
-        assert self._peername is not None
+        peername = transport.get_extra_info("peername")
+        assert peername is not None
+        if isinstance(peername, (str, bytes)):
+            # Unix 域套接字的对端地址是路径，端口记为 0
+            peername = (os.fsdecode(peername) or "unix", 0)
+        self._peername = peername
         self.log = PrefixLoggerAdapter(logger, prefix=str(list(self._peername)))
+        self._trace_name = f"{self._peername[0]}:{self._peername[1]}"
+        if self.write_high_water is not None or self.write_low_water is not None:
+            self._transport.set_write_buffer_limits(self.write_high_water, self.write_low_water)
         self.log.info("Connection made")
+        if self.metrics is not None:
+            if self._metrics is None:
+                # 由连接器创建时已经按配置地址设置，直接使用时按对端地址
+                self._metrics = self.metrics.peer(self._peername[0], self._peername[1])
+            self._metrics.connections.inc()
+            self.every(self.metrics.sample_interval, self._sample_write_buffer)
+        self._start_watchdog()
         return self.on_connection_made()
     
     @final
@@ -54,7 +123,13 @@ class TCPClientProtocol(asyncio.Protocol):
         Args:
             data (bytes): 接收到的数据
         """
-        self.log.debug(f"RXD << {data.hex(' ')}") 
+        self._rx_seen = True
+        if wire_tracer.enabled:
+            wire_tracer.record(self._trace_name, RX, data)
+        metrics = self._metrics
+        if metrics is not None:
+            metrics.bytes_in.inc(len(data))
+            metrics.messages_in.inc()
         return self.on_data_received(data)
     
     @final
@@ -65,6 +140,7 @@ class TCPClientProtocol(asyncio.Protocol):
             exc (Exception | None): 如果时None，则表示主动断开，例如transport.close()，否则含有异常信息
         """
         # exc为None的三种情况：1. 主动断开，例如transport.close()，2. 对端关闭端口，3对端主动断开客户端
+        self._before_connection_lost(exc)
         self.log.error(f"Connection lost: {exc}")
         
         on_lost_fut = self._on_lost_fut
@@ -73,7 +149,27 @@ class TCPClientProtocol(asyncio.Protocol):
             self._on_lost_fut = None
             
         self._transport = None
+        self.cancel_timers()
+        if self._metrics is not None:
+            self._metrics.connections.dec()
+            self._metrics.write_buffer.dec(self._write_buffer_sample)
+            self._write_buffer_sample = 0
+        self._discard_pending_writes()
+        self._wake_drain_waiters(ConnectionError(f"Connection lost: {exc}"))
+        if self._requests is not None:
+            self._requests.fail_all(ConnectionError(f"Connection lost: {exc}"))
         return self.on_connection_lost()
+
+    def pause_writing(self) -> None:
+        """发送缓冲区超过高水位时回调
+        """
+        self._write_paused = True
+
+    def resume_writing(self) -> None:
+        """发送缓冲区低于低水位时回调
+        """
+        self._write_paused = False
+        self._wake_drain_waiters()
     
         
     @property
@@ -85,9 +181,173 @@ class TCPClientProtocol(asyncio.Protocol):
         """
         return self._transport is not None and not self._transport.is_closing()
 
+    def every(self, interval: float, callback: Callable[..., Any], *args: Any) -> WheelTimerHandle:
+        """注册周期定时任务，首次在一个周期后执行，连接丢失时自动取消
+
+        Args:
+            interval (float): 周期
+            callback (Callable[..., Any]): 回调函数
+
+        Returns:
+            WheelTimerHandle: 定时器句柄
+        """
+        return self._get_timer_wheel().every(interval, callback, *args, owner=self._timers)
+
+    def after(self, delay: float, callback: Callable[..., Any], *args: Any) -> WheelTimerHandle:
+        """注册单次定时任务，连接丢失时自动取消
+
+        Args:
+            delay (float): 延迟时间
+            callback (Callable[..., Any]): 回调函数
+
+        Returns:
+            WheelTimerHandle: 定时器句柄
+        """
+        return self._get_timer_wheel().after(delay, callback, *args, owner=self._timers)
+
+    def cancel_timers(self) -> None:
+        """取消当前连接注册的所有定时任务
+        """
+        for handle in list(self._timers):
+            handle.cancel()
+
+    def _before_connection_lost(self, exc: Exception | None) -> None:
+        """连接丢失处理前的内部钩子，子类可以在通知连接器和用户之前完成收尾，默认不做处理
+
+        Args:
+            exc (Exception | None): 与 `connection_lost` 相同
+        """
+        pass
+
+    def _get_timer_wheel(self) -> TimerWheel:
+        return self.timer_wheel or TimerWheel.get_default(self._loop)
+
+    def _sample_write_buffer(self) -> None:
+        """采样发送缓冲区大小，按差值更新指标，同一标签下的多个连接可以正确累加
+        """
+        if self._metrics is None:
+            return
+        size = self.get_write_buffer_size()
+        self._metrics.write_buffer.inc(size - self._write_buffer_sample)
+        self._write_buffer_sample = size
+
+    def _start_watchdog(self) -> None:
+        """启动空闲/心跳看门狗，检查间隔取心跳间隔与空闲超时的 1/4 中较小者
+        """
+        intervals = [
+            interval for interval in (
+                self.heartbeat_interval,
+                self.idle_timeout / 4 if self.idle_timeout is not None else None
+            )
+            if interval is not None
+        ]
+        if not intervals:
+            return
+        self._last_rx = self._last_heartbeat = self._loop.time()
+        self._rx_seen = False
+        self.every(min(intervals), self._watchdog)
+
+    def _watchdog(self) -> None:
+        """看门狗检查，只在定时器中读取一次时钟，接收路径只设置标志位
+        """
+        now = self._loop.time()
+        if self._rx_seen:
+            self._rx_seen = False
+            self._last_rx = now
+        idle = now - self._last_rx
+        if self.idle_timeout is not None and idle >= self.idle_timeout:
+            self.log.warning(f"No data received for {idle: 0.2f} s, aborting connection")
+            if self._transport is not None:
+                self._transport.abort()
+            return
+        if (
+            self.heartbeat_interval is not None
+            and idle >= self.heartbeat_interval
+            and now - self._last_heartbeat >= self.heartbeat_interval
+        ):
+            self._last_heartbeat = now
+            self.on_heartbeat()
+
+    async def request(
+        self,
+        payload: bytes,
+        *,
+        key: Hashable,
+        timeout: float | None = None
+    ) -> Any:
+        """发送请求并等待关联 ID 相同的响应，多个请求可以同时在途
+
+        Args:
+            payload (bytes): 请求数据
+            key (Hashable): 关联 ID，例如序列号
+            timeout (float | None, optional): 超时时间, None 表示使用 `request_timeout`. Defaults to None.
+
+        Raises:
+            KeyError: 关联 ID 已在途
+            TimeoutError: 等待响应超时
+            ConnectionError: transpost 不存在或者正在关闭，或者等待期间连接丢失
+
+        Returns:
+            Any: `resolve_request` 传入的响应
+        """
+        if self._requests is None:
+            self._requests = RequestTracker(
+                max_in_flight=self.max_in_flight,
+                timeout=self.request_timeout,
+                wheel=self._get_timer_wheel(),
+                loop=self._loop
+            )
+        return await self._requests.request(key, lambda: self.transmit_data(payload), timeout)
+
+    def resolve_request(self, key: Hashable, response: Any) -> bool:
+        """设置请求的响应，在数据接收回调中调用
+
+        Args:
+            key (Hashable): 关联 ID
+            response (Any): 响应
+
+        Returns:
+            bool: 是否存在等待中的请求
+        """
+        return self._requests is not None and self._requests.resolve(key, response)
+
+    def reject_request(self, key: Hashable, exc: BaseException) -> bool:
+        """以异常结束请求，例如收到错误响应
+
+        Args:
+            key (Hashable): 关联 ID
+            exc (BaseException): 异常
+
+        Returns:
+            bool: 是否存在等待中的请求
+        """
+        return self._requests is not None and self._requests.reject(key, exc)
+
+    @property
+    def is_writing_paused(self) -> bool:
+        """发送缓冲区是否超过高水位
+
+        Returns:
+            bool: 是否暂停写入
+        """
+        return self._write_paused
+
+    def get_write_buffer_size(self) -> int:
+        """发送缓冲区大小，包括等待合并发送的数据
+
+        Returns:
+            int: 字节数
+        """
+        if self._transport is None:
+            return self._tx_pending_size
+        return self._transport.get_write_buffer_size() + self._tx_pending_size
+
     def transmit_data(self, data: bytes) -> None:
         """发送数据
 
+        不等待发送缓冲区，需要背压时使用 `send` 或在发送后 `await drain()`。
+        开启 `coalesce_writes` 时，小于 `coalesce_max_size` 的数据会在本轮事件循环结束时合并发送。
+
         Args:
             data (bytes): 需要发送的数据
 
@@ -96,10 +356,95 @@ class TCPClientProtocol(asyncio.Protocol):
         """
         if self.is_connected:
             assert self._transport is not None
-            self._transport.write(data)
-            self.log.debug(f"TXD >> {data.hex(' ')}")
+            if self.coalesce_writes and len(data) < self.coalesce_max_size:
+                if not isinstance(data, bytes):
+                    data = bytes(data)
+                self._tx_pending.append(data)
+                self._tx_pending_size += len(data)
+                if self._tx_pending_size >= self.coalesce_max_size:
+                    self._flush_pending_writes()
+                elif self._tx_flush_handle is None:
+                    self._tx_flush_handle = self._loop.call_soon(self._flush_pending_writes)
+            else:
+                if self._tx_pending:
+                    self._flush_pending_writes()
+                self._transport.write(data)
+            if wire_tracer.enabled:
+                wire_tracer.record(self._trace_name, TX, data)
+            metrics = self._metrics
+            if metrics is not None:
+                metrics.bytes_out.inc(len(data))
+                metrics.messages_out.inc()
         else:
             raise ConnectionError("Transport can't be used")
+
+    async def drain(self) -> None:
+        """等待发送缓冲区低于低水位
+
+        Raises:
+            ConnectionError: transpost 不存在或者正在关闭，或者等待期间连接丢失
+        """
+        if not self.is_connected:
+            raise ConnectionError("Transport can't be used")
+        if not self._write_paused:
+            return
+        waiter = self._loop.create_future()
+        self._drain_waiters.append(waiter)
+        try:
+            await waiter
+        finally:
+            if waiter in self._drain_waiters:
+                self._drain_waiters.remove(waiter)
+
+    async def send(self, data: bytes) -> None:
+        """发送数据并等待发送缓冲区，使生产者的速度受限于 socket
+
+        Args:
+            data (bytes): 需要发送的数据
+
+        Raises:
+            ConnectionError: transpost 不存在或者正在关闭
+        """
+        self.transmit_data(data)
+        await self.drain()
+
+    def _flush_pending_writes(self) -> None:
+        """合并发送等待中的数据
+        """
+        if self._tx_flush_handle is not None:
+            self._tx_flush_handle.cancel()
+            self._tx_flush_handle = None
+        pending = self._tx_pending
+        if not pending:
+            return
+        self._tx_pending = []
+        self._tx_pending_size = 0
+        if self._transport is not None and not self._transport.is_closing():
+            self._transport.writelines(pending)
+
+    def _discard_pending_writes(self) -> None:
+        """丢弃等待合并发送的数据
+        """
+        if self._tx_flush_handle is not None:
+            self._tx_flush_handle.cancel()
+            self._tx_flush_handle = None
+        self._tx_pending = []
+        self._tx_pending_size = 0
+
+    def _wake_drain_waiters(self, exc: Exception | None = None) -> None:
+        """唤醒等待发送缓冲区的协程
+
+        Args:
+            exc (Exception | None, optional): 不为 None 时以异常唤醒. Defaults to None.
+        """
+        waiters, self._drain_waiters = self._drain_waiters, []
+        for waiter in waiters:
+            if waiter.done():
+                continue
+            if exc is None:
+                waiter.set_result(None)
+            else:
+                waiter.set_exception(exc)
     
     def on_connection_made(self) -> None:
         """连接建立时回调，用户调用
@@ -117,4 +462,92 @@ class TCPClientProtocol(asyncio.Protocol):
     def on_connection_lost(self) -> None:
         """连接丢失时回调，用户调用
         """
-        pass
\ No newline at end of file
+        pass
+
+    def on_heartbeat(self) -> None:
+        """连接空闲超过 `heartbeat_interval` 时回调，用户在此发送心跳报文
+        """
+        pass
+
+
+class BufferedTCPClientProtocol(TCPClientProtocol, asyncio.BufferedProtocol):
+    """基于 asyncio.BufferedProtocol 的 TCP 客户端协议类
+
+    数据由事件循环直接接收到预分配的可增长缓冲区中，`on_data_received` 收到的是未消费数据的
+    memoryview 切片，稳态接收不再为每个数据块分配新的 bytes 对象。钩子函数与 `TCPClientProtocol`
+    一致，可以直接作为 `TCPConnector` 的 `protocol_class` 使用。
+
+    Note:
+        `on_data_received` 返回已消费的字节数，未消费的数据保留在缓冲区中，下次与新数据一起传入；
+        返回 None 表示全部消费。传入的 memoryview 在回调返回后失效，如需保留请使用 bytes(data) 复制。
+
+    Attributes:
+        buffer_size (int): 接收缓冲区初始大小
+        max_buffer_size (int | None): 接收缓冲区上限，未消费数据超过上限时连接以 BufferError 断开
+        _rx_buffer (ReceiveBuffer): 接收缓冲区
+    """
+    buffer_size: int = 64 * 1024
+    max_buffer_size: int | None = 16 * 1024 * 1024
+
+    def __init__(
+        self,
+        on_lost_fut: asyncio.Future | None = None,
+        loop: asyncio.AbstractEventLoop | None = None
+    ) -> None:
+        super().__init__(on_lost_fut, loop)
+        self._rx_buffer = ReceiveBuffer(self.buffer_size, self.max_buffer_size)
+
+    @final
+    def get_buffer(self, sizehint: int) -> memoryview:
+        """获取接收缓冲区
+
+        Args:
+            sizehint (int): 期望的缓冲区大小
+
+        Returns:
+            memoryview: 可写入的缓冲区
+        """
+        return self._rx_buffer.get_buffer(sizehint)
+
+    @final
+    def buffer_updated(self, nbytes: int) -> None:
+        """数据写入缓冲区后回调
+
+        Args:
+            nbytes (int): 写入的字节数
+        """
+        rx = self._rx_buffer
+        rx.commit(nbytes)
+        self._rx_seen = True
+        if self._metrics is not None:
+            self._metrics.bytes_in.inc(nbytes)
+        if wire_tracer.enabled:
+            wire_tracer.record(self._trace_name, RX, rx.view[rx.end - nbytes:rx.end])
+        self._process_rx_buffer(rx)
+
+    def _process_rx_buffer(self, rx: ReceiveBuffer) -> None:
+        """将未消费数据交给用户回调
+
+        Args:
+            rx (ReceiveBuffer): 接收缓冲区
+        """
+        pending = len(rx)
+        if self._metrics is not None:
+            self._metrics.messages_in.inc()
+        data = rx.data
+        try:
+            consumed = self.on_data_received(data)
+        finally:
+            data.release()
+        rx.consume(pending if consumed is None else consumed)
+
+    def on_data_received(self, data: memoryview) -> int | None:  # type: ignore[override]
+        """数据接收时回调，用户调用
+
+        Args:
+            data (memoryview): 缓冲区中未消费的数据
+
+        Returns:
+            int | None: 已消费的字节数，None 表示全部消费
+        """
+        return None
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+from typing import Any, Callable, Hashable
+
+from veronica.transport.timer import TimerWheel, WheelTimerHandle
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "RequestTracker"
+]
+
+
+class RequestTracker:
+    """请求/响应关联器
+
+    以关联 ID（例如序列号）为键保存等待响应的 Future，允许多个请求同时在途（流水线），
+    在途数量由 `max_in_flight` 限制。超时由共享的时间轮驱动，不为每个请求单独创建事件循环定时器。
+
+    Example:
+    >>> tracker = RequestTracker(max_in_flight=16, timeout=3)
+    >>> response = await tracker.request(seq, lambda: transport.write(frame))
+    >>> tracker.resolve(seq, response_frame)   # 在数据接收回调中调用
+
+    Attributes:
+        max_in_flight (int): 在途请求上限
+        timeout (float): 默认超时时间
+        _loop (asyncio.AbstractEventLoop): 事件循环
+        _wheel (TimerWheel): 超时使用的时间轮
+        _window (asyncio.Semaphore): 在途窗口
+        _pending (dict[Hashable, tuple[asyncio.Future, WheelTimerHandle]]): 关联 ID 到等待中请求的映射
+    """
+    def __init__(
+        self,
+        *,
+        max_in_flight: int = 64,
+        timeout: float = 10.0,
+        wheel: TimerWheel | None = None,
+        loop: asyncio.AbstractEventLoop | None = None
+    ) -> None:
+        if max_in_flight <= 0:
+            raise ValueError(f"Invalid max_in_flight: {max_in_flight}")
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self._loop = loop or asyncio.get_running_loop()
+        self._wheel = wheel or TimerWheel.get_default(self._loop)
+        self._window = asyncio.Semaphore(max_in_flight)
+        self._pending: dict[Hashable, tuple[asyncio.Future, WheelTimerHandle]] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._pending
+
+    async def request(
+        self,
+        key: Hashable,
+        send: Callable[[], Any],
+        timeout: float | None = None
+    ) -> Any:
+        """发送请求并等待响应
+
+        Args:
+            key (Hashable): 关联 ID
+            send (Callable[[], Any]): 发送请求的函数，在登记关联 ID 后调用
+            timeout (float | None, optional): 超时时间, None 表示使用默认值. Defaults to None.
+
+        Raises:
+            KeyError: 关联 ID 已在途
+            TimeoutError: 等待响应超时
+            ConnectionError: 等待期间连接丢失
+
+        Returns:
+            Any: `resolve` 传入的响应
+        """
+        timeout = self.timeout if timeout is None else timeout
+        async with self._window:
+            if key in self._pending:
+                raise KeyError(f"Request {key!r} is already in flight")
+            fut = self._loop.create_future()
+            handle = self._wheel.after(timeout, self._expire, key, fut, timeout)
+            self._pending[key] = (fut, handle)
+            try:
+                send()
+                return await fut
+            finally:
+                handle.cancel()
+                entry = self._pending.get(key)
+                if entry is not None and entry[0] is fut:
+                    del self._pending[key]
+
+    def resolve(self, key: Hashable, response: Any) -> bool:
+        """设置请求的响应
+
+        Args:
+            key (Hashable): 关联 ID
+            response (Any): 响应
+
+        Returns:
+            bool: 是否存在等待中的请求
+        """
+        entry = self._pending.pop(key, None)
+        if entry is None:
+            return False
+        fut, handle = entry
+        handle.cancel()
+        if not fut.done():
+            fut.set_result(response)
+        return True
+
+    def reject(self, key: Hashable, exc: BaseException) -> bool:
+        """以异常结束请求
+
+        Args:
+            key (Hashable): 关联 ID
+            exc (BaseException): 异常
+
+        Returns:
+            bool: 是否存在等待中的请求
+        """
+        entry = self._pending.pop(key, None)
+        if entry is None:
+            return False
+        fut, handle = entry
+        handle.cancel()
+        if not fut.done():
+            fut.set_exception(exc)
+        return True
+
+    def fail_all(self, exc: BaseException) -> None:
+        """以异常结束所有等待中的请求
+
+        Args:
+            exc (BaseException): 异常
+        """
+        pending, self._pending = self._pending, {}
+        for fut, handle in pending.values():
+            handle.cancel()
+            if not fut.done():
+                fut.set_exception(exc)
+
+    def _expire(self, key: Hashable, fut: asyncio.Future, timeout: float) -> None:
+        entry = self._pending.get(key)
+        if entry is None or entry[0] is not fut:
+            return
+        del self._pending[key]
+        if not fut.done():
+            fut.set_exception(TimeoutError(f"Request {key!r} timed out after {timeout} s"))
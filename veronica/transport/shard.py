@@ -0,0 +1,364 @@
+import os
+import ssl
+import zlib
+import time
+import queue
+import asyncio
+import logging
+import threading
+import multiprocessing
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Sequence, Type
+
+from veronica.transport.pool import ConnectorPool
+from veronica.transport.connector import TCPKeepAlive
+from veronica.transport.protocol import TCPClientProtocol
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "partition_hosts",
+    "ShardStatus",
+    "ShardSupervisor"
+]
+
+
+def partition_hosts(hosts: Sequence[tuple[str, int]], workers: int) -> list[list[tuple[str, int]]]:
+    """按地址的稳定哈希将连接分配到各个工作进程
+
+    使用 crc32 而不是 hash()，分配结果与进程的哈希随机化无关，地址列表变化时其他地址的分配保持不变。
+
+    Args:
+        hosts (Sequence[tuple[str, int]]): (host, port) 列表
+        workers (int): 工作进程数
+
+    Returns:
+        list[list[tuple[str, int]]]: 每个工作进程负责的地址列表
+    """
+    shards: list[list[tuple[str, int]]] = [[] for _ in range(workers)]
+    for host, port in hosts:
+        shards[zlib.crc32(f"{host}:{port}".encode()) % workers].append((host, port))
+    return shards
+
+
+@dataclass
+class ShardStatus:
+    """工作进程状态
+
+    Attributes:
+        index (int): 工作进程序号
+        hosts (int): 负责的连接数
+        pid (int | None): 进程号
+        alive (bool): 是否存活
+        restarts (int): 重启次数
+        connectors (dict[str, int]): 按状态统计的连接数量
+        counters (dict[str, int]): 累计计数
+        updated (float): 最近一次上报的时间戳
+    """
+    index: int
+    hosts: int
+    pid: int | None = None
+    alive: bool = False
+    restarts: int = 0
+    connectors: dict[str, int] = field(default_factory=dict)
+    counters: dict[str, int] = field(default_factory=dict)
+    updated: float = 0.0
+
+
+async def _run_worker(
+    index: int,
+    hosts: list[tuple[str, int]],
+    protocol_class: Type[TCPClientProtocol],
+    max_connecting: int,
+    keepalive: TCPKeepAlive | None,
+    report_interval: float,
+    report_hook: Callable[[ConnectorPool], dict[str, int]] | None,
+    pool_kwargs: dict[str, Any],
+    ssl_context_factory: Callable[[], ssl.SSLContext] | None,
+    reports: Any,
+    stop_event: Any
+) -> None:
+    kwargs = dict(pool_kwargs)
+    if ssl_context_factory is not None:
+        kwargs["ssl_context"] = ssl_context_factory()
+    async with ConnectorPool(
+        protocol_class=protocol_class,
+        max_connecting=max_connecting,
+        keepalive=keepalive,
+        **kwargs
+    ) as pool:
+        for host, port in hosts:
+            pool.add(host, port)
+        while True:
+            counters = dict(pool.counters)
+            if report_hook is not None:
+                counters.update(report_hook(pool))
+            try:
+                reports.put_nowait((index, os.getpid(), pool.status(), counters))
+            except queue.Full:
+                pass
+            if stop_event.is_set():
+                break
+            await asyncio.sleep(report_interval)
+
+
+def _worker_main(
+    index: int,
+    hosts: list[tuple[str, int]],
+    protocol_class: Type[TCPClientProtocol],
+    max_connecting: int,
+    keepalive: TCPKeepAlive | None,
+    report_interval: float,
+    report_hook: Callable[[ConnectorPool], dict[str, int]] | None,
+    pool_kwargs: dict[str, Any],
+    ssl_context_factory: Callable[[], ssl.SSLContext] | None,
+    fast_loop: bool,
+    reports: Any,
+    stop_event: Any
+) -> None:
+    """工作进程入口，运行独立的事件循环和连接池
+    """
+    from veronica.transport.loop import run
+    coro = _run_worker(
+        index, hosts, protocol_class, max_connecting, keepalive, report_interval, report_hook,
+        pool_kwargs, ssl_context_factory, reports, stop_event
+    )
+    try:
+        run(coro, fast=fast_loop)
+    except KeyboardInterrupt:
+        pass
+
+
+class ShardSupervisor:
+    """多进程连接分片管理
+
+    将地址列表按稳定哈希分配到 N 个工作进程，每个工作进程运行独立的事件循环和 `ConnectorPool`，
+    使连接处理能力随 CPU 核数扩展。父进程中的监控线程汇总工作进程定期上报的连接状态和计数，
+    并重启异常退出的工作进程。
+
+    Note:
+        默认使用 spawn 方式创建进程，`protocol_class`、`report_hook`、`ssl_context_factory` 需要定义在模块顶层，
+        `pool_kwargs` 中的值也需要可以 pickle。`ssl.SSLContext` 不能 pickle，需要通过 `ssl_context_factory`
+        在工作进程中创建，不能放入 `pool_kwargs`。
+
+    Example:
+    >>> supervisor = ShardSupervisor(hosts, protocol_class=YourProtocol, workers=4)
+    >>> supervisor.start()
+    >>> print(supervisor.status())
+    >>> supervisor.stop()
+
+    Attributes:
+        workers (int): 工作进程数
+        protocol_class (Type[TCPClientProtocol]): 协议类
+        max_connecting (int): 每个工作进程同时进行的连接尝试上限
+        keepalive (TCPKeepAlive | None): TCP keepalive 参数, None 表示不开启
+        report_interval (float): 工作进程上报间隔
+        restart_delay (float): 工作进程异常退出后的重启延迟
+        report_hook (Callable[[ConnectorPool], dict[str, int]] | None): 工作进程中生成自定义计数的函数
+        pool_kwargs (dict[str, Any]): 传给工作进程中 `ConnectorPool` 的其他参数，如 backoff、limiter、
+            connect_timeout、happy_eyeballs_delay、interleave、use_jitter
+        ssl_context_factory (Callable[[], ssl.SSLContext] | None): 在工作进程中创建 TLS 上下文的函数, None 表示不使用 TLS
+        fast_loop (bool): 工作进程是否尝试使用 uvloop
+        _shards (list[list[tuple[str, int]]]): 每个工作进程负责的地址
+        _status (list[ShardStatus]): 每个工作进程的状态
+        _processes (list[multiprocessing.Process | None]): 工作进程
+    """
+    def __init__(
+        self,
+        hosts: Sequence[tuple[str, int]],
+        *,
+        protocol_class: Type[TCPClientProtocol] = TCPClientProtocol,
+        workers: int | None = None,
+        max_connecting: int = 100,
+        keepalive: TCPKeepAlive | None = None,
+        report_interval: float = 1.0,
+        restart_delay: float = 1.0,
+        report_hook: Callable[[ConnectorPool], dict[str, int]] | None = None,
+        pool_kwargs: dict[str, Any] | None = None,
+        ssl_context_factory: Callable[[], ssl.SSLContext] | None = None,
+        fast_loop: bool = True,
+        mp_context: str | None = "spawn"
+    ) -> None:
+        pool_kwargs = dict(pool_kwargs or {})
+        for name in ("protocol_class", "max_connecting", "keepalive", "loop"):
+            if name in pool_kwargs:
+                raise ValueError(f"Invalid pool_kwargs: {name}")
+        if "ssl_context" in pool_kwargs:
+            raise ValueError("Invalid pool_kwargs: ssl_context, use ssl_context_factory instead")
+        self.workers = workers or os.cpu_count() or 1
+        self.protocol_class = protocol_class
+        self.max_connecting = max_connecting
+        self.keepalive = keepalive
+        self.report_interval = report_interval
+        self.restart_delay = restart_delay
+        self.report_hook = report_hook
+        self.pool_kwargs = pool_kwargs
+        self.ssl_context_factory = ssl_context_factory
+        self.fast_loop = fast_loop
+
+        self._ctx = multiprocessing.get_context(mp_context)
+        self._shards = partition_hosts(hosts, self.workers)
+        self._status = [ShardStatus(index=i, hosts=len(shard)) for i, shard in enumerate(self._shards)]
+        self._processes: list[multiprocessing.Process | None] = [None] * self.workers
+        self._restart_at: list[float | None] = [None] * self.workers
+        self._reports = self._ctx.Queue(maxsize=self.workers * 16)
+        self._stop_event = self._ctx.Event()
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._monitor: threading.Thread | None = None
+
+    def __enter__(self) -> "ShardSupervisor":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """启动所有工作进程和监控线程
+        """
+        if self._monitor is not None:
+            return
+        self._stopping.clear()
+        self._stop_event.clear()
+        for index in range(self.workers):
+            self._spawn(index)
+        self._monitor = threading.Thread(target=self._monitor_loop, name="shard-monitor", daemon=True)
+        self._monitor.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """通知工作进程关闭连接并退出，超时后强制终止
+
+        Args:
+            timeout (float, optional): 等待工作进程退出的时间. Defaults to 5.0.
+        """
+        self._stopping.set()
+        self._stop_event.set()
+        if self._monitor is not None:
+            self._monitor.join()
+            self._monitor = None
+        deadline = time.monotonic() + timeout
+        for process in self._processes:
+            if process is None:
+                continue
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning(f"Worker {process.pid} did not exit in time, terminating")
+                process.terminate()
+                process.join()
+        with self._lock:
+            for status in self._status:
+                status.alive = False
+        self._drain_reports()
+
+    def shard_status(self) -> list[ShardStatus]:
+        """每个工作进程的状态
+
+        Returns:
+            list[ShardStatus]: 状态列表
+        """
+        with self._lock:
+            return [
+                ShardStatus(
+                    index=s.index,
+                    hosts=s.hosts,
+                    pid=s.pid,
+                    alive=s.alive,
+                    restarts=s.restarts,
+                    connectors=dict(s.connectors),
+                    counters=dict(s.counters),
+                    updated=s.updated,
+                )
+                for s in self._status
+            ]
+
+    def status(self) -> dict[str, Any]:
+        """汇总所有工作进程的状态
+
+        Returns:
+            dict[str, Any]: workers 进程数, alive 存活进程数, restarts 重启次数, hosts 连接总数,
+                connectors 按状态统计的连接数量, counters 累计计数
+        """
+        shards = self.shard_status()
+        connectors: Counter[str] = Counter()
+        counters: Counter[str] = Counter()
+        for s in shards:
+            connectors.update(s.connectors)
+            counters.update(s.counters)
+        return {
+            "workers": len(shards),
+            "alive": sum(s.alive for s in shards),
+            "restarts": sum(s.restarts for s in shards),
+            "hosts": sum(s.hosts for s in shards),
+            "connectors": dict(connectors),
+            "counters": dict(counters),
+        }
+
+    def _spawn(self, index: int) -> None:
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(
+                index,
+                self._shards[index],
+                self.protocol_class,
+                self.max_connecting,
+                self.keepalive,
+                self.report_interval,
+                self.report_hook,
+                self.pool_kwargs,
+                self.ssl_context_factory,
+                self.fast_loop,
+                self._reports,
+                self._stop_event,
+            ),
+            name=f"shard-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+        self._processes[index] = process
+        self._restart_at[index] = None
+        with self._lock:
+            status = self._status[index]
+            status.pid = process.pid
+            status.alive = True
+        logger.info(f"Worker {index} started, pid {process.pid}, {len(self._shards[index])} hosts")
+
+    def _monitor_loop(self) -> None:
+        """汇总上报并重启异常退出的工作进程
+        """
+        while not self._stopping.is_set():
+            self._drain_reports(timeout=min(self.report_interval, 0.2))
+            now = time.monotonic()
+            for index, process in enumerate(self._processes):
+                if process is None or process.is_alive() or self._stopping.is_set():
+                    continue
+                restart_at = self._restart_at[index]
+                if restart_at is None:
+                    logger.error(f"Worker {index} (pid {process.pid}) exited with code {process.exitcode}, restarting in {self.restart_delay} s")
+                    with self._lock:
+                        self._status[index].alive = False
+                    self._restart_at[index] = now + self.restart_delay
+                elif now >= restart_at:
+                    process.close()
+                    with self._lock:
+                        self._status[index].restarts += 1
+                    self._spawn(index)
+
+    def _drain_reports(self, timeout: float = 0.0) -> None:
+        try:
+            report = self._reports.get(timeout=timeout) if timeout else self._reports.get_nowait()
+        except (queue.Empty, OSError, ValueError):
+            return
+        while True:
+            index, pid, connectors, counters = report
+            with self._lock:
+                status = self._status[index]
+                if status.pid == pid:
+                    status.connectors = connectors
+                    status.counters = counters
+                    status.updated = time.time()
+            try:
+                report = self._reports.get_nowait()
+            except (queue.Empty, OSError, ValueError):
+                return
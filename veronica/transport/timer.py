@@ -0,0 +1,264 @@
+import math
+import asyncio
+import logging
+import weakref
+from typing import Callable, Any
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "WheelTimerHandle",
+    "TimerWheel"
+]
+
+
+class WheelTimerHandle:
+    """时间轮定时器句柄
+
+    Attributes:
+        interval (float | None): 周期定时器的间隔, None 表示单次定时器
+        _callback (Callable[..., Any]): 回调函数
+        _args (tuple): 回调参数
+        _ticks (int): 周期定时器的间隔 tick 数
+        _rounds (int): 到期前还需经过的整圈数
+        _cancelled (bool): 是否已取消
+        _wheel (TimerWheel): 所属时间轮
+        _owner (set | None): 登记该句柄的集合，结束后自动移除
+    """
+    __slots__ = ("interval", "_callback", "_args", "_ticks", "_rounds", "_cancelled", "_wheel", "_owner")
+
+    def __init__(
+        self,
+        wheel: "TimerWheel",
+        callback: Callable[..., Any],
+        args: tuple,
+        interval: float | None = None,
+        owner: set | None = None
+    ) -> None:
+        self.interval = interval
+        self._callback = callback
+        self._args = args
+        self._ticks = 0
+        self._rounds = 0
+        self._cancelled = False
+        self._wheel = wheel
+        self._owner = owner
+        if owner is not None:
+            owner.add(self)
+
+    def __repr__(self) -> str:
+        state = "cancelled" if self._cancelled else "active"
+        return f"{self.__class__.__name__}({self._callback!r}, interval={self.interval}, {state})"
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self) -> None:
+        """取消定时器，O(1)，时间轮访问到对应槽位时才真正移除
+        """
+        if not self._cancelled:
+            self._cancelled = True
+            self._wheel._count -= 1
+            self._detach()
+
+    def _detach(self) -> None:
+        if self._owner is not None:
+            self._owner.discard(self)
+            self._owner = None
+
+
+class TimerWheel:
+    """哈希时间轮
+
+    所有定时器按到期 tick 数散列到 `slots` 个槽位中，整个时间轮只占用事件循环中的一个 TimerHandle，
+    每个 tick 只处理一个槽位，添加和取消定时器都是 O(1)。适用于大量连接的心跳、轮询等对精度要求不高
+    的定时任务，定时精度为一个 tick。
+
+    Example:
+    >>> wheel = TimerWheel.get_default()
+    >>> handle = wheel.every(1, protocol.task_send_hello)
+    >>> handle.cancel()
+
+    Attributes:
+        tick (float): 每个槽位代表的时间
+        _loop_ref (weakref.ref[asyncio.AbstractEventLoop]): 事件循环的弱引用，默认时间轮以事件循环为弱键，
+            强引用会使事件循环和时间轮都无法释放
+        _slots (list[list[WheelTimerHandle]]): 槽位
+        _cursor (int): 下一个 tick 处理的槽位
+        _next_tick (float): 下一个 tick 的时间
+        _handle (asyncio.TimerHandle | None): 驱动时间轮的事件循环定时器，没有定时器时为 None
+        _count (int): 有效定时器数量
+    """
+    _defaults: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, TimerWheel]" = weakref.WeakKeyDictionary()
+
+    def __init__(
+        self,
+        tick: float = 0.1,
+        slots: int = 512,
+        loop: asyncio.AbstractEventLoop | None = None
+    ) -> None:
+        if tick <= 0:
+            raise ValueError(f"Invalid tick: {tick}")
+        if slots <= 0:
+            raise ValueError(f"Invalid slots: {slots}")
+        self.tick = tick
+        self._loop_ref = weakref.ref(loop or asyncio.get_running_loop())
+        self._slots: list[list[WheelTimerHandle]] = [[] for _ in range(slots)]
+        self._cursor = 0
+        self._next_tick = 0.0
+        self._handle: asyncio.TimerHandle | None = None
+        self._count = 0
+
+    @classmethod
+    def get_default(cls, loop: asyncio.AbstractEventLoop | None = None) -> "TimerWheel":
+        """获取事件循环的默认时间轮
+
+        Args:
+            loop (asyncio.AbstractEventLoop | None, optional): 事件循环. Defaults to None.
+
+        Returns:
+            TimerWheel: 时间轮
+        """
+        loop = loop or asyncio.get_running_loop()
+        wheel = cls._defaults.get(loop)
+        if wheel is None:
+            # 关闭时仍有定时器的事件循环被待执行的 TimerHandle 引用，弱键不会失效，在这里清理
+            for closed in [l for l in cls._defaults if l.is_closed()]:
+                del cls._defaults[closed]
+            wheel = cls._defaults[loop] = cls(loop=loop)
+        return wheel
+
+    @property
+    def _loop(self) -> asyncio.AbstractEventLoop:
+        loop = self._loop_ref()
+        if loop is None:
+            raise RuntimeError("Event loop of the timer wheel has been garbage collected")
+        return loop
+
+    def __len__(self) -> int:
+        return self._count
+
+    def after(
+        self,
+        delay: float,
+        callback: Callable[..., Any],
+        *args: Any,
+        owner: set | None = None
+    ) -> WheelTimerHandle:
+        """延迟执行一次
+
+        Args:
+            delay (float): 延迟时间
+            callback (Callable[..., Any]): 回调函数
+            owner (set | None, optional): 登记句柄的集合，定时器结束后自动移除. Defaults to None.
+
+        Returns:
+            WheelTimerHandle: 定时器句柄
+        """
+        handle = WheelTimerHandle(self, callback, args, owner=owner)
+        self._insert(handle, self._to_ticks(delay))
+        return handle
+
+    def every(
+        self,
+        interval: float,
+        callback: Callable[..., Any],
+        *args: Any,
+        owner: set | None = None
+    ) -> WheelTimerHandle:
+        """周期执行，首次在一个周期后执行
+
+        Args:
+            interval (float): 周期
+            callback (Callable[..., Any]): 回调函数
+            owner (set | None, optional): 登记句柄的集合，定时器取消后自动移除. Defaults to None.
+
+        Returns:
+            WheelTimerHandle: 定时器句柄
+        """
+        if interval <= 0:
+            raise ValueError(f"Invalid interval: {interval}")
+        handle = WheelTimerHandle(self, callback, args, interval=interval, owner=owner)
+        handle._ticks = self._to_ticks(interval)
+        self._insert(handle, handle._ticks)
+        return handle
+
+    def close(self) -> None:
+        """取消所有定时器
+        """
+        for slot in self._slots:
+            for handle in slot:
+                if not handle._cancelled:
+                    handle.cancel()
+            slot.clear()
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _to_ticks(self, delay: float) -> int:
+        return max(1, math.ceil(delay / self.tick))
+
+    def _insert(self, handle: WheelTimerHandle, ticks: int) -> None:
+        """将定时器放入 `ticks` 个 tick 之后处理的槽位
+
+        Args:
+            handle (WheelTimerHandle): 定时器句柄
+            ticks (int): tick 数
+        """
+        if self._handle is None:
+            self._next_tick = self._loop.time() + self.tick
+            self._handle = self._loop.call_at(self._next_tick, self._on_tick)
+        slots = len(self._slots)
+        handle._rounds = (ticks - 1) // slots
+        self._slots[(self._cursor + ticks - 1) % slots].append(handle)
+        self._count += 1
+
+    def _on_tick(self) -> None:
+        """处理所有已到期的槽位，事件循环延迟时会追赶错过的 tick
+        """
+        now = self._loop.time()
+        slots = self._slots
+        while self._next_tick <= now and self._count > 0:
+            index = self._cursor
+            self._cursor = (index + 1) % len(slots)
+            self._next_tick += self.tick
+            bucket = slots[index]
+            slots[index] = []
+            for handle in bucket:
+                if handle._cancelled:
+                    continue
+                if handle._rounds:
+                    handle._rounds -= 1
+                    slots[index].append(handle)
+                    continue
+                self._count -= 1
+                if handle.interval is None:
+                    handle._cancelled = True
+                    handle._detach()
+                else:
+                    self._insert(handle, handle._ticks)
+                self._run(handle)
+        if self._count > 0:
+            if self._next_tick <= now:
+                self._next_tick = now + self.tick
+            self._handle = self._loop.call_at(self._next_tick, self._on_tick)
+        else:
+            self._handle = None
+
+    def _run(self, handle: WheelTimerHandle) -> None:
+        """执行回调，异常交给事件循环的异常处理器
+
+        Args:
+            handle (WheelTimerHandle): 定时器句柄
+        """
+        try:
+            handle._callback(*handle._args)
+        except (SystemExit, KeyboardInterrupt):
+            raise
+        except BaseException as exc:
+            self._loop.call_exception_handler({
+                "message": f"Exception in timer wheel callback {handle._callback!r}",
+                "exception": exc,
+                "handle": handle,
+            })
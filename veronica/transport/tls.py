@@ -0,0 +1,117 @@
+import ssl
+import asyncio
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "enable_session_reuse",
+    "resume_session",
+    "get_session"
+]
+
+# 下一次在当前上下文中创建的客户端 SSLObject 使用的会话
+_next_session: ContextVar[ssl.SSLSession | None] = ContextVar("veronica_tls_session", default=None)
+
+
+class _ResumableContext(ssl.SSLContext):
+    """包装调用方的 SSLContext，创建客户端 SSLObject 时带上 `_next_session` 中的会话
+
+    asyncio（以及 uvloop）的 `create_connection` 不支持传入 SSLSession，但会在调用方任务中同步调用
+    `SSLContext.wrap_bio` 创建 SSLObject，因此通过 ContextVar 把会话传递到这里。
+    证书、校验等配置均使用被包装的 SSLContext，本对象自身的配置不生效，被包装的 SSLContext 不会被修改。
+
+    Attributes:
+        wrapped (ssl.SSLContext): 被包装的 SSLContext
+    """
+    wrapped: ssl.SSLContext
+
+    def __new__(cls, context: ssl.SSLContext) -> "_ResumableContext":
+        self = super().__new__(cls, ssl.PROTOCOL_TLS_CLIENT)
+        self.wrapped = context
+        return self
+
+    def __init__(self, context: ssl.SSLContext) -> None:
+        pass
+
+    def wrap_bio(self, incoming, outgoing, server_side=False, server_hostname=None, session=None):
+        if session is None and not server_side:
+            session = _next_session.get()
+        return self.wrapped.wrap_bio(
+            incoming,
+            outgoing,
+            server_side=server_side,
+            server_hostname=server_hostname,
+            session=session
+        )
+
+    def wrap_socket(self, sock, server_side=False, do_handshake_on_connect=True, suppress_ragged_eofs=True, server_hostname=None, session=None):
+        if session is None and not server_side:
+            session = _next_session.get()
+        return self.wrapped.wrap_socket(
+            sock,
+            server_side=server_side,
+            do_handshake_on_connect=do_handshake_on_connect,
+            suppress_ragged_eofs=suppress_ragged_eofs,
+            server_hostname=server_hostname,
+            session=session
+        )
+
+
+def enable_session_reuse(context: ssl.SSLContext) -> ssl.SSLContext:
+    """返回支持在 `resume_session` 中恢复会话的 SSLContext，不修改传入的 SSLContext，重复调用无副作用
+
+    Args:
+        context (ssl.SSLContext): 客户端 SSLContext
+
+    Returns:
+        ssl.SSLContext: 包装后的 SSLContext，用于 `create_connection`
+    """
+    if isinstance(context, _ResumableContext):
+        return context
+    return _ResumableContext(context)
+
+
+@contextmanager
+def resume_session(session: ssl.SSLSession | None) -> Iterator[None]:
+    """在上下文中创建的 TLS 连接尝试恢复指定会话，SSLContext 需要先经过 `enable_session_reuse` 包装
+
+    Example:
+    >>> context = enable_session_reuse(context)
+    >>> with resume_session(session):
+    ...     transport, protocol = await loop.create_connection(factory, host, port, ssl=context)
+
+    Args:
+        session (ssl.SSLSession | None): 上一次连接的会话, None 表示完整握手
+    """
+    token = _next_session.set(session)
+    try:
+        yield
+    finally:
+        _next_session.reset(token)
+
+
+def get_session(transport: asyncio.BaseTransport | None) -> ssl.SSLSession | None:
+    """获取 TLS 连接的会话, TLS 1.3 的会话票据在握手之后才到达，应在连接断开时获取
+
+    Args:
+        transport (asyncio.BaseTransport | None): 传输对象
+
+    Returns:
+        ssl.SSLSession | None: 会话，非 TLS 连接或没有可恢复的会话时返回 None
+    """
+    if transport is None:
+        return None
+    sslobj = transport.get_extra_info("ssl_object")
+    if sslobj is None:
+        return None
+    try:
+        session = sslobj.session
+    except (ValueError, ssl.SSLError):
+        return None
+    if session is None or not session.has_ticket and not session.id:
+        return None
+    return session
@@ -0,0 +1,153 @@
+import time
+import signal
+import asyncio
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "WireTracer",
+    "wire_tracer"
+]
+
+RX = "RXD <<"
+TX = "TXD >>"
+
+
+class WireTracer:
+    """报文追踪器
+
+    关闭时协议类只检查一次 `enabled` 标志，不计算任何十六进制字符串；开启后按连接将最近的收发报文
+    原样保存在定长环形缓冲区中，需要时通过 `dump` 或信号导出，而不是通过日志系统逐包输出。
+    连接断开后记录仍然保留以便排查，连接名称超过 `max_names` 时丢弃最早创建的环形缓冲区。
+
+    Example:
+    >>> from veronica.transport.trace import wire_tracer
+    >>> wire_tracer.enable(maxlen=512)
+    >>> wire_tracer.install_signal_handler()   # 在事件循环中调用, kill -USR1 <pid> 导出到日志
+    >>> print(wire_tracer.dump("127.0.0.1:8888"))
+
+    Attributes:
+        enabled (bool): 是否开启追踪
+        maxlen (int): 每个连接保留的报文数量
+        max_names (int): 保留记录的连接名称数量上限
+        _rings (dict[str, deque]): 连接名称到环形缓冲区的映射，按创建先后排列
+        _lock (threading.RLock): 创建/导出环形缓冲区时使用的锁
+    """
+    def __init__(self, maxlen: int = 256, max_names: int = 1024) -> None:
+        self.enabled: bool = False
+        self.maxlen: int = maxlen
+        self.max_names: int = max_names
+        self._rings: dict[str, deque[tuple[float, str, bytes]]] = {}
+        self._lock = threading.RLock()
+
+    def enable(self, maxlen: int | None = None) -> None:
+        """开启追踪
+
+        Args:
+            maxlen (int | None, optional): 每个连接保留的报文数量，修改后清空已有记录. Defaults to None.
+        """
+        if maxlen is not None and maxlen != self.maxlen:
+            self.maxlen = maxlen
+            self.clear()
+        self.enabled = True
+
+    def disable(self) -> None:
+        """关闭追踪，已记录的报文保留，可继续导出
+        """
+        self.enabled = False
+
+    def clear(self) -> None:
+        """清空所有记录
+        """
+        with self._lock:
+            self._rings.clear()
+
+    def record(self, name: str, direction: str, data: bytes | bytearray | memoryview) -> None:
+        """记录一个报文，调用方应先检查 `enabled`
+
+        Args:
+            name (str): 连接名称
+            direction (str): 方向, `RX` 或 `TX`
+            data (bytes | bytearray | memoryview): 报文数据
+        """
+        ring = self._rings.get(name)
+        if ring is None:
+            with self._lock:
+                ring = self._rings.get(name)
+                if ring is None:
+                    while len(self._rings) >= self.max_names:
+                        del self._rings[next(iter(self._rings))]
+                    ring = self._rings[name] = deque(maxlen=self.maxlen)
+        ring.append((time.time(), direction, bytes(data)))
+
+    def names(self) -> list[str]:
+        """已记录的连接名称
+
+        Returns:
+            list[str]: 连接名称列表
+        """
+        with self._lock:
+            return list(self._rings)
+
+    def snapshot(self, name: str) -> list[tuple[float, str, bytes]]:
+        """获取连接的报文记录
+
+        Args:
+            name (str): 连接名称
+
+        Returns:
+            list[tuple[float, str, bytes]]: (时间戳, 方向, 数据) 列表，按时间先后排列
+        """
+        ring = self._rings.get(name)
+        return list(ring) if ring is not None else []
+
+    def dump(self, name: str | None = None) -> str:
+        """格式化导出报文记录
+
+        Args:
+            name (str | None, optional): 连接名称, None 表示导出全部连接. Defaults to None.
+
+        Returns:
+            str: 每行一个报文的文本
+        """
+        names = [name] if name is not None else self.names()
+        lines = []
+        for n in names:
+            for ts, direction, data in self.snapshot(n):
+                stamp = datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S.%f")
+                lines.append(f"{stamp} [{n}] {direction} {data.hex(' ')}")
+        return "\n".join(lines)
+
+    def install_signal_handler(
+        self,
+        signum: int | None = None,
+        loop: asyncio.AbstractEventLoop | None = None
+    ) -> None:
+        """在事件循环中注册信号处理函数，收到信号时将全部记录导出到日志
+
+        导出在事件循环的回调中进行，而不是在信号上下文中，不会与持有锁的 `record` 死锁。
+
+        Args:
+            signum (int | None, optional): 信号, None 表示 SIGUSR1. Defaults to None.
+            loop (asyncio.AbstractEventLoop | None, optional): 事件循环, None 表示当前运行的事件循环. Defaults to None.
+
+        Raises:
+            ValueError: 当前平台不支持 SIGUSR1
+            RuntimeError: 没有指定事件循环且不在运行的事件循环中调用
+        """
+        if signum is None:
+            if not hasattr(signal, "SIGUSR1"):
+                raise ValueError("SIGUSR1 is not supported on this platform, please specify signum")
+            signum = signal.SIGUSR1
+        loop = loop or asyncio.get_running_loop()
+        loop.add_signal_handler(signum, self._log_dump)
+
+    def _log_dump(self) -> None:
+        logger.info(f"Wire trace dump:\n{self.dump()}")
+
+
+wire_tracer = WireTracer()